@@ -0,0 +1,3 @@
+"""
+Benchmarks for the job scraping and analysis pipeline
+"""
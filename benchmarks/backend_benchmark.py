@@ -0,0 +1,265 @@
+"""
+Benchmark the model backends on the same job set
+
+Runs the job processor once per backend over the same jobs and reports jobs
+per hour, model seconds and tokens per job, jobs that failed every attempt
+and how often the rating agrees with the first backend. Backends are given
+as kind,url,model[,api_key] with kind ollama or openai, e.g. an Ollama host
+and a vLLM or llama.cpp server loaded with the same weights.
+
+With --fake, a local stand-in serving both APIs with the same time model
+is benchmarked instead, which exercises both backends without a GPU.
+
+Usage:
+    python -m benchmarks.backend_benchmark \\
+        --backend ollama,http://localhost:11434,gemma3:12b \\
+        --backend openai,http://localhost:8000,google/gemma-3-12b-it \\
+        --jobs-file jobs.jsonl --resume resume.md --workers 4
+    python -m benchmarks.backend_benchmark --fake --jobs 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+
+from aiohttp import web
+
+from match_analysis.processor import JobMatchProcessor
+
+
+def make_job(idx):
+    """Build a job dictionary shaped like a scraped job"""
+    return {
+        "id": f"li-{idx}",
+        "site": "linkedin",
+        "job_url": f"https://example.com/jobs/{idx}",
+        "title": f"Backend Software Engineer {idx}",
+        "company": f"Company {idx % 7}",
+        "company_logo": "https://example.com/logo.png",
+        "description": f"Posting {idx}. Build and operate distributed systems. " * 60,
+        "source": "linkedin_backend_sg:linkedin",
+    }
+
+
+def load_jobs(path, count):
+    """Read jobs from a JSON lines file, or build count synthetic jobs"""
+    if path is None:
+        return [make_job(idx) for idx in range(count)]
+    with open(path, "r", encoding="utf-8") as file:
+        jobs = [json.loads(line) for line in file if line.strip()]
+    return jobs[:count] if count else jobs
+
+
+class FakeServer:
+    """Serves the Ollama and OpenAI-compatible APIs with canned analyses"""
+
+    def __init__(self, seconds_per_call, chunks=20):
+        self.seconds_per_call = seconds_per_call
+        self.chunks = chunks
+
+    def _analysis(self, prompt):
+        score = 40 + len(prompt) % 50
+        return json.dumps(
+            {
+                "thinking_process": ["Compared the posting with the resume."],
+                "analysis": {
+                    "role_summary": "Backend role on distributed systems.",
+                    "role_requirements": "Python, distributed systems, 3 years",
+                },
+                "overall_match": {
+                    "rating": "GOOD" if score > 60 else "DECENT",
+                    "score": score,
+                    "summary": "Solid fit.",
+                },
+            }
+        )
+
+    def _pieces(self, text):
+        size = max(len(text) // self.chunks, 1)
+        return [text[idx : idx + size] for idx in range(0, len(text), size)]
+
+    async def ollama(self, request):
+        payload = await request.json()
+        text = self._analysis(payload["prompt"])
+        usage = {
+            "done": True,
+            "prompt_eval_count": len(payload["prompt"]) // 4,
+            "prompt_eval_duration": int(self.seconds_per_call / 2 * 1e9),
+            "eval_count": len(text) // 4,
+            "eval_duration": int(self.seconds_per_call / 2 * 1e9),
+        }
+        if not payload.get("stream"):
+            await asyncio.sleep(self.seconds_per_call)
+            return web.json_response({"response": text, **usage})
+
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for piece in self._pieces(text):
+            await asyncio.sleep(self.seconds_per_call / self.chunks)
+            await response.write(json.dumps({"response": piece}).encode() + b"\n")
+        await response.write(json.dumps({"response": "", **usage}).encode() + b"\n")
+        return response
+
+    async def openai(self, request):
+        payload = await request.json()
+        prompt = payload["messages"][-1]["content"]
+        text = self._analysis(prompt)
+        usage = {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(text) // 4,
+        }
+        if not payload.get("stream"):
+            await asyncio.sleep(self.seconds_per_call)
+            return web.json_response(
+                {"choices": [{"message": {"content": text}}], "usage": usage}
+            )
+
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for piece in self._pieces(text):
+            await asyncio.sleep(self.seconds_per_call / self.chunks)
+            chunk = {"choices": [{"delta": {"content": piece}}]}
+            await response.write(b"data: " + json.dumps(chunk).encode() + b"\n\n")
+        chunk = {"choices": [], "usage": usage}
+        await response.write(b"data: " + json.dumps(chunk).encode() + b"\n\n")
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+    async def models(self, request):
+        return web.json_response({"models": [], "data": []})
+
+    async def webhook(self, request):
+        await request.read()
+        return web.Response(text="ok")
+
+
+def serve(fake, ready):
+    """Run the fake server forever in the event loop of the current thread"""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    app = web.Application()
+    app.router.add_post("/api/generate", fake.ollama)
+    app.router.add_post("/v1/chat/completions", fake.openai)
+    app.router.add_get("/api/tags", fake.models)
+    app.router.add_get("/v1/models", fake.models)
+    app.router.add_post("/hooks/benchmark", fake.webhook)
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    loop.run_until_complete(site.start())
+    ready["port"] = site._server.sockets[0].getsockname()[1]
+    ready["event"].set()
+    loop.run_forever()
+
+
+def run(backend, directory, jobs, args, webhook_url):
+    """Analyze the jobs with one backend and return its statistics"""
+    kind, url, model, *api_key = backend.split(",")
+    name = f"{kind} {model}"
+    slug = "".join(char if char.isalnum() else "_" for char in backend)
+    backend_config = {"model": model, "endpoint": url}
+    if api_key:
+        backend_config["api_key"] = api_key[0]
+
+    config = {
+        "match_analysis": {
+            "resume_path": args.resume or os.path.join(directory, "resume.md"),
+            "worker_count": args.workers,
+            "max_retries": 2,
+            "retry_delay": 1,
+            "backend": kind,
+            kind: backend_config,
+            "results": {"path": os.path.join(directory, f"results_{slug}.db")},
+            "dead_letter": {"path": os.path.join(directory, f"dead_{slug}.db")},
+        },
+        "push_notification": {"mattermost": {"webhook_url": webhook_url}},
+    }
+    processor = JobMatchProcessor(config)
+    processor.start()
+
+    start = time.perf_counter()
+    processor.get_queue().put_many([dict(job) for job in jobs])
+    processor.join()
+    elapsed = time.perf_counter() - start
+    processor.stop()
+
+    usage = processor.model.usage()
+    calls = usage["calls"] or 1
+    ratings = {
+        row["job_url"]: row["rating"]
+        for row in processor.results.list(stage="analysis")
+    }
+    return {
+        "name": name,
+        "jobs_per_hour": len(ratings) / elapsed * 3600,
+        "seconds_per_job": processor.llm_seconds / max(processor.llm_calls, 1),
+        "prompt_tokens": usage["prompt_eval_count"] / calls,
+        "eval_tokens": usage["eval_count"] / calls,
+        "failed": processor.dead_letters.count(),
+        "ratings": ratings,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model backend benchmark")
+    parser.add_argument("--backend", action="append", default=[])
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--jobs-file")
+    parser.add_argument("--resume")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--webhook-url")
+    parser.add_argument("--fake", action="store_true")
+    parser.add_argument("--fake-seconds", type=float, default=0.2)
+    args = parser.parse_args()
+
+    backends = list(args.backend)
+    webhook_url = args.webhook_url
+    if args.fake:
+        ready = {"event": threading.Event()}
+        fake = FakeServer(args.fake_seconds)
+        threading.Thread(target=serve, args=(fake, ready), daemon=True).start()
+        ready["event"].wait()
+        base = f"http://127.0.0.1:{ready['port']}"
+        backends += [f"ollama,{base},fake", f"openai,{base},fake"]
+        webhook_url = webhook_url or f"{base}/hooks/benchmark"
+    if not backends:
+        parser.error("give at least one --backend or --fake")
+    if webhook_url is None:
+        parser.error("give a --webhook-url to receive the notifications")
+
+    jobs = load_jobs(args.jobs_file, args.jobs)
+    with tempfile.TemporaryDirectory() as directory:
+        if args.resume is None:
+            with open(
+                os.path.join(directory, "resume.md"), "w", encoding="utf-8"
+            ) as file:
+                line = "Senior engineer building backend services in Python and Go.\n"
+                file.write(line * 100)
+
+        results = [
+            run(backend, directory, jobs, args, webhook_url) for backend in backends
+        ]
+
+    reference = results[0]["ratings"]
+    print(
+        f"{'backend':<32} {'jobs/hour':>10} {'s/job':>7} {'prompt tok':>11} "
+        f"{'gen tok':>8} {'failed':>7} {'agree':>6}"
+    )
+    for result in results:
+        shared = [url for url in result["ratings"] if url in reference]
+        agree = sum(result["ratings"][url] == reference[url] for url in shared)
+        print(
+            f"{result['name']:<32} {result['jobs_per_hour']:>10.0f} "
+            f"{result['seconds_per_job']:>7.2f} {result['prompt_tokens']:>11.0f} "
+            f"{result['eval_tokens']:>8.0f} {result['failed']:>7} "
+            f"{agree / len(shared) if shared else 0:>6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Benchmark jobs per hour of batched analysis against one job per call
+
+Runs the job processor against a local stand-in for the Ollama API that
+serves one request at a time and charges a simulated prefill cost for every
+prompt token not shared with the previous prompt, as Ollama's prompt cache
+does, plus a generation cost per output token. With --no-prefix-cache every
+prompt is prefilled in full, as when other prompts evict the cached prefix. The analyses are answered
+with canned JSON, so only the time model differs between the two modes.
+
+Usage:
+    python -m benchmarks.batch_benchmark --jobs 40 --batch-size 4
+    python -m benchmarks.batch_benchmark --no-prefix-cache
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+from aiohttp import web
+
+from match_analysis.processor import JobMatchProcessor
+
+JOB_ID = re.compile(r"\*\*Job ID: (job-\d+)\*\*")
+
+
+def make_job(idx):
+    """Build a job dictionary shaped like a scraped job"""
+    return {
+        "id": f"li-{idx}",
+        "site": "linkedin",
+        "job_url": f"https://example.com/jobs/{idx}",
+        "title": f"Backend Software Engineer {idx}",
+        "company": f"Company {idx % 7}",
+        "company_logo": "https://example.com/logo.png",
+        "description": f"Posting {idx}. Build and operate distributed systems. " * 60,
+        "source": "linkedin_backend_sg:linkedin",
+    }
+
+
+def make_analysis():
+    """Canned analysis of one job"""
+    return {
+        "analysis": {
+            "role_summary": "Backend role on distributed systems.",
+            "role_requirements": "Python, distributed systems, 3 years",
+        },
+        "overall_match": {"rating": "GOOD", "score": 70, "summary": "Solid fit."},
+    }
+
+
+class FakeOllama:
+    """Serves generate calls one at a time with a simulated time model"""
+
+    def __init__(
+        self, prefill_ms, eval_ms, output_tokens, prefix_cache, chars_per_token=3.5
+    ):
+        self.prefill_ms = prefill_ms
+        self.eval_ms = eval_ms
+        self.output_tokens = output_tokens
+        self.prefix_cache = prefix_cache
+        self.chars_per_token = chars_per_token
+        self.last_prompt = ""
+        self.lock = asyncio.Lock()
+
+    async def generate(self, request):
+        payload = await request.json()
+        prompt = payload.get("system", "") + payload["prompt"]
+        job_ids = JOB_ID.findall(payload["prompt"])
+
+        async with self.lock:
+            shared = len(os.path.commonprefix([self.last_prompt, prompt]))
+            if self.prefix_cache:
+                self.last_prompt = prompt
+            prompt_tokens = int((len(prompt) - shared) / self.chars_per_token)
+            eval_tokens = self.output_tokens * max(len(job_ids), 1)
+            prefill = prompt_tokens * self.prefill_ms / 1000
+            generation = eval_tokens * self.eval_ms / 1000
+            await asyncio.sleep(prefill + generation)
+
+        if job_ids:
+            response = {
+                "results": [{"job_id": job_id, **make_analysis()} for job_id in job_ids]
+            }
+        else:
+            response = {
+                "thinking_process": ["Compared the posting."],
+                **make_analysis(),
+            }
+
+        return web.json_response(
+            {
+                "response": json.dumps(response),
+                "done": True,
+                "prompt_eval_count": prompt_tokens,
+                "prompt_eval_duration": int(prefill * 1e9),
+                "eval_count": eval_tokens,
+                "eval_duration": int(generation * 1e9),
+            }
+        )
+
+    async def webhook(self, request):
+        await request.read()
+        return web.Response(text="ok")
+
+
+def serve(fake, ready):
+    """Run the fake server forever in the event loop of the current thread"""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    app = web.Application()
+    app.router.add_post("/api/generate", fake.generate)
+    app.router.add_post("/hooks/benchmark", fake.webhook)
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    loop.run_until_complete(site.start())
+    ready["port"] = site._server.sockets[0].getsockname()[1]
+    ready["event"].set()
+    loop.run_forever()
+
+
+def run(port, directory, jobs, batch_size):
+    """Analyze the jobs and return jobs per hour"""
+    config = {
+        "match_analysis": {
+            "resume_path": os.path.join(directory, "resume.md"),
+            "worker_count": 1,
+            "ollama": {"model": "benchmark", "endpoint": f"http://127.0.0.1:{port}"},
+            "results": {"path": os.path.join(directory, f"results_{batch_size}.db")},
+            "dead_letter": {"path": os.path.join(directory, "dead_letters.db")},
+            "batch": {"enabled": batch_size > 1, "max_jobs": batch_size},
+        },
+        "push_notification": {
+            "mattermost": {"webhook_url": f"http://127.0.0.1:{port}/hooks/benchmark"}
+        },
+    }
+    processor = JobMatchProcessor(config)
+    processor.start()
+
+    start = time.perf_counter()
+    processor.get_queue().put_many([make_job(idx) for idx in range(jobs)])
+    processor.join()
+    elapsed = time.perf_counter() - start
+    processor.stop()
+
+    analyzed = processor.results.counts().get("analysis", {}).get("decided", 0)
+    return analyzed / elapsed * 3600, processor.batch_fallbacks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched analysis benchmark")
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--resume-chars", type=int, default=8000)
+    parser.add_argument("--prefill-ms", type=float, default=1.0)
+    parser.add_argument("--eval-ms", type=float, default=0.05)
+    parser.add_argument("--output-tokens", type=int, default=300)
+    parser.add_argument("--no-prefix-cache", action="store_true")
+    args = parser.parse_args()
+
+    fake = FakeOllama(
+        args.prefill_ms, args.eval_ms, args.output_tokens, not args.no_prefix_cache
+    )
+    ready = {"event": threading.Event()}
+    threading.Thread(target=serve, args=(fake, ready), daemon=True).start()
+    ready["event"].wait()
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "resume.md"), "w", encoding="utf-8") as file:
+            line = "Senior engineer building backend services in Python and Go.\n"
+            file.write(line * (args.resume_chars // len(line)))
+
+        print(f"{'mode':<12} {'jobs/hour':>12} {'fallbacks':>10}")
+        for name, batch_size in (("single", 1), ("batch", args.batch_size)):
+            rate, fallbacks = run(ready["port"], directory, args.jobs, batch_size)
+            print(f"{name:<12} {rate:>12.0f} {fallbacks:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark throughput and timeouts of fixed concurrency against the
+adaptive limit
+
+Drives a simulated model server that runs up to --slots requests in
+parallel, each slower the more run at once as on a batching GPU, and queues
+the rest, as Ollama does with OLLAMA_NUM_PARALLEL. Requests waiting and
+running longer than --timeout fail. Workers send requests back to back for
+--seconds, either all at once (fixed concurrency) or within the limit of an
+AIMDLimiter between --floor and --ceiling.
+
+Usage:
+    python -m benchmarks.concurrency_benchmark --slots 4 --ceiling 16
+"""
+
+import argparse
+import asyncio
+import time
+
+from match_analysis.concurrency import AIMDLimiter
+
+
+class SimulatedServer:
+    """Serves requests in a fixed number of parallel slots"""
+
+    def __init__(self, slots, service_seconds, slowdown):
+        self.slots = asyncio.Semaphore(slots)
+        self.service_seconds = service_seconds
+        self.slowdown = slowdown
+        self.running = 0
+
+    async def generate(self):
+        async with self.slots:
+            self.running += 1
+            try:
+                duration = self.service_seconds * (
+                    1 + self.slowdown * (self.running - 1)
+                )
+                await asyncio.sleep(duration)
+            finally:
+                self.running -= 1
+
+
+async def run(args, workers, limiter=None):
+    """Send requests for the configured duration and return the statistics"""
+    server = SimulatedServer(args.slots, args.service_seconds, args.slowdown)
+    completed = 0
+    timeouts = 0
+    limits = []
+    deadline = time.monotonic() + args.seconds
+
+    async def worker():
+        nonlocal completed, timeouts
+        while time.monotonic() < deadline:
+            start = await limiter.acquire() if limiter is not None else 0.0
+            ok = timed_out = False
+            try:
+                await asyncio.wait_for(server.generate(), args.timeout)
+                ok = True
+                completed += 1
+            except asyncio.TimeoutError:
+                timed_out = True
+                timeouts += 1
+            finally:
+                if limiter is not None:
+                    await limiter.release(start, ok, timed_out)
+
+    async def sample():
+        while time.monotonic() < deadline:
+            limits.append(limiter.limit)
+            await asyncio.sleep(args.seconds / 100)
+
+    tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+    if limiter is not None:
+        tasks.append(asyncio.create_task(sample()))
+    await asyncio.gather(*tasks)
+
+    average_limit = sum(limits) / len(limits) if limits else workers
+    return completed / args.seconds, timeouts, average_limit
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Adaptive concurrency benchmark")
+    parser.add_argument("--slots", type=int, default=4)
+    parser.add_argument("--service-seconds", type=float, default=0.2)
+    parser.add_argument("--slowdown", type=float, default=0.15)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--floor", type=int, default=1)
+    parser.add_argument("--ceiling", type=int, default=16)
+    args = parser.parse_args()
+
+    cases = [
+        (f"fixed {count}", count, None)
+        for count in sorted({1, args.slots, args.ceiling})
+    ]
+    cases.append(
+        (
+            "adaptive",
+            args.ceiling,
+            AIMDLimiter(floor=args.floor, ceiling=args.ceiling),
+        )
+    )
+
+    print(f"{'mode':<12} {'requests/s':>11} {'timeouts':>9} {'avg limit':>10}")
+    for name, workers, limiter in cases:
+        rate, timeouts, limit = asyncio.run(run(args, workers, limiter))
+        print(f"{name:<12} {rate:>11.2f} {timeouts:>9} {limit:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
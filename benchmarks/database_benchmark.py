@@ -0,0 +1,178 @@
+"""
+Benchmark load time and memory of the job database backends
+
+Generates a synthetic multi-week job database in every backend and measures,
+in a fresh process per case, the load time and peak RSS of a full load and of
+the job_url/scrape_date projection used for dedup.
+
+Usage:
+    python -m benchmarks.database_benchmark --weeks 4 --jobs-per-day 400
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from job_scraper.database import create_job_database
+
+BACKENDS = {
+    "csv": {"backend": "csv", "csv_path": "jobs.csv"},
+    "sqlite": {"backend": "sqlite", "sqlite_path": "jobs.db"},
+    "parquet": {"backend": "parquet", "parquet_path": "jobs.parquet"},
+    "partitioned": {"backend": "partitioned", "partition_dir": "jobs_partitioned"},
+}
+
+DEDUP_COLUMNS = ["job_url", "scrape_date"]
+
+
+def generate_jobs(weeks, jobs_per_day):
+    """Generate a DataFrame shaped like the jobspy output"""
+    rng = random.Random(42)
+    words = [f"word{i}" for i in range(2000)]
+    now = datetime.now()
+
+    rows = []
+    for day in range(weeks * 7):
+        scrape_date = (now - timedelta(days=day)).strftime("%Y-%m-%d %H:%M:%S")
+        for idx in range(jobs_per_day):
+            site = rng.choice(["linkedin", "indeed"])
+            search_term = rng.choice(["backend engineer", "devops engineer", "golang"])
+            rows.append(
+                {
+                    "id": f"{site[:2]}-{day}-{idx}",
+                    "site": site,
+                    "job_url": f"https://example.com/{site}/{day}/{idx}",
+                    "title": " ".join(rng.choices(words, k=5)),
+                    "company": f"Company {rng.randrange(500)}",
+                    "location": "Singapore",
+                    "date_posted": (now - timedelta(days=day + 1)).date(),
+                    "job_type": rng.choice(["fulltime", "contract", None]),
+                    "job_level": rng.choice(["entry level", "mid-senior level"]),
+                    "description": " ".join(rng.choices(words, k=500)),
+                    "company_industry": "Technology",
+                    "scrape_date": scrape_date,
+                    "search_term": search_term,
+                    "search_location": "Singapore",
+                    "source": f"{site}_{search_term.replace(' ', '_')}:{site}",
+                }
+            )
+
+    return pd.DataFrame(rows)
+
+
+def storage_size(path):
+    """Get the size in bytes of a database file or partition directory"""
+    if os.path.isdir(path):
+        return sum(
+            os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)
+        )
+    return os.path.getsize(path)
+
+
+def measure(db_config, columns):
+    """Load the database once and report load time and peak RSS"""
+    database = create_job_database(db_config)
+
+    start = time.perf_counter()
+    jobs_df = database.load(columns=columns)
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is reported in kilobytes on Linux
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    frame_bytes = int(jobs_df.memory_usage(deep=True).sum())
+
+    print(
+        json.dumps(
+            {
+                "rows": len(jobs_df),
+                "seconds": elapsed,
+                "max_rss_kb": max_rss,
+                "frame_bytes": frame_bytes,
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Job database benchmark")
+    parser.add_argument("--weeks", type=int, default=4)
+    parser.add_argument("--jobs-per-day", type=int, default=400)
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    parser.add_argument("--columns", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        columns = args.columns.split(",") if args.columns else None
+        measure(json.loads(args.measure), columns)
+        return
+
+    jobs_df = generate_jobs(args.weeks, args.jobs_per_day)
+    cleanup_days = args.weeks * 7 + 1
+
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"Benchmarking {len(jobs_df)} jobs over {args.weeks} weeks")
+        print(
+            f"{'backend':<12} {'columns':<8} {'size MB':>8} {'load s':>8} "
+            f"{'frame MB':>9} {'RSS MB':>8}"
+        )
+
+        for name, db_config in BACKENDS.items():
+            db_config = {
+                key: (
+                    os.path.join(workdir, value)
+                    if key.endswith(("_path", "_dir"))
+                    else value
+                )
+                for key, value in db_config.items()
+            }
+            db_config["cleanup_days"] = cleanup_days
+
+            try:
+                create_job_database(db_config).save(jobs_df)
+            except ValueError as e:
+                print(f"{name:<12} skipped: {e}")
+                continue
+
+            size = storage_size(
+                next(
+                    value
+                    for key, value in db_config.items()
+                    if key.endswith(("_path", "_dir"))
+                )
+            )
+
+            for columns in (None, DEDUP_COLUMNS):
+                output = subprocess.run(
+                    [
+                        sys.executable,
+                        "-m",
+                        "benchmarks.database_benchmark",
+                        "--measure",
+                        json.dumps(db_config),
+                        "--columns",
+                        ",".join(columns or []),
+                    ],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                print(
+                    f"{name:<12} {'all' if columns is None else 'dedup':<8} "
+                    f"{size / 1e6:>8.1f} {result['seconds']:>8.2f} "
+                    f"{result['frame_bytes'] / 1e6:>9.1f} "
+                    f"{result['max_rss_kb'] / 1024:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
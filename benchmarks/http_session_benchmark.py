@@ -0,0 +1,81 @@
+"""
+Benchmark the per-request overhead of opening a session per request
+against the shared pooled session
+
+Serves a small JSON response from a local aiohttp server, standing in for
+the Ollama API, and times sequential requests made either with a new
+ClientSession per request or with the shared session of the event loop.
+
+Usage:
+    python -m benchmarks.http_session_benchmark --requests 500
+"""
+
+import argparse
+import asyncio
+import time
+
+import aiohttp
+from aiohttp import web
+
+from network import close_session, open_session
+
+
+async def handle(request):
+    """Answer like a non-streaming Ollama generate call"""
+    await request.read()
+    return web.json_response({"response": '{"ok": true}', "done": True})
+
+
+async def per_request_session(url, payload, count):
+    """Open a new session for every request, as the code did before"""
+    for _ in range(count):
+        async with aiohttp.ClientSession() as session:
+            async with session.post(url, json=payload) as response:
+                await response.json()
+
+
+async def shared_session(url, payload, count):
+    """Reuse the shared session and its kept-alive connections"""
+    session = open_session()
+    for _ in range(count):
+        async with session.post(url, json=payload) as response:
+            await response.json()
+
+
+async def run(count):
+    app = web.Application()
+    app.router.add_post("/api/generate", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    url = f"http://127.0.0.1:{port}/api/generate"
+    payload = {"model": "benchmark", "prompt": "x" * 4000, "stream": False}
+
+    print(f"{'session':<12} {'ms/request':>12}")
+    try:
+        for name, bench in (
+            ("per-request", per_request_session),
+            ("shared", shared_session),
+        ):
+            start = time.perf_counter()
+            await bench(url, payload, count)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<12} {elapsed / count * 1000:>12.3f}")
+    finally:
+        await close_session()
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP session benchmark")
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
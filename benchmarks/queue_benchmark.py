@@ -0,0 +1,72 @@
+"""
+Benchmark enqueue and dequeue throughput of the job queues
+
+Puts a batch of jobspy-shaped jobs on each queue and drains it with
+get/task_done, reporting jobs per second for both phases.
+
+Usage:
+    python -m benchmarks.queue_benchmark --jobs 1000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from match_analysis.queue import JobQueue, PersistentJobQueue
+
+
+def make_job(idx):
+    """Build a job dictionary shaped like a scraped job"""
+    return {
+        "id": f"li-{idx}",
+        "site": "linkedin",
+        "job_url": f"https://example.com/jobs/{idx}",
+        "title": "Backend Software Engineer",
+        "company": "Company",
+        "description": "Build and operate distributed systems. " * 100,
+        "scrape_date": "2025-04-09 18:01:15",
+        "source": "linkedin_backend_sg:linkedin",
+    }
+
+
+async def run(queue, jobs):
+    """Fill and drain a queue, returning enqueue and dequeue rates"""
+    start = time.perf_counter()
+    for job in jobs:
+        await queue.put(job)
+    enqueue_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in jobs:
+        job = await queue.get()
+        queue.task_done(job)
+    dequeue_seconds = time.perf_counter() - start
+
+    return len(jobs) / enqueue_seconds, len(jobs) / dequeue_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Job queue benchmark")
+    parser.add_argument("--jobs", type=int, default=1000)
+    args = parser.parse_args()
+
+    jobs = [make_job(idx) for idx in range(args.jobs)]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        queues = {
+            "in-memory": JobQueue(max_size=args.jobs),
+            "persistent": PersistentJobQueue(
+                path=os.path.join(workdir, "job_queue.db"), max_size=args.jobs
+            ),
+        }
+
+        print(f"{'queue':<12} {'put/s':>10} {'get/s':>10}")
+        for name, queue in queues.items():
+            put_rate, get_rate = asyncio.run(run(queue, jobs))
+            print(f"{name:<12} {put_rate:>10.0f} {get_rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,14 @@ ENV_MAPPING = {
     "JOB_SCRAPER_PARALLEL": "job_scraper.scraper_config.parallel",
     "MATCH_ANALYSIS_OLLAMA_MODEL": "match_analysis.ollama.model",
     "MATCH_ANALYSIS_OLLAMA_ENDPOINT": "match_analysis.ollama.endpoint",
+    "MATCH_ANALYSIS_BACKEND": "match_analysis.backend",
+    "MATCH_ANALYSIS_OPENAI_MODEL": "match_analysis.openai.model",
+    "MATCH_ANALYSIS_OPENAI_ENDPOINT": "match_analysis.openai.endpoint",
+    "MATCH_ANALYSIS_OPENAI_API_KEY": "match_analysis.openai.api_key",
+    "JOB_SCRAPER_DATABASE_BACKEND": "job_scraper.database.backend",
     "JOB_SCRAPER_DATABASE_CSV_PATH": "job_scraper.database.csv_path",
+    "JOB_SCRAPER_DATABASE_SQLITE_PATH": "job_scraper.database.sqlite_path",
+    "JOB_SCRAPER_DATABASE_PARQUET_PATH": "job_scraper.database.parquet_path",
+    "JOB_SCRAPER_DATABASE_PARTITION_DIR": "job_scraper.database.partition_dir",
     "JOB_SCRAPER_CLEANUP_DAYS": "job_scraper.database.cleanup_days",
 }
@@ -4,4 +4,4 @@ Job scraper package for finding and analyzing job postings
 
 from job_scraper.producer_manager import ProducerManager
 
-__all__ = ['ProducerManager']
\ No newline at end of file
+__all__ = ["ProducerManager"]
@@ -1,8 +1,47 @@
 import pandas as pd
+import contextlib
 import os
+import json
+import sqlite3
 
 from datetime import datetime, timedelta
 
+SCRAPE_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Low-cardinality columns stored as categoricals in columnar formats
+CATEGORY_COLUMNS = [
+    "site",
+    "source",
+    "search_term",
+    "search_location",
+    "job_type",
+    "job_level",
+]
+
+
+def compact_dtypes(jobs_df):
+    """
+    Convert job columns to compact dtypes for columnar storage
+
+    Args:
+        jobs_df: DataFrame of jobs
+
+    Returns:
+        DataFrame: Copy of jobs_df with categorical and datetime columns
+    """
+    jobs_df = jobs_df.copy()
+
+    for column in CATEGORY_COLUMNS:
+        if column in jobs_df:
+            jobs_df[column] = jobs_df[column].astype("category")
+
+    if "scrape_date" in jobs_df:
+        jobs_df["scrape_date"] = pd.to_datetime(jobs_df["scrape_date"])
+    if "date_posted" in jobs_df:
+        jobs_df["date_posted"] = pd.to_datetime(jobs_df["date_posted"], errors="coerce")
+
+    return jobs_df
+
 
 class JobDatabase:
     """
@@ -23,21 +62,69 @@ class JobDatabase:
         """Check if database exists and has data"""
         return os.path.exists(self.csv_path) and os.path.getsize(self.csv_path) > 0
 
-    def load(self):
-        """Load jobs from database"""
+    def load(self, columns=None):
+        """
+        Load jobs from database
+
+        Args:
+            columns: Optional list of columns to load, all columns if None
+        """
         if not self.exists():
             return pd.DataFrame()
 
-        jobs_df = pd.read_csv(self.csv_path)
-        jobs_df["scrape_date"] = pd.to_datetime(jobs_df["scrape_date"])
+        jobs_df = pd.read_csv(self.csv_path, usecols=columns)
+        if "scrape_date" in jobs_df:
+            jobs_df["scrape_date"] = pd.to_datetime(jobs_df["scrape_date"])
         return jobs_df
 
     def save(self, jobs_df):
         """Save jobs to database"""
         jobs_df.to_csv(self.csv_path, index=False)
 
-    def clean_old_jobs(self, jobs_df):
-        """Remove jobs older than cleanup_days"""
+    def append_jobs(self, jobs_df):
+        """
+        Append jobs that are already known to be new without reading the file
+
+        Args:
+            jobs_df: DataFrame of new jobs
+
+        Returns:
+            DataFrame: The appended jobs
+        """
+        if jobs_df.empty:
+            return jobs_df
+
+        if not self.exists():
+            self.save(jobs_df)
+            return jobs_df
+
+        # Keep the column order of the existing file, rewrite if new columns appear
+        columns = pd.read_csv(self.csv_path, nrows=0).columns
+        if not set(jobs_df.columns) <= set(columns):
+            self.save(pd.concat([self.load(), jobs_df]))
+            return jobs_df
+
+        jobs_df.reindex(columns=columns).to_csv(
+            self.csv_path, mode="a", header=False, index=False
+        )
+        return jobs_df
+
+    def clean_old_jobs(self, jobs_df=None):
+        """
+        Remove jobs older than cleanup_days
+
+        Args:
+            jobs_df: DataFrame to clean, if None the stored jobs are cleaned and saved
+
+        Returns:
+            tuple: (cleaned jobs_df, number of old jobs removed)
+        """
+        if jobs_df is None:
+            jobs_df, old_jobs_count = self.clean_old_jobs(self.load())
+            if old_jobs_count > 0:
+                self.save(jobs_df)
+            return jobs_df, old_jobs_count
+
         if jobs_df.empty:
             return jobs_df, 0
 
@@ -50,3 +137,621 @@ class JobDatabase:
             )
 
         return jobs_df, old_jobs_count
+
+    def insert_new_jobs(self, new_jobs_df):
+        """
+        Store the jobs that are not yet in the database
+
+        The CSV backend has no index, so the whole file is loaded, cleaned
+        and rewritten.
+
+        Args:
+            new_jobs_df: DataFrame of freshly scraped jobs
+
+        Returns:
+            tuple: (DataFrame of jobs that were actually inserted, number of old jobs removed)
+        """
+        if not self.exists():
+            self.save(new_jobs_df)
+            return new_jobs_df, 0
+
+        existing_jobs = self.load()
+        existing_jobs, old_jobs_count = self.clean_old_jobs(existing_jobs)
+
+        new_jobs = new_jobs_df[~new_jobs_df["job_url"].isin(existing_jobs["job_url"])]
+
+        if len(new_jobs) > 0:
+            self.save(pd.concat([existing_jobs, new_jobs]))
+        elif old_jobs_count > 0:
+            self.save(existing_jobs)
+
+        return new_jobs, old_jobs_count
+
+
+class SQLiteJobDatabase:
+    """
+    Manages job data storage in a SQLite database
+
+    Each job row is stored as a JSON document next to an indexed ``job_url``
+    and ``scrape_date``, so new jobs are inserted incrementally and retention
+    is a single indexed delete instead of a full rewrite.
+    """
+
+    def __init__(self, sqlite_path, cleanup_days):
+        if not sqlite_path:
+            raise ValueError("Missing SQLite path for job database")
+
+        if not isinstance(cleanup_days, int) or cleanup_days < 0:
+            raise ValueError("cleanup_days must be a positive integer")
+
+        self.sqlite_path = sqlite_path
+        self.cleanup_days = cleanup_days
+
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS jobs (
+                        job_url TEXT NOT NULL,
+                        scrape_date TEXT NOT NULL,
+                        data TEXT NOT NULL
+                    )
+                    """
+                )
+                conn.execute(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_job_url ON jobs (job_url)"
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_jobs_scrape_date ON jobs (scrape_date)"
+                )
+
+    def _connect(self):
+        """Open a new connection, one per operation so threads never share one"""
+        conn = sqlite3.connect(self.sqlite_path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def exists(self):
+        """Check if database exists and has data"""
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                return conn.execute("SELECT 1 FROM jobs LIMIT 1").fetchone() is not None
+
+    def load(self, columns=None):
+        """
+        Load jobs from database
+
+        Args:
+            columns: Optional list of columns to load, all columns if None
+        """
+        if columns is not None and set(columns) <= {"job_url", "scrape_date"}:
+            # Indexed columns are read directly without decoding the documents
+            with contextlib.closing(self._connect()) as conn:
+                with conn:
+                    rows = conn.execute(
+                        f"SELECT {', '.join(columns)} FROM jobs ORDER BY rowid"
+                    ).fetchall()
+            jobs_df = pd.DataFrame(rows, columns=columns)
+        else:
+            with contextlib.closing(self._connect()) as conn:
+                with conn:
+                    rows = conn.execute(
+                        "SELECT data FROM jobs ORDER BY rowid"
+                    ).fetchall()
+            jobs_df = pd.DataFrame([json.loads(row[0]) for row in rows])
+            if columns is not None and not jobs_df.empty:
+                jobs_df = jobs_df.reindex(columns=columns)
+
+        if jobs_df.empty:
+            return pd.DataFrame()
+
+        if "scrape_date" in jobs_df:
+            jobs_df["scrape_date"] = pd.to_datetime(jobs_df["scrape_date"])
+        return jobs_df
+
+    def save(self, jobs_df):
+        """Save jobs to database, keeping the already stored copy of duplicates"""
+        self._insert(jobs_df)
+
+    def append_jobs(self, jobs_df):
+        """
+        Append jobs that are already known to be new
+
+        Args:
+            jobs_df: DataFrame of new jobs
+
+        Returns:
+            DataFrame: The jobs that were inserted
+        """
+        if jobs_df.empty:
+            return jobs_df
+
+        return jobs_df[self._insert(jobs_df)]
+
+    def clean_old_jobs(self, jobs_df=None):
+        """
+        Remove jobs older than cleanup_days
+
+        Args:
+            jobs_df: Optional DataFrame to apply the same cutoff to
+
+        Returns:
+            tuple: (filtered jobs_df, number of rows deleted from the database)
+        """
+        cutoff_date = datetime.now() - timedelta(days=self.cleanup_days)
+
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                old_jobs_count = conn.execute(
+                    "DELETE FROM jobs WHERE scrape_date < ?",
+                    (cutoff_date.strftime(SCRAPE_DATE_FORMAT),),
+                ).rowcount
+
+        if old_jobs_count > 0:
+            print(
+                f"Removed {old_jobs_count} job postings older than {self.cleanup_days} days."
+            )
+
+        if jobs_df is not None and not jobs_df.empty:
+            jobs_df = jobs_df[pd.to_datetime(jobs_df["scrape_date"]) >= cutoff_date]
+
+        return jobs_df, old_jobs_count
+
+    def insert_new_jobs(self, new_jobs_df):
+        """
+        Store the jobs that are not yet in the database
+
+        Args:
+            new_jobs_df: DataFrame of freshly scraped jobs
+
+        Returns:
+            tuple: (DataFrame of jobs that were actually inserted, number of old jobs removed)
+        """
+        _, old_jobs_count = self.clean_old_jobs()
+        if new_jobs_df.empty:
+            return new_jobs_df, old_jobs_count
+
+        inserted = self._insert(new_jobs_df)
+        return new_jobs_df[inserted], old_jobs_count
+
+    def _insert(self, jobs_df):
+        """
+        Insert jobs with INSERT OR IGNORE semantics
+
+        Returns:
+            list: Boolean mask of the rows in jobs_df that were inserted
+        """
+        if jobs_df.empty:
+            return []
+
+        records = json.loads(
+            jobs_df.to_json(orient="records", date_format="iso", default_handler=str)
+        )
+        scrape_dates = pd.to_datetime(jobs_df["scrape_date"]).dt.strftime(
+            SCRAPE_DATE_FORMAT
+        )
+
+        inserted = []
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                for record, scrape_date in zip(records, scrape_dates):
+                    record["scrape_date"] = scrape_date
+                    cursor = conn.execute(
+                        "INSERT OR IGNORE INTO jobs (job_url, scrape_date, data) VALUES (?, ?, ?)",
+                        (record["job_url"], scrape_date, json.dumps(record)),
+                    )
+                    inserted.append(cursor.rowcount == 1)
+
+        return inserted
+
+
+class PartitionedJobDatabase:
+    """
+    Manages job data storage as one file per scrape day under a directory
+
+    New jobs are only appended to the partition of their scrape day and
+    retention deletes whole expired partitions, so the I/O of a run is
+    proportional to the new data rather than the retention window. Rows are
+    kept until their whole day partition expires.
+    """
+
+    FILE_FORMATS = ("csv.gz", "parquet")
+
+    def __init__(self, directory, cleanup_days, file_format="csv.gz"):
+        if not directory:
+            raise ValueError("Missing partition directory for job database")
+
+        if not isinstance(cleanup_days, int) or cleanup_days < 0:
+            raise ValueError("cleanup_days must be a positive integer")
+
+        if file_format not in self.FILE_FORMATS:
+            raise ValueError(
+                f"Unknown partition format: {file_format}, expected one of {self.FILE_FORMATS}"
+            )
+
+        if file_format == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError as exc:
+                raise ValueError(
+                    "The parquet partition format requires pyarrow to be installed"
+                ) from exc
+
+        self.directory = directory
+        self.cleanup_days = cleanup_days
+        self.file_format = file_format
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _partition_path(self, day):
+        """Get the file path of the partition of a day"""
+        return os.path.join(
+            self.directory, f"jobs_{day.strftime('%Y-%m-%d')}.{self.file_format}"
+        )
+
+    def _partitions(self):
+        """
+        List the partitions in the directory
+
+        Returns:
+            list: (day, path) tuples sorted by day
+        """
+        prefix, suffix = "jobs_", f".{self.file_format}"
+        partitions = []
+        for name in os.listdir(self.directory):
+            if not (name.startswith(prefix) and name.endswith(suffix)):
+                continue
+            try:
+                day = datetime.strptime(name[len(prefix) : -len(suffix)], "%Y-%m-%d")
+            except ValueError:
+                continue
+            partitions.append((day.date(), os.path.join(self.directory, name)))
+
+        return sorted(partitions)
+
+    def _cutoff_day(self):
+        """Get the first day that is still within the retention window"""
+        return (datetime.now() - timedelta(days=self.cleanup_days)).date()
+
+    def _read_partition(self, path, columns=None):
+        """Read a single partition file"""
+        if self.file_format == "parquet":
+            return pd.read_parquet(path, columns=columns)
+        return pd.read_csv(path, usecols=columns, compression="gzip")
+
+    def _write_partition(self, path, jobs_df):
+        """Append jobs to a single partition file"""
+        if self.file_format == "parquet":
+            # Parquet files are immutable, rewrite the day's partition only
+            jobs_df = compact_dtypes(jobs_df)
+            if os.path.exists(path):
+                jobs_df = compact_dtypes(
+                    pd.concat([self._read_partition(path), jobs_df])
+                )
+            jobs_df.to_parquet(path, index=False, compression="zstd")
+            return
+
+        if not os.path.exists(path):
+            jobs_df.to_csv(path, index=False, compression="gzip")
+            return
+
+        columns = pd.read_csv(path, nrows=0, compression="gzip").columns
+        if not set(jobs_df.columns) <= set(columns):
+            pd.concat([self._read_partition(path), jobs_df]).to_csv(
+                path, index=False, compression="gzip"
+            )
+            return
+
+        # Gzip members can be concatenated, so appending does not rewrite the file
+        jobs_df.reindex(columns=columns).to_csv(
+            path, mode="a", header=False, index=False, compression="gzip"
+        )
+
+    def exists(self):
+        """Check if database exists and has data"""
+        return len(self._partitions()) > 0
+
+    def load(self, columns=None):
+        """
+        Load jobs from the live partitions
+
+        Args:
+            columns: Optional list of columns to load, all columns if None
+        """
+        cutoff_day = self._cutoff_day()
+        frames = [
+            self._read_partition(path, columns)
+            for day, path in self._partitions()
+            if day >= cutoff_day
+        ]
+        if not frames:
+            return pd.DataFrame()
+
+        jobs_df = pd.concat(frames, ignore_index=True)
+        if "scrape_date" in jobs_df:
+            jobs_df["scrape_date"] = pd.to_datetime(jobs_df["scrape_date"])
+        return jobs_df
+
+    def save(self, jobs_df):
+        """Save jobs to the partitions of their scrape days"""
+        self.append_jobs(jobs_df)
+
+    def append_jobs(self, jobs_df):
+        """
+        Append jobs that are already known to be new
+
+        Args:
+            jobs_df: DataFrame of new jobs
+
+        Returns:
+            DataFrame: The appended jobs
+        """
+        if jobs_df.empty:
+            return jobs_df
+
+        days = pd.to_datetime(jobs_df["scrape_date"]).dt.date
+        for day, day_jobs in jobs_df.groupby(days):
+            self._write_partition(self._partition_path(day), day_jobs)
+
+        return jobs_df
+
+    def clean_old_jobs(self, jobs_df=None):
+        """
+        Delete expired partitions
+
+        Args:
+            jobs_df: Optional DataFrame to apply the same cutoff to
+
+        Returns:
+            tuple: (filtered jobs_df, number of old jobs removed)
+        """
+        cutoff_day = self._cutoff_day()
+
+        old_jobs_count = 0
+        for day, path in self._partitions():
+            if day < cutoff_day:
+                old_jobs_count += len(self._read_partition(path, ["job_url"]))
+                os.remove(path)
+
+        if old_jobs_count > 0:
+            print(
+                f"Removed {old_jobs_count} job postings older than {self.cleanup_days} days."
+            )
+
+        if jobs_df is not None and not jobs_df.empty:
+            days = pd.to_datetime(jobs_df["scrape_date"]).dt.date
+            jobs_df = jobs_df[days >= cutoff_day]
+
+        return jobs_df, old_jobs_count
+
+    def insert_new_jobs(self, new_jobs_df):
+        """
+        Store the jobs that are not yet in the database
+
+        Only the job_url column of the live partitions is read for the lookup.
+
+        Args:
+            new_jobs_df: DataFrame of freshly scraped jobs
+
+        Returns:
+            tuple: (DataFrame of jobs that were actually inserted, number of old jobs removed)
+        """
+        _, old_jobs_count = self.clean_old_jobs()
+
+        existing_jobs = self.load(columns=["job_url"])
+        if not existing_jobs.empty:
+            new_jobs_df = new_jobs_df[
+                ~new_jobs_df["job_url"].isin(existing_jobs["job_url"])
+            ]
+        new_jobs_df = new_jobs_df.drop_duplicates(subset="job_url")
+
+        return self.append_jobs(new_jobs_df), old_jobs_count
+
+
+class ParquetJobDatabase:
+    """
+    Manages job data storage in a single zstd-compressed Parquet file
+
+    Low-cardinality columns are stored as categoricals and dates as native
+    timestamps, and loads can be restricted to the columns that are needed.
+    """
+
+    def __init__(self, parquet_path, cleanup_days, csv_path=None):
+        if not parquet_path:
+            raise ValueError("Missing Parquet path for job database")
+
+        if not isinstance(cleanup_days, int) or cleanup_days < 0:
+            raise ValueError("cleanup_days must be a positive integer")
+
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as exc:
+            raise ValueError(
+                "The parquet backend requires pyarrow to be installed"
+            ) from exc
+
+        self.parquet_path = parquet_path
+        self.cleanup_days = cleanup_days
+
+        # Migrate an existing CSV database on first use
+        if (
+            csv_path
+            and not self.exists()
+            and JobDatabase(csv_path, cleanup_days).exists()
+        ):
+            self.migrate_from_csv(csv_path)
+
+    def exists(self):
+        """Check if database exists and has data"""
+        return (
+            os.path.exists(self.parquet_path) and os.path.getsize(self.parquet_path) > 0
+        )
+
+    def load(self, columns=None):
+        """
+        Load jobs from database
+
+        Args:
+            columns: Optional list of columns to load, all columns if None
+        """
+        if not self.exists():
+            return pd.DataFrame()
+
+        return pd.read_parquet(self.parquet_path, columns=columns)
+
+    def save(self, jobs_df):
+        """Save jobs to database"""
+        # Write to a temporary file first so a crash never leaves a truncated database
+        tmp_path = f"{self.parquet_path}.tmp"
+        compact_dtypes(jobs_df).to_parquet(tmp_path, index=False, compression="zstd")
+        os.replace(tmp_path, self.parquet_path)
+
+    def append_jobs(self, jobs_df):
+        """
+        Append jobs that are already known to be new
+
+        A single Parquet file cannot be appended to, so the whole file is
+        rewritten; the partitioned backend only writes the scrape day's partition.
+
+        Args:
+            jobs_df: DataFrame of new jobs
+
+        Returns:
+            DataFrame: The appended jobs
+        """
+        if jobs_df.empty:
+            return jobs_df
+
+        if self.exists():
+            self.save(
+                pd.concat([self.load(), compact_dtypes(jobs_df)], ignore_index=True)
+            )
+        else:
+            self.save(jobs_df)
+
+        return jobs_df
+
+    def clean_old_jobs(self, jobs_df=None):
+        """
+        Remove jobs older than cleanup_days
+
+        Args:
+            jobs_df: DataFrame to clean, if None the stored jobs are cleaned and saved
+
+        Returns:
+            tuple: (cleaned jobs_df, number of old jobs removed)
+        """
+        cutoff_date = datetime.now() - timedelta(days=self.cleanup_days)
+
+        if jobs_df is None:
+            # Only the scrape dates are read unless there is something to remove
+            scrape_dates = self.load(columns=["scrape_date"])
+            if (
+                scrape_dates.empty
+                or not (scrape_dates["scrape_date"] < cutoff_date).any()
+            ):
+                return scrape_dates, 0
+
+            jobs_df, old_jobs_count = self.clean_old_jobs(self.load())
+            self.save(jobs_df)
+            return jobs_df, old_jobs_count
+
+        if jobs_df.empty:
+            return jobs_df, 0
+
+        scrape_dates = pd.to_datetime(jobs_df["scrape_date"])
+        old_jobs_count = int((scrape_dates < cutoff_date).sum())
+        if old_jobs_count > 0:
+            jobs_df = jobs_df[scrape_dates >= cutoff_date]
+            print(
+                f"Removed {old_jobs_count} job postings older than {self.cleanup_days} days."
+            )
+
+        return jobs_df, old_jobs_count
+
+    def insert_new_jobs(self, new_jobs_df):
+        """
+        Store the jobs that are not yet in the database
+
+        Only the job_url column is read for the lookup.
+
+        Args:
+            new_jobs_df: DataFrame of freshly scraped jobs
+
+        Returns:
+            tuple: (DataFrame of jobs that were actually inserted, number of old jobs removed)
+        """
+        _, old_jobs_count = self.clean_old_jobs()
+
+        existing_jobs = self.load(columns=["job_url"])
+        if not existing_jobs.empty:
+            new_jobs_df = new_jobs_df[
+                ~new_jobs_df["job_url"].isin(existing_jobs["job_url"])
+            ]
+        new_jobs_df = new_jobs_df.drop_duplicates(subset="job_url")
+
+        return self.append_jobs(new_jobs_df), old_jobs_count
+
+    def migrate_from_csv(self, csv_path):
+        """
+        Import an existing CSV job database
+
+        Args:
+            csv_path: Path to the CSV job database
+
+        Returns:
+            int: Number of migrated jobs
+        """
+        jobs_df = JobDatabase(csv_path, self.cleanup_days).load()
+        if jobs_df.empty:
+            return 0
+
+        self.save(jobs_df)
+        print(
+            f"Migrated {len(jobs_df)} job postings from {csv_path} to {self.parquet_path}."
+        )
+        return len(jobs_df)
+
+
+def create_job_database(db_config):
+    """
+    Create the job database backend selected in the database configuration
+
+    Args:
+        db_config: The 'database' section of the job scraper configuration
+
+    Returns:
+        The job database instance
+
+    Raises:
+        ValueError: If the backend is unknown or its required fields are missing
+    """
+    backend = db_config.get("backend", "csv")
+
+    if "cleanup_days" not in db_config:
+        raise ValueError("Missing 'cleanup_days' in database configuration")
+
+    if backend == "csv":
+        if "csv_path" not in db_config:
+            raise ValueError("Missing 'csv_path' in database configuration")
+        return JobDatabase(db_config["csv_path"], db_config["cleanup_days"])
+    elif backend == "sqlite":
+        return SQLiteJobDatabase(
+            db_config.get("sqlite_path", "jobs_database.db"),
+            db_config["cleanup_days"],
+        )
+    elif backend == "parquet":
+        return ParquetJobDatabase(
+            db_config.get("parquet_path", "jobs_database.parquet"),
+            db_config["cleanup_days"],
+            csv_path=db_config.get("csv_path"),
+        )
+    elif backend == "partitioned":
+        return PartitionedJobDatabase(
+            db_config.get("partition_dir", "jobs_database"),
+            db_config["cleanup_days"],
+            file_format=db_config.get("partition_format", "csv.gz"),
+        )
+    else:
+        raise ValueError(f"Unknown database backend: {backend}")
@@ -0,0 +1,325 @@
+"""
+Near-duplicate detection for job postings across sites and reposts
+"""
+
+import logging
+import random
+import re
+import threading
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(
+    filename="job_scraper.log",
+    filemode="a",
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("fingerprint")
+
+# Largest Mersenne prime below 2^32, keeps the MinHash products within uint64
+MERSENNE_PRIME = (1 << 31) - 1
+
+# Legal suffixes that differ between sites for the same company
+COMPANY_SUFFIXES = {
+    "pte",
+    "ltd",
+    "limited",
+    "inc",
+    "llc",
+    "llp",
+    "co",
+    "corp",
+    "corporation",
+    "company",
+    "gmbh",
+    "plc",
+    "sdn",
+    "bhd",
+}
+
+
+def normalize_text(text: Any) -> str:
+    """
+    Normalize free text for fingerprinting
+
+    Args:
+        text: Text to normalize, non-strings are treated as empty
+
+    Returns:
+        str: Lowercase text with markdown escapes and punctuation removed
+    """
+    if not isinstance(text, str):
+        return ""
+
+    text = text.replace("\\", "").lower()
+    return " ".join(re.findall(r"[a-z0-9+#]+", text))
+
+
+def normalize_company(company: Any) -> str:
+    """
+    Normalize a company name so the same employer matches across sites
+
+    Args:
+        company: Company name
+
+    Returns:
+        str: Normalized company name without legal suffixes
+    """
+    words = normalize_text(company).split()
+    return " ".join(word for word in words if word not in COMPANY_SUFFIXES)
+
+
+class NearDuplicateIndex:
+    """
+    Thread-safe MinHash LSH index over the retained job postings
+
+    A job is a near-duplicate of an indexed job when both are posted by the
+    same normalized company, their titles share most words and the estimated
+    Jaccard similarity of their description shingles reaches the threshold.
+    """
+
+    def __init__(
+        self,
+        cleanup_days: int,
+        threshold: float = 0.8,
+        title_threshold: float = 0.6,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 3,
+    ):
+        """
+        Initialize the near-duplicate index
+
+        Args:
+            cleanup_days: Jobs indexed more than this many days ago are pruned
+            threshold: Minimum estimated description similarity of a near-duplicate
+            title_threshold: Minimum word overlap of the titles of a near-duplicate
+            num_perm: Number of MinHash permutations
+            bands: Number of LSH bands, must divide num_perm
+            shingle_size: Number of words per description shingle
+        """
+        if num_perm % bands != 0:
+            raise ValueError("Deduplication num_perm must be divisible by bands")
+
+        self.cleanup_days = cleanup_days
+        self.threshold = threshold
+        self.title_threshold = title_threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = random.Random(1)
+        self._a = np.array(
+            [rng.randrange(1, MERSENNE_PRIME) for _ in range(num_perm)], dtype=np.uint64
+        )
+        self._b = np.array(
+            [rng.randrange(0, MERSENNE_PRIME) for _ in range(num_perm)], dtype=np.uint64
+        )
+
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._buckets: Dict[tuple, set] = {}
+        self._lock = threading.Lock()
+
+        self.duplicates_found = 0
+
+    def signature(self, description: Any) -> Optional[np.ndarray]:
+        """
+        Compute the MinHash signature of a job description
+
+        Args:
+            description: Job description
+
+        Returns:
+            np.ndarray: MinHash signature, or None if the description is empty
+        """
+        words = normalize_text(description).split()
+        if not words:
+            return None
+
+        size = min(self.shingle_size, len(words))
+        shingles = {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+        hashes = np.array(
+            [zlib.crc32(shingle.encode()) & MERSENNE_PRIME for shingle in shingles],
+            dtype=np.uint64,
+        )
+
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[tuple]:
+        """Split a signature into its LSH bucket keys"""
+        return [
+            (band, signature[band * self.rows : (band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def _title_similarity(self, title: str, other: str) -> float:
+        """Word overlap of two normalized titles"""
+        words, other_words = set(title.split()), set(other.split())
+        if not words or not other_words:
+            return 0.0
+        return len(words & other_words) / len(words | other_words)
+
+    def _find(self, job_url, company, title, signature) -> Optional[str]:
+        """Find the original of a job among the indexed jobs, lock must be held"""
+        candidates = set()
+        for key in self._band_keys(signature):
+            candidates.update(self._buckets.get(key, ()))
+        candidates.discard(job_url)
+
+        # Prefer the earliest posting so reposts link to the original
+        for candidate in sorted(
+            candidates, key=lambda url: (self._entries[url]["indexed_at"], url)
+        ):
+            entry = self._entries[candidate]
+            if entry["company"] != company:
+                continue
+            if self._title_similarity(title, entry["title"]) < self.title_threshold:
+                continue
+            if np.mean(signature == entry["signature"]) >= self.threshold:
+                # Always link to the first posting, not to another duplicate
+                return entry["duplicate_of"] or candidate
+
+        return None
+
+    def _add(self, job_url, company, title, signature, duplicate_of, indexed_at):
+        """Add a job to the index, lock must be held"""
+        band_keys = self._band_keys(signature)
+        self._entries[job_url] = {
+            "company": company,
+            "title": title,
+            "signature": signature,
+            "band_keys": band_keys,
+            "duplicate_of": duplicate_of,
+            "indexed_at": indexed_at,
+        }
+        for key in band_keys:
+            self._buckets.setdefault(key, set()).add(job_url)
+
+    def _remove(self, job_url) -> None:
+        """Remove a job from the index, lock must be held"""
+        for key in self._entries.pop(job_url)["band_keys"]:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(job_url)
+                if not bucket:
+                    del self._buckets[key]
+
+    def load(self, database) -> None:
+        """
+        Index the jobs stored in the job database
+
+        Args:
+            database: Job database to read the jobs from
+        """
+        columns = ["job_url", "company", "title", "description", "scrape_date"]
+        jobs_df = database.load(columns=columns)
+
+        count = 0
+        for job in jobs_df.to_dict("records"):
+            signature = self.signature(job["description"])
+            if signature is None:
+                continue
+            with self._lock:
+                self._add(
+                    job["job_url"],
+                    normalize_company(job["company"]),
+                    normalize_text(job["title"]),
+                    signature,
+                    None,
+                    job["scrape_date"],
+                )
+            count += 1
+
+        logger.info(f"Indexed {count} job descriptions for near-duplicate detection")
+
+    def link(self, jobs_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Link near-duplicate jobs to their original posting
+
+        Args:
+            jobs_df: DataFrame of new jobs
+
+        Returns:
+            DataFrame: Copy of jobs_df with a 'duplicate_of' column holding the
+            job URL of the original posting, or None for original postings
+        """
+        jobs_df = jobs_df.copy()
+        now = datetime.now()
+        duplicate_of = []
+
+        for job in jobs_df.to_dict("records"):
+            signature = self.signature(job.get("description"))
+            if signature is None:
+                duplicate_of.append(None)
+                continue
+
+            company = normalize_company(job.get("company"))
+            title = normalize_text(job.get("title"))
+
+            # Lookup and insert atomically so parallel scrapers agree on the original
+            with self._lock:
+                original = self._find(job["job_url"], company, title, signature)
+                self._add(job["job_url"], company, title, signature, original, now)
+                if original is not None:
+                    self.duplicates_found += 1
+
+            if original is not None:
+                logger.info(
+                    f"Near-duplicate job {job['job_url']} ({job.get('title')} at "
+                    f"{job.get('company')}) linked to {original}"
+                )
+            duplicate_of.append(original)
+
+        jobs_df["duplicate_of"] = duplicate_of
+        return jobs_df
+
+    def prune(self) -> int:
+        """
+        Remove jobs older than cleanup_days
+
+        Returns:
+            int: Number of pruned jobs
+        """
+        cutoff_date = datetime.now() - timedelta(days=self.cleanup_days)
+
+        with self._lock:
+            expired = [
+                job_url
+                for job_url, entry in self._entries.items()
+                if entry["indexed_at"] < cutoff_date
+            ]
+            for job_url in expired:
+                self._remove(job_url)
+
+        return len(expired)
+
+    def release(self, job_urls: Iterable[str]) -> None:
+        """
+        Forget linked jobs, e.g. when storing them failed
+
+        Args:
+            job_urls: Job URLs to release
+        """
+        with self._lock:
+            for job_url in job_urls:
+                if job_url in self._entries:
+                    self._remove(job_url)
+
+    def pop_duplicates_found(self) -> int:
+        """
+        Get and reset the number of near-duplicates found since the last call
+
+        Returns:
+            int: Number of near-duplicates, i.e. LLM analyses saved
+        """
+        with self._lock:
+            count, self.duplicates_found = self.duplicates_found, 0
+        return count
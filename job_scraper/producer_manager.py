@@ -6,7 +6,11 @@ import logging
 import concurrent.futures
 from typing import Dict, Any
 
+from job_scraper.database import create_job_database
+from job_scraper.fingerprint import NearDuplicateIndex
 from job_scraper.scraper import JobScraper
+from job_scraper.seen_index import SeenJobIndex
+from job_scraper.writer import DatabaseWriter
 from match_analysis.queue import JobQueue
 
 # Configure logging
@@ -46,6 +50,33 @@ class ProducerManager:
 
         db_config = config["database"]
 
+        # Shared database and seen job index, loaded once for all scrapers
+        self.database = create_job_database(db_config)
+        self.seen_jobs = SeenJobIndex(db_config["cleanup_days"])
+        self.seen_jobs.load(self.database)
+
+        # Optional near-duplicate index shared by all scrapers
+        self.duplicates = None
+        dedup_config = config.get("deduplication", {})
+        if dedup_config.get("enabled", False):
+            self.duplicates = NearDuplicateIndex(
+                db_config["cleanup_days"],
+                threshold=dedup_config.get("threshold", 0.8),
+                title_threshold=dedup_config.get("title_threshold", 0.6),
+                num_perm=dedup_config.get("num_perm", 64),
+                bands=dedup_config.get("bands", 16),
+            )
+            self.duplicates.load(self.database)
+
+        # Single writer that serializes and batches database writes of all scrapers
+        self.writer = DatabaseWriter(
+            self.database,
+            flush_interval=db_config.get("flush_interval", 5),
+            seen_jobs=self.seen_jobs,
+            duplicates=self.duplicates,
+        )
+        self.writer.start()
+
         # Initialize scrapers for each configuration in the list
         for scraper_config in config["scrapers"]:
             # Create a copy of scraper config with database info
@@ -61,13 +92,32 @@ class ProducerManager:
             name = scraper_config.get("name", f"scraper_{len(self.scrapers)+1}")
 
             # Create and add the scraper
-            scraper = JobScraper(complete_config, self.queue, name=name)
+            scraper = JobScraper(
+                complete_config,
+                self.queue,
+                name=name,
+                seen_jobs=self.seen_jobs,
+                writer=self.writer,
+                duplicates=self.duplicates,
+                database=self.database,
+            )
             self.scrapers.append(scraper)
 
         logger.info(f"Initialized {len(self.scrapers)} job scrapers")
 
+    def cleanup(self) -> None:
+        """Remove old jobs from the database and the seen job index"""
+        _, old_jobs_count = self.database.clean_old_jobs()
+        pruned_count = self.seen_jobs.prune()
+        if self.duplicates is not None:
+            self.duplicates.prune()
+        logger.info(
+            f"Removed {old_jobs_count} old jobs from the database and {pruned_count} from the seen job index"
+        )
+
     def run_sequential(self) -> None:
         """Run all scrapers sequentially"""
+        self.cleanup()
         logger.info("Running scrapers sequentially")
         for idx, scraper in enumerate(self.scrapers):
             logger.info(
@@ -75,6 +125,8 @@ class ProducerManager:
             )
             scraper.run()
 
+        self.flush()
+
     def run_parallel(self) -> None:
         """
         Run all scrapers in parallel
@@ -82,6 +134,7 @@ class ProducerManager:
         Uses ThreadPoolExecutor from concurrent.futures to run scrapers in parallel
         Threading is used to run each scraper in a separate thread, asyncio is not possible due to jobspy
         """
+        self.cleanup()
         max_workers = self.config.get("scraper_config", {}).get(
             "max_workers", len(self.scrapers)
         )
@@ -97,3 +150,26 @@ class ProducerManager:
                     future.result()
                 except Exception as e:
                     logger.error(f"Scraper failed with error: {e}")
+
+        self.flush()
+
+    def flush(self) -> None:
+        """Wait until the jobs of the current run are committed and report run stats"""
+        self.writer.flush()
+
+        if self.duplicates is not None:
+            logger.info(
+                f"Skipped {self.duplicates.pop_duplicates_found()} near-duplicate jobs, "
+                "saving the same number of LLM analyses"
+            )
+
+        stats = self.writer.stats()
+        logger.info(
+            f"Database writer committed {stats['rows']} jobs in {stats['batches']} batches, "
+            f"last write {stats['last_write_seconds'] * 1000:.1f} ms, "
+            f"average {stats['avg_write_seconds'] * 1000:.1f} ms"
+        )
+
+    def stop(self) -> None:
+        """Commit pending jobs and stop the database writer"""
+        self.writer.stop()
@@ -2,7 +2,10 @@ import pandas as pd
 import logging
 from jobspy import scrape_jobs
 from datetime import datetime
-from job_scraper.database import JobDatabase
+from job_scraper.database import create_job_database
+from job_scraper.fingerprint import NearDuplicateIndex
+from job_scraper.seen_index import SeenJobIndex
+from job_scraper.writer import DatabaseWriter
 from match_analysis.queue import JobQueue
 
 # Configure logging
@@ -19,7 +22,16 @@ class JobScraper:
     Handles job scraping operations
     """
 
-    def __init__(self, config, queue: JobQueue = None, name=None):
+    def __init__(
+        self,
+        config,
+        queue: JobQueue = None,
+        name=None,
+        seen_jobs: SeenJobIndex = None,
+        writer: DatabaseWriter = None,
+        duplicates: NearDuplicateIndex = None,
+        database=None,
+    ):
         self.config = config
 
         # Validate scraping config
@@ -52,18 +64,26 @@ class JobScraper:
                 f"Missing 'database' section in configuration for {self.name}"
             )
 
-        db_config = config["database"]
-
-        if "csv_path" not in db_config or "cleanup_days" not in db_config:
-            raise ValueError(
-                f"Missing required fields in database configuration for {self.name}"
-            )
-
-        self.database = JobDatabase(db_config["csv_path"], db_config["cleanup_days"])
+        # Use the shared database when given, so scrapers do not each open one
+        self.database = database
+        if self.database is None:
+            try:
+                self.database = create_job_database(config["database"])
+            except ValueError as e:
+                raise ValueError(f"{e} for {self.name}") from e
 
         # Store queue service reference for sending jobs
         self.queue = queue
 
+        # Optional index of jobs already seen by any scraper
+        self.seen_jobs = seen_jobs
+
+        # Optional shared writer, all database writes go through it when set
+        self.writer = writer
+
+        # Optional shared near-duplicate index, duplicates are stored but not analyzed
+        self.duplicates = duplicates
+
     def scrape_jobs(self):
         """Scrape jobs based on configuration"""
         site_name = self.scrape_config["site_name"]
@@ -132,31 +152,30 @@ class JobScraper:
             self.logger.info("No jobs found in current scrape")
             return new_jobs
 
-        if not self.database.exists():
-            # If CSV doesn't exist or is empty, create it with all scraped jobs
-            new_jobs = new_jobs_df
-            self.database.save(new_jobs_df)
-            self.logger.info(f"Created new CSV with {len(new_jobs_df)} job postings")
-            return new_jobs
-
-        # Load existing jobs
-        existing_jobs = self.database.load()
-
-        # Clean up old job listings
-        existing_jobs, old_jobs_count = self.database.clean_old_jobs(existing_jobs)
+        if self.seen_jobs is not None:
+            # Claim jobs in the shared index, the database only receives unseen jobs
+            new_jobs = new_jobs_df[self.seen_jobs.claim(new_jobs_df)]
+            if self.duplicates is not None:
+                new_jobs = self.duplicates.link(new_jobs)
+            if self.writer is not None:
+                self.writer.submit(new_jobs)
+            else:
+                try:
+                    new_jobs = self.database.append_jobs(new_jobs)
+                except Exception:
+                    self.seen_jobs.release(new_jobs["job_url"])
+                    if self.duplicates is not None:
+                        self.duplicates.release(new_jobs["job_url"])
+                    raise
+        else:
+            # Store only the jobs the database has not seen, cleaning up old job listings
+            new_jobs, old_jobs_count = self.database.insert_new_jobs(new_jobs_df)
 
-        # Identify new job postings by comparing job URLs
-        new_jobs = new_jobs_df[~new_jobs_df["job_url"].isin(existing_jobs["job_url"])]
+            if old_jobs_count > 0:
+                self.logger.info(f"Removed {old_jobs_count} old job postings")
 
         if len(new_jobs) == 0:
             self.logger.info("No new job postings found")
-
-            # Even if no new jobs, we may still need to update the CSV if old jobs were removed
-            if old_jobs_count > 0:
-                self.database.save(existing_jobs)
-                self.logger.info(
-                    f"Updated CSV after removing old job postings. Total jobs: {len(existing_jobs)}"
-                )
             return new_jobs
 
         self.logger.info(f"Found {len(new_jobs)} new job postings!")
@@ -164,13 +183,6 @@ class JobScraper:
         for _, job in new_jobs.iterrows():
             self.logger.info(f"{job['title']} at {job['company']} in {job['location']}")
 
-        # Append new jobs to existing CSV
-        combined_jobs = pd.concat([existing_jobs, new_jobs])
-        self.database.save(combined_jobs)
-        self.logger.info(
-            f"Updated CSV with new job postings. Total jobs: {len(combined_jobs)}"
-        )
-
         return new_jobs
 
     def send_to_queue(self, new_jobs):
@@ -178,15 +190,19 @@ class JobScraper:
         if self.queue is None:
             raise ValueError("Queue is not initialized")
 
+        if "duplicate_of" in new_jobs:
+            # Near-duplicates share the analysis of their original posting
+            duplicate_count = new_jobs["duplicate_of"].notna().sum()
+            if duplicate_count > 0:
+                self.logger.info(f"Skipping {duplicate_count} near-duplicate jobs")
+            new_jobs = new_jobs[new_jobs["duplicate_of"].isna()]
+
         if new_jobs.empty:
             return
 
         self.logger.info(f"Sending {len(new_jobs)} jobs to the queue...")
-        for _, job in new_jobs.iterrows():
-            # Convert pandas series to dict
-            job_dict = job.to_dict()
-            # Add job to queue
-            self.queue.put_sync(job_dict)
+        # Hand the whole batch to the queue, blocking while it is full
+        self.queue.put_many(new_jobs.to_dict("records"))
         self.logger.info("All jobs sent to queue")
 
     def run(self):
@@ -0,0 +1,114 @@
+"""
+Shared index of job postings already seen by any scraper
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Iterable, List
+
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(
+    filename="job_scraper.log",
+    filemode="a",
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("seen_index")
+
+
+class SeenJobIndex:
+    """
+    Thread-safe in-memory set of job URLs shared by all scrapers
+
+    The index is loaded from the job database once at startup. Scrapers claim
+    jobs through it, so a posting found by several scrapers in the same cycle
+    is only claimed (and queued for analysis) once.
+    """
+
+    def __init__(self, cleanup_days: int):
+        """
+        Initialize the seen job index
+
+        Args:
+            cleanup_days: Jobs seen more than this many days ago are pruned
+        """
+        self.cleanup_days = cleanup_days
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def load(self, database) -> None:
+        """
+        Load the job URLs stored in the job database
+
+        Args:
+            database: Job database to read the job URLs from
+        """
+        jobs_df = database.load(columns=["job_url", "scrape_date"])
+
+        with self._lock:
+            if not jobs_df.empty:
+                self._seen.update(zip(jobs_df["job_url"], jobs_df["scrape_date"]))
+            count = len(self._seen)
+
+        logger.info(f"Loaded {count} seen job URLs from the database")
+
+    def claim(self, jobs_df: pd.DataFrame) -> List[bool]:
+        """
+        Atomically mark jobs as seen
+
+        Args:
+            jobs_df: DataFrame of scraped jobs
+
+        Returns:
+            list: Boolean mask of the rows that were not seen before and are now claimed
+        """
+        now = datetime.now()
+        claimed = []
+
+        with self._lock:
+            for job_url in jobs_df["job_url"]:
+                if job_url in self._seen:
+                    claimed.append(False)
+                else:
+                    self._seen[job_url] = now
+                    claimed.append(True)
+
+        return claimed
+
+    def release(self, job_urls: Iterable[str]) -> None:
+        """
+        Forget claimed jobs, e.g. when storing them failed
+
+        Args:
+            job_urls: Job URLs to release
+        """
+        with self._lock:
+            for job_url in job_urls:
+                self._seen.pop(job_url, None)
+
+    def prune(self) -> int:
+        """
+        Remove jobs older than cleanup_days
+
+        Returns:
+            int: Number of pruned jobs
+        """
+        cutoff_date = datetime.now() - timedelta(days=self.cleanup_days)
+
+        with self._lock:
+            expired = [url for url, seen in self._seen.items() if seen < cutoff_date]
+            for job_url in expired:
+                del self._seen[job_url]
+
+        return len(expired)
+
+    def __contains__(self, job_url: str) -> bool:
+        with self._lock:
+            return job_url in self._seen
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._seen)
@@ -0,0 +1,192 @@
+"""
+Single writer for the job database shared by all scrapers
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Any
+
+import pandas as pd
+
+from job_scraper.fingerprint import NearDuplicateIndex
+from job_scraper.seen_index import SeenJobIndex
+
+# Configure logging
+logging.basicConfig(
+    filename="job_scraper.log",
+    filemode="a",
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("database_writer")
+
+
+class DatabaseWriter:
+    """
+    Background thread that owns all writes to the job database
+
+    Scrapers submit their new jobs instead of writing to the database
+    themselves. Submissions are coalesced into one batch per flush interval
+    (or per explicit flush), so parallel scrapers never race on the same file
+    and the database is written once per batch instead of once per scraper.
+    """
+
+    def __init__(
+        self,
+        database,
+        flush_interval: float = 5.0,
+        seen_jobs: SeenJobIndex = None,
+        duplicates: NearDuplicateIndex = None,
+    ):
+        """
+        Initialize the database writer
+
+        Args:
+            database: Job database to write to
+            flush_interval: Maximum number of seconds a submission waits before being committed
+            seen_jobs: Optional seen job index, jobs from failed batches are released from it
+            duplicates: Optional near-duplicate index, jobs from failed batches
+                are released from it
+        """
+        self.database = database
+        self.flush_interval = flush_interval
+        self.seen_jobs = seen_jobs
+        self.duplicates = duplicates
+
+        self._queue = queue.Queue()
+        self._thread = None
+
+        self.batch_count = 0
+        self.row_count = 0
+        self.total_write_seconds = 0.0
+        self.last_write_seconds = 0.0
+
+    def start(self) -> None:
+        """Start the writer thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Commit pending submissions and stop the writer thread"""
+        if self._thread is None:
+            return
+
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, jobs_df: pd.DataFrame) -> None:
+        """
+        Submit new jobs to be written
+
+        Args:
+            jobs_df: DataFrame of new jobs
+        """
+        if not jobs_df.empty:
+            self._queue.put(jobs_df)
+
+    def flush(self) -> None:
+        """Block until every job submitted so far has been committed"""
+        if self._thread is None:
+            return
+
+        thread = self._thread
+        done = threading.Event()
+        self._queue.put(done)
+        while not done.wait(timeout=1.0):
+            if not thread.is_alive():
+                logger.error("Database writer thread is not running, flush abandoned")
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get write statistics
+
+        Returns:
+            dict: Batch count, row count and write latencies in seconds
+        """
+        return {
+            "batches": self.batch_count,
+            "rows": self.row_count,
+            "last_write_seconds": self.last_write_seconds,
+            "avg_write_seconds": (
+                self.total_write_seconds / self.batch_count if self.batch_count else 0.0
+            ),
+        }
+
+    def _run(self) -> None:
+        """Writer loop, coalesces submissions until the flush interval elapses"""
+        running = True
+        while running:
+            item = self._queue.get()
+            batch = []
+            waiters = []
+            deadline = time.monotonic() + self.flush_interval
+
+            while True:
+                if item is None:
+                    running = False
+                    break
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                else:
+                    batch.append(item)
+
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+            try:
+                if batch:
+                    self._write(batch)
+            except Exception as e:
+                logger.error(
+                    f"Unexpected error in the database writer: {e}", exc_info=True
+                )
+            finally:
+                # Never leave a flush waiting
+                for waiter in waiters:
+                    waiter.set()
+
+    def _write(self, batch) -> None:
+        """
+        Commit a batch of submissions in a single database write
+
+        Args:
+            batch: List of DataFrames of new jobs
+        """
+        start = time.perf_counter()
+        try:
+            jobs_df = pd.concat(batch, ignore_index=True)
+            self.database.append_jobs(jobs_df)
+        except Exception as e:
+            job_urls = pd.concat([df["job_url"] for df in batch], ignore_index=True)
+            logger.error(
+                f"Failed to write {len(job_urls)} jobs to the database: {e}",
+                exc_info=True,
+            )
+            if self.seen_jobs is not None:
+                self.seen_jobs.release(job_urls)
+            if self.duplicates is not None:
+                self.duplicates.release(job_urls)
+            return
+
+        elapsed = time.perf_counter() - start
+        self.batch_count += 1
+        self.row_count += len(jobs_df)
+        self.total_write_seconds += elapsed
+        self.last_write_seconds = elapsed
+
+        logger.info(
+            f"Wrote batch of {len(jobs_df)} jobs from {len(batch)} submissions in {elapsed * 1000:.1f} ms"
+        )
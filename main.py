@@ -145,6 +145,8 @@ class JobSystem:
                     # This is now handled by the signal handler
                     pass
         finally:
+            # Commit pending database writes
+            self.producer_manager.stop()
             # Wait for the consumer to finish processing current jobs
             self.wait_for_consumer()
             # Stop the consumer
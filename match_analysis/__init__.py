@@ -3,6 +3,6 @@ Match analysis package for processing job postings and matching with profiles
 """
 
 from match_analysis.processor import JobMatchProcessor
-from match_analysis.queue import JobQueue
+from match_analysis.queue import JobQueue, PersistentJobQueue
 
-__all__ = ['JobMatchProcessor', 'JobQueue']
\ No newline at end of file
+__all__ = ['JobMatchProcessor', 'JobQueue', 'PersistentJobQueue']
\ No newline at end of file
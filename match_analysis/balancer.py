@@ -0,0 +1,243 @@
+"""
+Load balancing of model requests across several model server endpoints
+"""
+
+import asyncio
+import collections
+import logging
+import time
+from typing import Dict, Any, List, Optional
+
+import aiohttp
+
+from network import get_session
+
+# Configure logging
+logging.basicConfig(
+    filename="job_scraper.log",
+    filemode="a",
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("llm_balancer")
+
+
+class Endpoint:
+    """
+    An inference host with its routing state and statistics
+    """
+
+    def __init__(self, url: str, weight: float = 1.0, max_in_flight: int = 1):
+        """
+        Initialize an endpoint
+
+        Args:
+            url: Base URL of the model server API
+            weight: Relative capacity of the host
+            max_in_flight: Maximum number of concurrent requests to the host
+        """
+        if weight <= 0:
+            raise ValueError(f"Endpoint {url} weight must be positive")
+        if max_in_flight < 1:
+            raise ValueError(f"Endpoint {url} max_in_flight must be at least 1")
+
+        self.url = url.rstrip("/")
+        self.weight = weight
+        self.max_in_flight = max_in_flight
+
+        self.in_flight = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+
+        self.requests = 0
+        self.errors = 0
+        self.latencies = collections.deque(maxlen=1000)
+
+    def healthy(self, now: float) -> bool:
+        """Whether the endpoint is admitted for routing"""
+        return self.ejected_until <= now
+
+    def load(self) -> float:
+        """Outstanding requests relative to the weight if one more is routed"""
+        return (self.in_flight + 1) / self.weight
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the endpoint statistics
+
+        Returns:
+            dict: Health, outstanding requests, request and error counts and
+            the average and 95th percentile latency of the last 1000 requests
+        """
+        latencies = sorted(self.latencies)
+        return {
+            "healthy": self.healthy(time.monotonic()),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_latency": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p95_latency": (
+                latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0
+            ),
+        }
+
+
+class EndpointBalancer:
+    """
+    Routes requests to the endpoint with the fewest outstanding requests
+    relative to its weight, within each endpoint's in-flight limit
+
+    Endpoints failing max_failures consecutive requests or a health probe
+    are ejected for eject_seconds; a successful probe re-admits them early.
+    If every endpoint is ejected, requests are routed to all of them rather
+    than failing outright.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[Endpoint],
+        max_failures: int = 3,
+        eject_seconds: float = 30.0,
+        probe_interval: float = 10.0,
+        probe_timeout: float = 5.0,
+        probe_path: str = "/api/tags",
+        probe_headers: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Initialize the balancer
+
+        Args:
+            endpoints: Endpoints to balance across
+            max_failures: Consecutive request failures that eject an endpoint
+            eject_seconds: Seconds an ejected endpoint is kept out of rotation
+            probe_interval: Seconds between health probes
+            probe_timeout: Timeout in seconds of a health probe
+            probe_path: Path requested by a health probe, listing the models
+            probe_headers: Headers of a health probe, e.g. the authorization
+        """
+        if not endpoints:
+            raise ValueError("At least one model endpoint must be configured")
+
+        self.endpoints = endpoints
+        self.max_failures = max_failures
+        self.eject_seconds = eject_seconds
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.probe_path = probe_path
+        self.probe_headers = probe_headers
+
+        self._available = None
+
+    def _condition(self) -> asyncio.Condition:
+        """Condition signalled when a request slot frees up"""
+        if self._available is None:
+            self._available = asyncio.Condition()
+        return self._available
+
+    def _pick(self) -> Optional[Endpoint]:
+        """Pick the least loaded endpoint with a free slot"""
+        now = time.monotonic()
+        candidates = [endpoint for endpoint in self.endpoints if endpoint.healthy(now)]
+        if not candidates:
+            candidates = self.endpoints
+
+        candidates = [
+            endpoint
+            for endpoint in candidates
+            if endpoint.in_flight < endpoint.max_in_flight
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=Endpoint.load)
+
+    async def acquire(self) -> Endpoint:
+        """
+        Reserve a request slot, waiting until one is free
+
+        Returns:
+            Endpoint: The endpoint to send the request to
+        """
+        condition = self._condition()
+        async with condition:
+            endpoint = self._pick()
+            while endpoint is None:
+                await condition.wait()
+                endpoint = self._pick()
+            endpoint.in_flight += 1
+            return endpoint
+
+    async def release(self, endpoint: Endpoint, latency: float, ok: bool) -> None:
+        """
+        Release a request slot and record the outcome of the request
+
+        Args:
+            endpoint: The endpoint returned by acquire
+            latency: Duration of the request in seconds
+            ok: Whether the request succeeded
+        """
+        endpoint.in_flight -= 1
+        endpoint.requests += 1
+        if ok:
+            endpoint.failures = 0
+            endpoint.latencies.append(latency)
+        else:
+            endpoint.errors += 1
+            endpoint.failures += 1
+            if endpoint.failures >= self.max_failures:
+                self._eject(endpoint, f"{endpoint.failures} consecutive failures")
+
+        condition = self._condition()
+        async with condition:
+            condition.notify()
+
+    def _eject(self, endpoint: Endpoint, reason: str) -> None:
+        """Take an endpoint out of rotation"""
+        if endpoint.healthy(time.monotonic()):
+            logger.warning(f"Ejecting model endpoint {endpoint.url}: {reason}")
+        endpoint.ejected_until = time.monotonic() + self.eject_seconds
+
+    async def probe(self, endpoint: Endpoint) -> bool:
+        """
+        Check an endpoint by listing its models
+
+        Args:
+            endpoint: The endpoint to probe
+
+        Returns:
+            bool: Whether the endpoint answered
+        """
+        timeout = aiohttp.ClientTimeout(total=self.probe_timeout)
+        try:
+            async with get_session().get(
+                f"{endpoint.url}{self.probe_path}",
+                headers=self.probe_headers,
+                timeout=timeout,
+            ) as response:
+                response.raise_for_status()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self._eject(endpoint, f"health probe failed: {e}")
+            return False
+
+        if not endpoint.healthy(time.monotonic()):
+            logger.info(f"Re-admitting model endpoint {endpoint.url}")
+            endpoint.ejected_until = 0.0
+            endpoint.failures = 0
+            condition = self._condition()
+            async with condition:
+                condition.notify_all()
+        return True
+
+    async def run_health_checks(self) -> None:
+        """Probe every endpoint periodically until cancelled"""
+        while True:
+            await asyncio.gather(*(self.probe(endpoint) for endpoint in self.endpoints))
+            await asyncio.sleep(self.probe_interval)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the statistics of every endpoint
+
+        Returns:
+            dict: Endpoint statistics by URL
+        """
+        return {endpoint.url: endpoint.stats() for endpoint in self.endpoints}
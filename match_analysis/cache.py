@@ -0,0 +1,165 @@
+"""
+Persistent cache of job analysis results
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional
+
+# Configure logging
+logging.basicConfig(
+    filename="job_scraper.log",
+    filemode="a",
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("analysis_cache")
+
+
+class AnalysisCache:
+    """
+    Disk-backed cache of parsed LLM analyses with TTL and size-based eviction
+
+    Entries are keyed by a hash of everything that determines the analysis:
+    the model, the prompt template, the resume, the preferences and the
+    normalized job text.
+    """
+
+    def __init__(
+        self,
+        path: str = "analysis_cache.db",
+        ttl_seconds: float = 30 * 24 * 3600,
+        max_entries: int = 5000,
+    ):
+        """
+        Initialize the analysis cache
+
+        Args:
+            path: Path to the SQLite cache file
+            ttl_seconds: Entries older than this are treated as missing and evicted
+            max_entries: Least recently used entries beyond this count are evicted
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS analysis_cache (
+                        key TEXT PRIMARY KEY,
+                        analysis TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        accessed_at REAL NOT NULL
+                    )
+                    """
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_analysis_cache_accessed_at "
+                    "ON analysis_cache (accessed_at)"
+                )
+
+    def _connect(self):
+        """Open a new connection to the cache file"""
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def make_key(model: str, fingerprint: str) -> str:
+        """
+        Build a cache key
+
+        Args:
+            model: Name of the model producing the analysis
+            fingerprint: Fingerprint of the prompt inputs, see Templater.fingerprint
+
+        Returns:
+            str: The cache key
+        """
+        return hashlib.sha256(f"{model}\0{fingerprint}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached analysis
+
+        Args:
+            key: Cache key
+
+        Returns:
+            dict: The parsed analysis, or None on a miss
+        """
+        now = time.time()
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                row = conn.execute(
+                    "SELECT analysis FROM analysis_cache WHERE key = ? AND created_at >= ?",
+                    (key, now - self.ttl_seconds),
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE analysis_cache SET accessed_at = ? WHERE key = ?",
+                        (now, key),
+                    )
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, key: str, analysis: Dict[str, Any]) -> None:
+        """
+        Store an analysis and evict expired and least recently used entries
+
+        Args:
+            key: Cache key
+            analysis: The parsed analysis
+        """
+        now = time.time()
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO analysis_cache (key, analysis, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(analysis), now, now),
+                )
+                conn.execute(
+                    "DELETE FROM analysis_cache WHERE created_at < ?",
+                    (now - self.ttl_seconds,),
+                )
+                conn.execute(
+                    """
+                    DELETE FROM analysis_cache WHERE key IN (
+                        SELECT key FROM analysis_cache
+                        ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,),
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            dict: Hits, misses and hit ratio
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
@@ -0,0 +1,134 @@
+"""
+Two-stage model cascade: a small model triages jobs and only uncertain
+ones are escalated to the full analysis
+"""
+
+from typing import Dict, Any, Optional
+
+from match_analysis.repair import normalize_rating, repair_json
+from match_analysis.schema import TRIAGE_SCHEMA
+from match_analysis.template import Templater
+from match_analysis.tokens import ContextBudget
+
+# Decisions of the triage stage
+REJECT = "reject"
+ACCEPT = "accept"
+ESCALATE = "escalate"
+
+# Key added to escalated jobs holding their verdict, so retries skip triage
+VERDICT_KEY = "_triage_verdict"
+
+
+class TriageCascade:
+    """
+    Asks a small model for a compact verdict (rating, score and confidence)
+    and decides the job when the verdict is confident and outside the
+    uncertainty band
+    """
+
+    def __init__(
+        self,
+        model,
+        templater: Templater,
+        band_low: float = 30,
+        band_high: float = 100,
+        min_confidence: float = 0.7,
+        template: str = "triage",
+        budget: Optional[ContextBudget] = None,
+    ):
+        """
+        Initialize the cascade
+
+        Args:
+            model: Client of the small triage model
+            templater: Templater rendering the triage prompt
+            band_low: Confident verdicts scoring below this are rejected by triage
+            band_high: Confident verdicts scoring above this are accepted by
+                triage, the default escalates every job that is not rejected
+            min_confidence: Verdicts less confident than this are escalated
+            template: Name of the triage prompt template
+            budget: Context budget of the triage model, sizing num_ctx and
+                num_predict to the compact verdict
+        """
+        if band_low > band_high:
+            raise ValueError("Cascade band_low must not exceed band_high")
+
+        self.model = model
+        self.templater = templater
+        self.band_low = band_low
+        self.band_high = band_high
+        self.min_confidence = min_confidence
+        self.template = template
+        self.budget = budget
+
+        self.triaged = 0
+        self.decisions = {REJECT: 0, ACCEPT: 0, ESCALATE: 0}
+
+    async def triage(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get the verdict of the small model
+
+        Args:
+            job: Job data dictionary
+
+        Returns:
+            dict: The verdict with rating, score, confidence and summary
+        """
+        if self.budget is not None:
+            prefix, job_part, options = self.budget.plan(
+                self.templater, job, self.template
+            )
+        else:
+            prefix, job_part = self.templater.generate_prompt_parts(job, self.template)
+            options = None
+        verdict, _ = repair_json(
+            await self.model.ainvoke(
+                prefix + job_part, options=options, schema=TRIAGE_SCHEMA
+            )
+        )
+
+        # Fail early on malformed verdicts so the job is retried
+        verdict["score"] = float(verdict["score"])
+        verdict["confidence"] = float(verdict["confidence"])
+        verdict["rating"] = normalize_rating(verdict.get("rating")) or verdict.get(
+            "rating"
+        )
+        return verdict
+
+    def decide(self, verdict: Dict[str, Any]) -> str:
+        """
+        Decide a job from its verdict
+
+        Args:
+            verdict: The verdict returned by triage
+
+        Returns:
+            str: REJECT, ACCEPT or ESCALATE
+        """
+        if verdict["confidence"] < self.min_confidence:
+            decision = ESCALATE
+        elif verdict["score"] < self.band_low:
+            decision = REJECT
+        elif verdict["score"] > self.band_high:
+            decision = ACCEPT
+        else:
+            decision = ESCALATE
+
+        self.triaged += 1
+        self.decisions[decision] += 1
+        return decision
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the cascade statistics
+
+        Returns:
+            dict: Number of triaged jobs, decisions and the escalation rate
+        """
+        return {
+            "triaged": self.triaged,
+            **self.decisions,
+            "escalation_rate": (
+                self.decisions[ESCALATE] / self.triaged if self.triaged else 0.0
+            ),
+        }
@@ -0,0 +1,211 @@
+"""
+Adaptive limit of the concurrent model requests
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Optional
+
+# Configure logging
+logging.basicConfig(
+    filename="job_scraper.log",
+    filemode="a",
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("concurrency")
+
+
+class AIMDLimiter:
+    """
+    Limits the in-flight model requests with additive increase and
+    multiplicative decrease
+
+    Completed requests are evaluated in windows of at least window requests
+    (and at least the current limit). The limit grows by one after a window
+    whose throughput did not drop and whose 95th percentile latency stayed
+    within latency_factor of the best window seen. It is multiplied by
+    decrease_factor on a latency spike and right away by
+    timeout_decrease_factor on a timeout; timeouts of requests started
+    before the last decrease do not decrease it again, so a burst of
+    timeouts counts once. After a decrease, latencies of requests started
+    before it are dropped and the first full window only sets the baseline
+    throughput, so the limit never grows back without evidence.
+    """
+
+    def __init__(
+        self,
+        floor: int = 1,
+        ceiling: int = 8,
+        initial: Optional[int] = None,
+        window: int = 5,
+        latency_factor: float = 2.0,
+        decrease_factor: float = 0.75,
+        timeout_decrease_factor: float = 0.5,
+        throughput_tolerance: float = 0.05,
+    ):
+        """
+        Initialize the limiter
+
+        Args:
+            floor: Lowest limit
+            ceiling: Highest limit
+            initial: Starting limit, defaults to the floor
+            window: Minimum number of completed requests per evaluation
+            latency_factor: 95th percentile latency relative to the best
+                window that counts as a spike
+            decrease_factor: Factor applied to the limit on a latency spike
+            timeout_decrease_factor: Factor applied to the limit on a timeout
+            throughput_tolerance: Relative throughput drop still counted as
+                no drop, to ride out noise
+        """
+        if floor < 1:
+            raise ValueError("Concurrency floor must be at least 1")
+        if ceiling < floor:
+            raise ValueError("Concurrency ceiling must be at least the floor")
+        if not 0 < decrease_factor < 1 or not 0 < timeout_decrease_factor < 1:
+            raise ValueError("Concurrency decrease factors must be between 0 and 1")
+        if latency_factor <= 1:
+            raise ValueError("Concurrency latency_factor must be above 1")
+
+        self.floor = floor
+        self.ceiling = ceiling
+        self.limit = min(max(initial or floor, floor), ceiling)
+        self.window = window
+        self.latency_factor = latency_factor
+        self.decrease_factor = decrease_factor
+        self.timeout_decrease_factor = timeout_decrease_factor
+        self.throughput_tolerance = throughput_tolerance
+
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self.timeouts = 0
+
+        # Current window and the result of the previous ones
+        self._latencies = []
+        self._window_start = time.monotonic()
+        self._last_decrease = 0.0
+        self._throughput: Optional[float] = None
+        self._baseline_pending = False
+        self._best_p95: Optional[float] = None
+        self._p95 = 0.0
+
+        self._available = None
+
+    def _condition(self) -> asyncio.Condition:
+        """Condition signalled when a request slot frees up"""
+        if self._available is None:
+            self._available = asyncio.Condition()
+        return self._available
+
+    async def acquire(self) -> float:
+        """
+        Wait until a request is within the limit
+
+        Returns:
+            float: Start time of the request, to pass to release
+        """
+        condition = self._condition()
+        async with condition:
+            while self.in_flight >= self.limit:
+                await condition.wait()
+            self.in_flight += 1
+        return time.monotonic()
+
+    async def release(self, start: float, ok: bool, timed_out: bool = False) -> None:
+        """
+        Release a request slot and adapt the limit to its outcome
+
+        Args:
+            start: Start time returned by acquire
+            ok: Whether the request succeeded; failed requests only count if
+                they timed out
+            timed_out: Whether the request timed out
+        """
+        now = time.monotonic()
+        self.in_flight -= 1
+        if timed_out:
+            self.timeouts += 1
+            if start >= self._last_decrease:
+                self._decrease(now, self.timeout_decrease_factor, "request timed out")
+        elif ok and start >= self._last_decrease:
+            self._latencies.append(now - start)
+            if len(self._latencies) >= max(self.window, self.limit):
+                self._evaluate(now)
+
+        condition = self._condition()
+        async with condition:
+            condition.notify_all()
+
+    def _evaluate(self, now: float) -> None:
+        """Adapt the limit to the latency and throughput of the window"""
+        latencies = sorted(self._latencies)
+        p95 = latencies[int(0.95 * (len(latencies) - 1))]
+        throughput = len(latencies) / max(now - self._window_start, 1e-9)
+        self._p95 = p95
+
+        if self._best_p95 is not None and p95 > self._best_p95 * self.latency_factor:
+            if self.limit > self.floor:
+                self._decrease(now, self.decrease_factor, f"p95 latency {p95:.1f}s")
+                return
+            # Slower at the floor means the requests themselves got slower
+            self._best_p95 = p95
+
+        if self._baseline_pending:
+            # The first window at a lowered limit is the new baseline
+            self._baseline_pending = False
+        elif self._throughput is None or throughput >= self._throughput * (
+            1 - self.throughput_tolerance
+        ):
+            if self.limit < self.ceiling:
+                self.limit += 1
+                self.increases += 1
+        self._best_p95 = p95 if self._best_p95 is None else min(self._best_p95, p95)
+        self._throughput = throughput
+        self._reset_window(now)
+
+    def _decrease(self, now: float, factor: float, reason: str) -> None:
+        """Multiply the limit by a decrease factor and start a new window"""
+        limit = max(self.floor, int(self.limit * factor))
+        if limit < self.limit:
+            logger.warning(
+                "Lowering model concurrency from %d to %d: %s",
+                self.limit,
+                limit,
+                reason,
+            )
+            self.limit = limit
+            self.decreases += 1
+        self._last_decrease = now
+        # Throughput at the lower limit is not comparable with the last window
+        self._throughput = None
+        self._baseline_pending = True
+        self._reset_window(now)
+
+    def _reset_window(self, now: float) -> None:
+        """Start a new evaluation window"""
+        self._latencies = []
+        self._window_start = now
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the limiter statistics
+
+        Returns:
+            dict: Current limit and bounds, in-flight requests, increases,
+                decreases and timeouts, and the 95th percentile latency and
+                throughput of the last window
+        """
+        return {
+            "limit": self.limit,
+            "floor": self.floor,
+            "ceiling": self.ceiling,
+            "in_flight": self.in_flight,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "timeouts": self.timeouts,
+            "p95_latency": self._p95,
+            "throughput": self._throughput or 0.0,
+        }
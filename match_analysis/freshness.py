@@ -0,0 +1,75 @@
+"""
+Freshness budget of queued jobs
+"""
+
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+import pandas as pd
+
+
+class FreshnessPolicy:
+    """
+    Decides whether a queued job is still worth analyzing, from how long ago
+    it was scraped and how long ago it was posted
+    """
+
+    def __init__(
+        self,
+        max_queue_hours: Optional[float] = None,
+        max_posting_age_days: Optional[float] = None,
+        action: str = "demote",
+    ):
+        """
+        Initialize the freshness policy
+
+        Args:
+            max_queue_hours: Jobs scraped longer ago than this are expired
+            max_posting_age_days: Jobs posted longer ago than this are expired
+            action: 'demote' to analyze expired jobs only when no fresh job is
+                waiting, 'drop' to discard them
+        """
+        if action not in ("demote", "drop"):
+            raise ValueError(f"Unsupported freshness action: {action}")
+
+        self.max_queue_hours = max_queue_hours
+        self.max_posting_age_days = max_posting_age_days
+        self.action = action
+
+    @staticmethod
+    def _age_hours(value: Any, now: datetime) -> Optional[float]:
+        """Hours elapsed since a date, None if the date is unknown"""
+        date = pd.to_datetime(value, errors="coerce")
+        if pd.isna(date):
+            return None
+        if date.tzinfo is not None:
+            # Naive dates are local time, convert aware ones to local time too
+            date = date.tz_convert(now.astimezone().tzinfo).tz_localize(None)
+        return (now - date).total_seconds() / 3600
+
+    def expired(
+        self, job: Dict[str, Any], now: Optional[datetime] = None
+    ) -> Optional[str]:
+        """
+        Check a job against the freshness budget
+
+        Args:
+            job: Job data dictionary
+            now: Current time, defaults to now
+
+        Returns:
+            str: Why the job expired, or None if it is still fresh
+        """
+        now = now or datetime.now()
+
+        if self.max_queue_hours is not None:
+            age = self._age_hours(job.get("scrape_date"), now)
+            if age is not None and age > self.max_queue_hours:
+                return f"Expired: scraped {age:.1f} hours ago"
+
+        if self.max_posting_age_days is not None:
+            age = self._age_hours(job.get("date_posted"), now)
+            if age is not None and age > self.max_posting_age_days * 24:
+                return f"Expired: posted {age / 24:.1f} days ago"
+
+        return None
@@ -1,5 +1,38 @@
 import aiohttp
+import asyncio
+import contextlib
+import copy
 import json
+import logging
+import time
+from abc import ABC, abstractmethod
+
+from match_analysis.balancer import Endpoint, EndpointBalancer
+from match_analysis.schema import SchemaViolation, StreamingJSONValidator
+from match_analysis.tokens import TokenEstimator
+from network import get_session
+
+# Configure logging
+logging.basicConfig(
+    filename="job_scraper.log",
+    filemode="a",
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("llm")
+
+# Ollama model options and the request fields of the OpenAI-compatible API
+# serving them; num_ctx is fixed when the server starts and has no field, and
+# top_k is a vLLM and llama.cpp extension only sent when configured
+OPENAI_OPTIONS = {
+    "num_predict": "max_tokens",
+    "temperature": "temperature",
+    "top_p": "top_p",
+    "top_k": "top_k",
+    "seed": "seed",
+    "stop": "stop",
+    "num_ctx": None,
+}
 
 
 class LLM:
@@ -10,28 +43,85 @@ class LLM:
         Args:
             config (dict): The configuration dictionary
 
-        If the configuration contains the key "ollama", the LLM will be
-        initialized with an Ollama model. Otherwise, a ValueError will be
-        raised.
+        The backend is selected with the "backend" key, "ollama" by default
+        or "openai" for servers with an OpenAI-compatible API such as vLLM or
+        the llama.cpp server, and configured in the section of the same name.
+        If that section is missing, the LLM is not initialized; an unknown
+        backend raises a ValueError.
         """
         self.model = None
 
-        if "ollama" in config:
-            self.model = Ollama(
-                model=config["ollama"]["model"],
-                base_url=config["ollama"].get("endpoint", "http://localhost:11434"),
-                temperature=config["ollama"].get("temperature", 1.0),
-                top_k=config["ollama"].get("top_k", 64),
-                top_p=config["ollama"].get("top_p", 0.95),
-                timeout=config["ollama"].get("timeout_seconds", 180),
+        backend = config.get("backend", "ollama")
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"Unknown LLM backend {backend}, expected one of {sorted(BACKENDS)}"
+            )
+
+        if backend in config:
+            backend_config = config[backend]
+            backend_class = BACKENDS[backend]
+            extra = {}
+            if backend == "ollama":
+                extra["keep_alive"] = backend_config.get("keep_alive")
+            else:
+                extra["api_key"] = backend_config.get("api_key")
+
+            self.model = backend_class(
+                model=backend_config["model"],
+                base_url=backend_config.get("endpoint", backend_class.DEFAULT_URL),
+                temperature=backend_config.get("temperature", 1.0),
+                top_k=backend_config.get("top_k", 64 if backend == "ollama" else None),
+                top_p=backend_config.get("top_p", 0.95),
+                timeout=backend_config.get("timeout_seconds", 180),
+                balancer=self._create_balancer(backend_config, backend_class, extra),
+                num_ctx=backend_config.get("num_ctx", 8192),
+                num_predict=backend_config.get("num_predict", 8192),
+                chars_per_token=backend_config.get("chars_per_token", 3.5),
+                structured_output=backend_config.get("structured_output", True),
+                **extra,
+            )
+
+    @staticmethod
+    def _create_balancer(backend_config, backend_class, extra):
+        """
+        Create a balancer over the configured endpoints
+
+        Args:
+            backend_config (dict): The backend configuration
+            backend_class (type): The backend class
+            extra (dict): The backend-specific arguments
+
+        Returns:
+            EndpointBalancer: The balancer, or None if a single endpoint is configured
+        """
+        if "endpoints" not in backend_config:
+            return None
+
+        endpoints = [
+            Endpoint(
+                url=endpoint["url"],
+                weight=endpoint.get("weight", 1.0),
+                max_in_flight=endpoint.get("max_in_flight", 1),
             )
+            for endpoint in backend_config["endpoints"]
+        ]
+        health_config = backend_config.get("health_check", {})
+        return EndpointBalancer(
+            endpoints,
+            max_failures=health_config.get("max_failures", 3),
+            eject_seconds=health_config.get("eject_seconds", 30),
+            probe_interval=health_config.get("interval_seconds", 10),
+            probe_timeout=health_config.get("timeout_seconds", 5),
+            probe_path=backend_class.HEALTH_PATH,
+            probe_headers=backend_class.auth_headers(extra.get("api_key")),
+        )
 
     def get_model(self):
         """
         Get the initialized LLM model
 
         Returns:
-            LLM: The initialized LLM model
+            LLMBackend: The initialized LLM model
 
         Raises:
             ValueError: If the LLM is not initialized
@@ -41,39 +131,420 @@ class LLM:
         return self.model
 
 
-class Ollama:
-    def __init__(self, model, base_url, temperature, top_k, top_p, timeout):
+class LLMBackend(ABC):
+    """
+    Model server the analysis runs against
+
+    The endpoint balancing, the schema validation of streamed output and the
+    usage totals are shared; subclasses map the requests and responses to
+    the API of their server.
+    """
+
+    # Base URL used when none is configured
+    DEFAULT_URL = "http://localhost:11434"
+
+    # Path requested by the health probes
+    HEALTH_PATH = "/api/tags"
+
+    def __init__(
+        self,
+        model,
+        base_url,
+        temperature,
+        top_k,
+        top_p,
+        timeout,
+        balancer=None,
+        num_ctx=8192,
+        num_predict=8192,
+        chars_per_token=3.5,
+        structured_output=True,
+        headers=None,
+    ):
         """
-        Initialize an Ollama LLM
+        Initialize a backend
 
         Args:
-            model (str): The name of the Ollama model to use
-            base_url (str): The base URL of the Ollama API
+            model (str): The name of the model to use
+            base_url (str): The base URL of the server API
             temperature (float): The temperature to use for generation
-            top_k (int): The number of top tokens to consider at each step
+            top_k (int): The number of top tokens to consider at each step,
+                None to leave it to the server
             top_p (float): The probability of considering all tokens at each step
+            timeout (int): Timeout in seconds of a request
+            balancer (EndpointBalancer): Optional balancer over several
+                endpoints, base_url is used as the only endpoint if None
+            num_ctx (int): Default context window size in tokens
+            num_predict (int): Default maximum number of generated tokens
+            chars_per_token (float): Initial characters-per-token ratio of the
+                token estimator, calibrated from the reported prompt token counts
+            structured_output (bool): Whether to send the output schema so the
+                server constrains the generation to it, plain JSON mode otherwise
+            headers (dict): Headers sent with every request
         """
         self.model = model
         self.base_url = base_url
+        self.headers = headers
+        self.balancer = balancer or EndpointBalancer(
+            [Endpoint(base_url, max_in_flight=1 << 16)],
+            probe_path=self.HEALTH_PATH,
+            probe_headers=headers,
+        )
         self.temperature = temperature
         self.top_k = top_k
         self.top_p = top_p
         self.timeout = timeout
+        self.num_ctx = num_ctx
+        self.num_predict = num_predict
+        self.estimator = TokenEstimator(chars_per_token)
+        self.structured_output = structured_output
+        self._reset_usage()
 
-    async def ainvoke(self, prompt, stream=False):
+    @staticmethod
+    def auth_headers(api_key):
+        """Headers authenticating with an API key, None if the server has none"""
+        return None
+
+    def _reset_usage(self):
+        """Reset the usage totals"""
+        # Streamed generations aborted because the output broke the schema
+        self.aborted = 0
+        self.aborted_chars = 0
+
+        # Prefill and generation totals reported by the server
+        self.calls = 0
+        self.prompt_eval_count = 0
+        self.prompt_eval_seconds = 0.0
+        self.eval_count = 0
+        self.eval_seconds = 0.0
+
+    def for_model(self, model):
         """
-        Asynchronously generate a response from Ollama API.
+        Get a client for another model served by the same endpoints
+
+        The client shares the endpoint balancer, so in-flight limits cover
+        both models, and keeps its own usage totals.
+
+        Args:
+            model (str): The name of the model
+
+        Returns:
+            LLMBackend: The client
+        """
+        client = copy.copy(self)
+        client.model = model
+        client.estimator = TokenEstimator(self.estimator.chars_per_token)
+        client._reset_usage()
+        return client
+
+    async def ainvoke(
+        self, prompt, stream=False, system=None, options=None, schema=None
+    ):
+        """
+        Asynchronously generate a response
 
         Args:
             prompt (str): The prompt to send to the model
-            model (str): The model to use
             stream (bool): Whether to stream the response, defaults to False
+            system (str): Optional system prompt, sent ahead of the prompt
+            options (dict): Optional model options overriding the defaults,
+                e.g. num_ctx and num_predict
+            schema (dict): Optional JSON schema of the output, sent as the
+                format and, when streaming, checked while the output arrives
 
         Returns:
             str: The generated response text
+
+        Raises:
+            SchemaViolation: If the streamed output breaks the schema, the
+                generation is aborted as soon as it does; its text attribute
+                holds the output generated until then
+        """
+        if stream:
+            validator = StreamingJSONValidator(schema) if schema is not None else None
+            result = ""
+            try:
+                async with contextlib.aclosing(
+                    self.astream(prompt, system, options, schema)
+                ) as chunks:
+                    async for chunk in chunks:
+                        result += chunk
+                        # print(chunk, end="")
+                        if validator is not None:
+                            self._validate(validator, chunk)
+                if validator is not None:
+                    validator.close()
+            except SchemaViolation as exc:
+                # Keep what was generated so it can be repaired locally
+                exc.text = result
+                raise
+            return result
+
+        payload = self._payload(prompt, False, system, options, schema)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        endpoint = await self.balancer.acquire()
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = await self._complete(endpoint.url, payload, timeout)
+            ok = True
+            return result
+        finally:
+            await self.balancer.release(endpoint, time.perf_counter() - start, ok)
+
+    async def astream(self, prompt, system=None, options=None, schema=None):
+        """
+        Asynchronously stream a response
+
+        Closing the generator early, e.g. after the output broke its schema,
+        closes the connection and the server stops generating.
+
+        Args:
+            prompt (str): The prompt to send to the model
+            system (str): Optional system prompt, sent ahead of the prompt
+            options (dict): Optional model options overriding the defaults
+            schema (dict): Optional JSON schema of the output
+
+        Yields:
+            str: The generated text, chunk by chunk
+        """
+        payload = self._payload(prompt, True, system, options, schema)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        endpoint = await self.balancer.acquire()
+        start = time.perf_counter()
+        ok = False
+        try:
+            async with contextlib.aclosing(
+                self._stream(endpoint.url, payload, timeout)
+            ) as chunks:
+                async for chunk in chunks:
+                    try:
+                        yield chunk
+                    except GeneratorExit:
+                        # The endpoint is fine, the caller stopped reading
+                        ok = True
+                        raise
+            ok = True
+        finally:
+            await self.balancer.release(endpoint, time.perf_counter() - start, ok)
+
+    @abstractmethod
+    def _payload(self, prompt, stream, system, options, schema):
+        """
+        Build the request payload of a generation
+
+        Args:
+            prompt (str): The prompt to send to the model
+            stream (bool): Whether to stream the response
+            system (str): Optional system prompt
+            options (dict): Optional model options overriding the defaults
+            schema (dict): Optional JSON schema of the output
+
+        Returns:
+            dict: The request payload
+        """
+        raise NotImplementedError("Subclasses should implement this method")
+
+    @abstractmethod
+    async def _complete(self, base_url, payload, timeout):
+        """
+        Send a generate request to one endpoint and record its usage
+
+        Args:
+            base_url (str): The base URL of the endpoint
+            payload (dict): The request payload
+            timeout (aiohttp.ClientTimeout): The request timeout
+
+        Returns:
+            str: The generated response text
+        """
+        raise NotImplementedError("Subclasses should implement this method")
+
+    @abstractmethod
+    def _stream(self, base_url, payload, timeout):
+        """
+        Send a streaming generate request to one endpoint and record its usage
+
+        Args:
+            base_url (str): The base URL of the endpoint
+            payload (dict): The request payload
+            timeout (aiohttp.ClientTimeout): The request timeout
+
+        Yields:
+            str: The generated text, chunk by chunk
+        """
+        raise NotImplementedError("Subclasses should implement this method")
+
+    @abstractmethod
+    async def aembed(self, texts, model=None):
+        """
+        Asynchronously embed texts
+
+        Args:
+            texts (list): The texts to embed
+            model (str): The embedding model, defaults to the generation model
+
+        Returns:
+            list: One embedding vector per text
+        """
+        raise NotImplementedError("Subclasses should implement this method")
+
+    async def _post(self, path, payload, timeout):
         """
-        url = f"{self.base_url}/api/generate"
+        Send a request holding a slot of the least loaded endpoint
 
+        Args:
+            path (str): The API path
+            payload (dict): The request payload
+            timeout (aiohttp.ClientTimeout): The request timeout
+
+        Returns:
+            dict: The response object
+        """
+        endpoint = await self.balancer.acquire()
+        start = time.perf_counter()
+        ok = False
+        try:
+            async with get_session().post(
+                f"{endpoint.url}{path}",
+                json=payload,
+                headers=self.headers,
+                timeout=timeout,
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
+            ok = True
+            return data
+        finally:
+            await self.balancer.release(endpoint, time.perf_counter() - start, ok)
+
+    def _validate(self, validator, chunk):
+        """
+        Feed a streamed chunk to the validator, counting aborted generations
+
+        Args:
+            validator (StreamingJSONValidator): The validator of the generation
+            chunk (str): The streamed chunk
+        """
+        try:
+            validator.feed(chunk)
+        except SchemaViolation:
+            self.aborted += 1
+            self.aborted_chars += validator.chars
+            raise
+
+    def _record_usage(
+        self,
+        payload_chars,
+        prompt_eval_count,
+        prompt_eval_seconds,
+        eval_count,
+        eval_seconds,
+    ):
+        """
+        Record the prefill and generation counters of a response and
+        calibrate the token estimator with the prompt token count
+
+        Args:
+            payload_chars (int): Characters of the prompt and system prompt
+            prompt_eval_count (int): Prompt tokens reported by the server
+            prompt_eval_seconds (float): Prefill duration
+            eval_count (int): Generated tokens
+            eval_seconds (float): Generation duration
+        """
+        self.estimator.calibrate(payload_chars, prompt_eval_count)
+
+        self.calls += 1
+        self.prompt_eval_count += prompt_eval_count
+        self.prompt_eval_seconds += prompt_eval_seconds
+        self.eval_count += eval_count
+        self.eval_seconds += eval_seconds
+
+        logger.info(
+            "Prompt eval %d tokens in %.2fs, generated %d tokens in %.2fs",
+            prompt_eval_count,
+            prompt_eval_seconds,
+            eval_count,
+            eval_seconds,
+        )
+
+    def usage(self):
+        """
+        Get the prefill and generation totals reported by the server
+
+        Returns:
+            dict: Call count, prompt and generated token counts and durations,
+            the average prompt tokens and prefill seconds per call, and the
+            number of generations aborted for breaking the schema
+        """
+        return {
+            "calls": self.calls,
+            "prompt_eval_count": self.prompt_eval_count,
+            "prompt_eval_seconds": self.prompt_eval_seconds,
+            "eval_count": self.eval_count,
+            "eval_seconds": self.eval_seconds,
+            "aborted": self.aborted,
+            "aborted_chars": self.aborted_chars,
+            "avg_prompt_eval_count": (
+                self.prompt_eval_count / self.calls if self.calls else 0.0
+            ),
+            "avg_prompt_eval_seconds": (
+                self.prompt_eval_seconds / self.calls if self.calls else 0.0
+            ),
+        }
+
+    async def health(self):
+        """
+        Probe every endpoint once
+
+        Returns:
+            dict: Whether each endpoint answered, by URL
+        """
+        endpoints = self.balancer.endpoints
+        results = await asyncio.gather(
+            *(self.balancer.probe(endpoint) for endpoint in endpoints)
+        )
+        return {endpoint.url: ok for endpoint, ok in zip(endpoints, results)}
+
+    async def run_health_checks(self):
+        """Probe the endpoints periodically until cancelled"""
+        await self.balancer.run_health_checks()
+
+    def endpoint_stats(self):
+        """
+        Get the latency and error statistics of the endpoints
+
+        Returns:
+            dict: Endpoint statistics by URL
+        """
+        return self.balancer.stats()
+
+
+class Ollama(LLMBackend):
+    """
+    Backend for the Ollama API
+    """
+
+    DEFAULT_URL = "http://localhost:11434"
+    HEALTH_PATH = "/api/tags"
+
+    def __init__(self, *args, keep_alive=None, **kwargs):
+        """
+        Initialize an Ollama LLM
+
+        Args:
+            keep_alive (str): How long Ollama keeps the model and its cached
+                prompt prefix loaded after a request, e.g. "30m"
+
+        The other arguments are those of LLMBackend; structured output
+        requires Ollama 0.5 or newer.
+        """
+        super().__init__(*args, **kwargs)
+        self.keep_alive = keep_alive
+
+    def _payload(self, prompt, stream, system, options, schema):
         payload = {
             "model": self.model,
             "prompt": prompt,
@@ -82,28 +553,208 @@ class Ollama:
                 "temperature": self.temperature,
                 "top_k": self.top_k,
                 "top_p": self.top_p,
-                "num_predict": 8192,
-                "num_ctx": 8192,
+                "num_predict": self.num_predict,
+                "num_ctx": self.num_ctx,
+                **(options or {}),
             },
-            "format": "json",
+            "format": (
+                schema if schema is not None and self.structured_output else "json"
+            ),
+        }
+        if system is not None:
+            payload["system"] = system
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        return payload
+
+    async def _complete(self, base_url, payload, timeout):
+        session = get_session()
+        async with session.post(
+            f"{base_url}/api/generate", json=payload, timeout=timeout
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+            # print(data)
+            self._record_ollama_usage(data, payload)
+            return data["response"]
+
+    async def _stream(self, base_url, payload, timeout):
+        session = get_session()
+        async with session.post(
+            f"{base_url}/api/generate", json=payload, timeout=timeout
+        ) as response:
+            response.raise_for_status()
+            async for line in response.content:
+                if line:
+                    data = json.loads(line)
+                    if data.get("response"):
+                        yield data["response"]
+                    if data.get("done"):
+                        self._record_ollama_usage(data, payload)
+
+    async def aembed(self, texts, model=None):
+        payload = {"model": model or self.model, "input": texts}
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        data = await self._post("/api/embed", payload, timeout)
+        return data["embeddings"]
+
+    def _record_ollama_usage(self, data, payload):
+        """
+        Record the counters of a final Ollama response object
+
+        Args:
+            data (dict): The final response object
+            payload (dict): The request payload
+        """
+        self._record_usage(
+            len(payload["prompt"]) + len(payload.get("system", "")),
+            data.get("prompt_eval_count", 0),
+            data.get("prompt_eval_duration", 0) / 1e9,
+            data.get("eval_count", 0),
+            data.get("eval_duration", 0) / 1e9,
+        )
+
+
+class OpenAICompatible(LLMBackend):
+    """
+    Backend for servers with an OpenAI-compatible chat completions API, such
+    as vLLM or the llama.cpp server
+
+    The model options are mapped with OPENAI_OPTIONS; num_ctx is set when the
+    server starts and is not sent, nor are options left at None. The JSON schema is sent as a json_schema
+    response format, plain JSON mode is json_object. Prefill and generation
+    durations are read from the llama.cpp timings; servers without them are
+    credited the whole request duration as generation time.
+    """
+
+    DEFAULT_URL = "http://localhost:8000"
+    HEALTH_PATH = "/v1/models"
+
+    def __init__(self, *args, api_key=None, **kwargs):
+        """
+        Initialize an OpenAI-compatible LLM
+
+        Args:
+            api_key (str): Optional API key sent as a bearer token
+
+        The other arguments are those of LLMBackend.
+        """
+        super().__init__(*args, headers=self.auth_headers(api_key), **kwargs)
+
+    @staticmethod
+    def auth_headers(api_key):
+        """Authorization header of an API key, None without a key"""
+        return {"Authorization": f"Bearer {api_key}"} if api_key else None
+
+    def _payload(self, prompt, stream, system, options, schema):
+        options = {
+            "temperature": self.temperature,
+            "top_k": self.top_k,
+            "top_p": self.top_p,
+            "num_predict": self.num_predict,
+            **(options or {}),
         }
+        messages = [{"role": "user", "content": prompt}]
+        if system is not None:
+            messages.insert(0, {"role": "system", "content": system})
+
+        payload = {"model": self.model, "messages": messages, "stream": stream}
+        for option, value in options.items():
+            field = OPENAI_OPTIONS.get(option, option)
+            if field is not None and value is not None:
+                payload[field] = value
 
+        if schema is not None and self.structured_output:
+            payload["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "output", "schema": schema},
+            }
+        else:
+            payload["response_format"] = {"type": "json_object"}
+        if stream:
+            payload["stream_options"] = {"include_usage": True}
+        return payload
+
+    async def _complete(self, base_url, payload, timeout):
+        start = time.perf_counter()
+        session = get_session()
+        async with session.post(
+            f"{base_url}/v1/chat/completions",
+            json=payload,
+            headers=self.headers,
+            timeout=timeout,
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+        self._record_openai_usage(data, payload, time.perf_counter() - start)
+        return data["choices"][0]["message"]["content"]
+
+    async def _stream(self, base_url, payload, timeout):
+        start = time.perf_counter()
+        session = get_session()
+        async with session.post(
+            f"{base_url}/v1/chat/completions",
+            json=payload,
+            headers=self.headers,
+            timeout=timeout,
+        ) as response:
+            response.raise_for_status()
+            final = {}
+            # Server-sent events, one JSON chunk per data line
+            async for line in response.content:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                line = line[len(b"data:") :].strip()
+                if line == b"[DONE]":
+                    break
+                data = json.loads(line)
+                for key in ("usage", "timings"):
+                    if data.get(key):
+                        final[key] = data[key]
+                for choice in data.get("choices") or []:
+                    content = (choice.get("delta") or {}).get("content")
+                    if content:
+                        yield content
+        self._record_openai_usage(final, payload, time.perf_counter() - start)
+
+    async def aembed(self, texts, model=None):
+        payload = {"model": model or self.model, "input": texts}
         timeout = aiohttp.ClientTimeout(total=self.timeout)
+        data = await self._post("/v1/embeddings", payload, timeout)
+        return [
+            item["embedding"]
+            for item in sorted(data["data"], key=lambda item: item["index"])
+        ]
+
+    def _record_openai_usage(self, data, payload, elapsed):
+        """
+        Record the counters of an OpenAI-compatible response
+
+        Args:
+            data (dict): The response object, or the usage and timings of a stream
+            payload (dict): The request payload
+            elapsed (float): Duration of the request in seconds
+        """
+        usage = data.get("usage") or {}
+        timings = data.get("timings")
+        if timings:
+            prompt_eval_seconds = timings.get("prompt_ms", 0) / 1000
+            eval_seconds = timings.get("predicted_ms", 0) / 1000
+        else:
+            prompt_eval_seconds = 0.0
+            eval_seconds = elapsed
+        self._record_usage(
+            sum(len(message["content"]) for message in payload["messages"]),
+            usage.get("prompt_tokens", 0),
+            prompt_eval_seconds,
+            usage.get("completion_tokens", 0),
+            eval_seconds,
+        )
+
 
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(url, json=payload) as response:
-                if stream:
-                    # Handle streaming response
-                    result = ""
-                    async for line in response.content:
-                        if line:
-                            data = json.loads(line)
-                            if "response" in data:
-                                result += data["response"]
-                                # print(data["response"], end="")
-                    return result
-                else:
-                    # Handle non-streaming response
-                    data = await response.json()
-                    # print(data)
-                    return data["response"]
+# Backends by their name in the configuration
+BACKENDS = {"ollama": Ollama, "openai": OpenAICompatible}
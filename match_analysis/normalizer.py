@@ -0,0 +1,322 @@
+"""
+Normalization of job descriptions ahead of the prompt, so every model call
+prefills less text
+"""
+
+import contextlib
+import hashlib
+import html
+import logging
+import re
+import sqlite3
+import time
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from match_analysis.tokens import TokenEstimator, section_value
+
+# Configure logging
+logging.basicConfig(
+    filename="job_scraper.log",
+    filemode="a",
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("normalizer")
+
+# Markdown escapes added by the scrapers, e.g. "large\-scale" or "C\+\+"
+MARKDOWN_ESCAPE = re.compile(r"\\([\\`*_{}\[\]()#+\-.!|>~])")
+
+# Blank lines separating paragraphs, including lines holding only whitespace
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+def clean_description(description: str) -> str:
+    """
+    Unescape a description and collapse its whitespace
+
+    Args:
+        description: Job description in markdown
+
+    Returns:
+        str: Paragraphs separated by single blank lines, without markdown and
+            HTML escapes, trailing spaces or runs of spaces
+    """
+    text = html.unescape(MARKDOWN_ESCAPE.sub(r"\1", description))
+    paragraphs = []
+    for paragraph in PARAGRAPH_BREAK.split(text):
+        lines = [" ".join(line.split()) for line in paragraph.splitlines()]
+        paragraph = "\n".join(line for line in lines if line)
+        if paragraph:
+            paragraphs.append(paragraph)
+    return "\n\n".join(paragraphs)
+
+
+def paragraph_key(paragraph: str) -> str:
+    """
+    Hash a paragraph so formatting differences map to the same key
+
+    Args:
+        paragraph: A description paragraph
+
+    Returns:
+        str: Hex digest of the lowercase words of the paragraph
+    """
+    words = re.findall(r"\w+", paragraph.lower())
+    return hashlib.sha1(" ".join(words).encode("utf-8")).hexdigest()
+
+
+class DescriptionNormalizer:
+    """
+    Cleans job descriptions and strips paragraphs learned to be boilerplate
+
+    Every paragraph seen is hashed into a SQLite store per company. A
+    paragraph found in the postings of many companies (equal opportunity and
+    privacy statements) or in many postings of the same company (its company
+    blurb) is dropped from later descriptions, as are paragraphs repeating
+    the job's company description or an earlier paragraph. Paragraphs and
+    jobs not seen for ttl_seconds are pruned, so the store stays bounded and
+    boilerplate that went out of use is forgotten.
+    """
+
+    def __init__(
+        self,
+        path: str = "paragraphs.db",
+        estimator: Optional[TokenEstimator] = None,
+        min_companies: int = 5,
+        min_company_jobs: int = 3,
+        min_chars: int = 80,
+        ttl_seconds: float = 90 * 24 * 3600,
+    ):
+        """
+        Initialize the normalizer
+
+        Args:
+            path: Path to the SQLite paragraph store
+            estimator: Token estimator used for the removed token statistics
+            min_companies: Paragraphs found at this many companies are boilerplate
+            min_company_jobs: Paragraphs found in this many postings of a
+                company are its company blurb
+            min_chars: Shorter paragraphs, such as headings, are never stripped
+                as boilerplate, nor are requirements and responsibilities
+            ttl_seconds: Paragraphs and jobs not seen for this long are pruned
+        """
+        self.path = path
+        self.estimator = estimator or TokenEstimator()
+        self.min_companies = min_companies
+        self.min_company_jobs = min_company_jobs
+        self.min_chars = min_chars
+        self.ttl_seconds = ttl_seconds
+
+        self.jobs = 0
+        self.chars_before = 0
+        self.chars_removed = 0
+        self.tokens_removed = 0
+        self.paragraphs_removed = 0
+
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS paragraphs (
+                        key TEXT NOT NULL,
+                        company TEXT NOT NULL,
+                        jobs INTEGER NOT NULL,
+                        last_seen REAL NOT NULL DEFAULT 0,
+                        PRIMARY KEY (key, company)
+                    )
+                    """
+                )
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS observed_jobs (
+                        job_key TEXT PRIMARY KEY,
+                        last_seen REAL NOT NULL DEFAULT 0
+                    )
+                    """
+                )
+                # Stores created before pruning lack the last_seen column
+                now = time.time()
+                for table in ("paragraphs", "observed_jobs"):
+                    columns = [
+                        row[1] for row in conn.execute(f"PRAGMA table_info({table})")
+                    ]
+                    if "last_seen" not in columns:
+                        conn.execute(
+                            f"ALTER TABLE {table} "
+                            "ADD COLUMN last_seen REAL NOT NULL DEFAULT 0"
+                        )
+                        conn.execute(f"UPDATE {table} SET last_seen = ?", (now,))
+                    conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS {table}_last_seen "
+                        f"ON {table} (last_seen)"
+                    )
+
+    def _connect(self):
+        """Open a new connection to the paragraph store"""
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _company(job: Dict[str, Any]) -> str:
+        """Company of a job as stored with its paragraphs"""
+        company = job.get("company")
+        return " ".join(company.lower().split()) if isinstance(company, str) else ""
+
+    def _boilerplate(self, keys: List[str], company: str) -> Set[Tuple[str, str]]:
+        """
+        Look up which paragraph keys are learned boilerplate
+
+        Args:
+            keys: Paragraph keys of a description
+            company: Company of the job
+
+        Returns:
+            set: (key, kind) of boilerplate paragraphs, kind is 'common' or 'company'
+        """
+        if not keys:
+            return set()
+
+        placeholders = ", ".join("?" for _ in keys)
+        with contextlib.closing(self._connect()) as conn:
+            common = conn.execute(
+                f"SELECT key FROM paragraphs WHERE key IN ({placeholders}) "
+                "GROUP BY key HAVING COUNT(*) >= ?",
+                (*keys, self.min_companies),
+            ).fetchall()
+            blurbs = conn.execute(
+                f"SELECT key FROM paragraphs WHERE key IN ({placeholders}) "
+                "AND company = ? AND jobs >= ?",
+                (*keys, company, self.min_company_jobs),
+            ).fetchall()
+
+        return {(key, "common") for (key,) in common} | {
+            (key, "company") for (key,) in blurbs
+        }
+
+    def observe(self, job: Dict[str, Any], keys: List[str]) -> None:
+        """
+        Count the paragraphs of a job, once per job, and prune what was not
+        seen within the ttl
+
+        Args:
+            job: Job data dictionary
+            keys: Paragraph keys of the job's description
+        """
+        job_key = job.get("id") or job.get("job_url")
+        company = self._company(job)
+        now = time.time()
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                if job_key is not None:
+                    inserted = conn.execute(
+                        "INSERT OR IGNORE INTO observed_jobs (job_key, last_seen) "
+                        "VALUES (?, ?)",
+                        (str(job_key), now),
+                    ).rowcount
+                    if not inserted:
+                        conn.execute(
+                            "UPDATE observed_jobs SET last_seen = ? WHERE job_key = ?",
+                            (now, str(job_key)),
+                        )
+                        return
+                conn.executemany(
+                    "INSERT INTO paragraphs (key, company, jobs, last_seen) "
+                    "VALUES (?, ?, 1, ?) ON CONFLICT (key, company) "
+                    "DO UPDATE SET jobs = jobs + 1, last_seen = excluded.last_seen",
+                    [(key, company, now) for key in set(keys)],
+                )
+                conn.execute(
+                    "DELETE FROM paragraphs WHERE last_seen < ?",
+                    (now - self.ttl_seconds,),
+                )
+                conn.execute(
+                    "DELETE FROM observed_jobs WHERE last_seen < ?",
+                    (now - self.ttl_seconds,),
+                )
+
+    def normalize(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalize the description of a job and learn its paragraphs
+
+        Args:
+            job: Job data dictionary, left unchanged
+
+        Returns:
+            dict: Copy of the job with the normalized description
+        """
+        description = job.get("description")
+        if not isinstance(description, str):
+            return job
+
+        paragraphs = clean_description(description).split("\n\n")
+        keys = [paragraph_key(paragraph) for paragraph in paragraphs]
+        boilerplate = self._boilerplate(keys, self._company(job))
+
+        # Paragraphs repeating the company description say nothing new
+        seen = set()
+        company_description = job.get("company_description")
+        if isinstance(company_description, str):
+            seen.update(
+                paragraph_key(paragraph)
+                for paragraph in clean_description(company_description).split("\n\n")
+            )
+
+        kept = []
+        for paragraph, key in zip(paragraphs, keys):
+            if key in seen:
+                strip = True
+            elif len(paragraph) < self.min_chars or section_value(paragraph) == 2:
+                # Reposted and templated postings share their requirements too
+                strip = False
+            else:
+                strip = (key, "common") in boilerplate or (
+                    key,
+                    "company",
+                ) in boilerplate
+            seen.add(key)
+            if strip:
+                self.paragraphs_removed += 1
+            else:
+                kept.append(paragraph)
+
+        self.observe(job, keys)
+
+        normalized = "\n\n".join(kept)
+        chars_removed = len(description) - len(normalized)
+        tokens_removed = self.estimator.estimate(description) - self.estimator.estimate(
+            normalized
+        )
+        self.jobs += 1
+        self.chars_before += len(description)
+        self.chars_removed += chars_removed
+        self.tokens_removed += tokens_removed
+        logger.debug(
+            "Normalized description of %s at %s: %d chars and about %d tokens removed",
+            job.get("title"),
+            job.get("company"),
+            chars_removed,
+            tokens_removed,
+        )
+
+        return {**job, "description": normalized}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the normalization statistics
+
+        Returns:
+            dict: Number of normalized jobs, removed paragraphs, characters and
+                estimated tokens, and the share of characters removed
+        """
+        return {
+            "jobs": self.jobs,
+            "paragraphs_removed": self.paragraphs_removed,
+            "chars_removed": self.chars_removed,
+            "tokens_removed": self.tokens_removed,
+            "avg_tokens_removed": (
+                self.tokens_removed / self.jobs if self.jobs else 0.0
+            ),
+            "removed_share": (
+                self.chars_removed / self.chars_before if self.chars_before else 0.0
+            ),
+        }
@@ -0,0 +1,156 @@
+"""
+Embedding similarity pre-filter ahead of the full job analysis
+"""
+
+import collections
+import hashlib
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(
+    filename="job_scraper.log",
+    filemode="a",
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("prefilter")
+
+
+class EmbeddingPreFilter:
+    """
+    Rejects jobs whose description embedding is too dissimilar to the resume
+
+    The cutoff is either a fixed cosine similarity threshold or a percentile
+    of the similarities seen recently, so only the top share of jobs is sent
+    to the full analysis.
+    """
+
+    def __init__(
+        self,
+        model,
+        resume_path: str,
+        embedding_model: str,
+        threshold: Optional[float] = None,
+        top_percent: Optional[float] = None,
+        window: int = 500,
+        min_samples: int = 20,
+    ):
+        """
+        Initialize the pre-filter
+
+        Args:
+            model: Model client providing aembed
+            resume_path: Path to the resume file
+            embedding_model: Name of the embedding model
+            threshold: Minimum cosine similarity of a job to pass
+            top_percent: Share in percent of recently seen jobs that pass,
+                used when no threshold is set
+            window: Number of recent similarities the percentile is taken over
+            min_samples: Similarities needed before the percentile cutoff applies
+        """
+        if threshold is None and top_percent is None:
+            raise ValueError("Pre-filter needs a threshold or a top_percent")
+        if top_percent is not None and not 0 < top_percent <= 100:
+            raise ValueError("Pre-filter top_percent must be in (0, 100]")
+
+        self.model = model
+        self.resume_path = resume_path
+        self.embedding_model = embedding_model
+        self.threshold = threshold
+        self.top_percent = top_percent
+        self.min_samples = min_samples
+
+        self.history = collections.deque(maxlen=window)
+        self.passed = 0
+        self.rejected = 0
+
+        self._resume_key = None
+        self._resume_vector = None
+
+    async def _resume(self) -> np.ndarray:
+        """Embed the resume, reusing the embedding until the file changes"""
+        try:
+            with open(self.resume_path, "r", encoding="utf-8") as file:
+                resume = file.read()
+        except FileNotFoundError as exc:
+            raise ValueError(f"Resume {self.resume_path} not found") from exc
+
+        key = hashlib.sha256(resume.encode("utf-8")).hexdigest()
+        if key != self._resume_key:
+            vectors = await self.model.aembed([resume], model=self.embedding_model)
+            self._resume_vector = self._normalize(
+                np.asarray(vectors, dtype=np.float32)
+            )[0]
+            self._resume_key = key
+            logger.info(f"Embedded resume {self.resume_path} for the pre-filter")
+        return self._resume_vector
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """Scale rows to unit length"""
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    @staticmethod
+    def _job_text(job: Dict[str, Any]) -> str:
+        """Text of a job that is embedded"""
+        description = job.get("description")
+        if not isinstance(description, str):
+            description = ""
+        return f"{job.get('title') or ''}\n{description}"
+
+    async def similarities(self, jobs: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Compute the cosine similarity of jobs to the resume
+
+        Args:
+            jobs: Job data dictionaries
+
+        Returns:
+            np.ndarray: Similarity of each job
+        """
+        resume = await self._resume()
+        vectors = await self.model.aembed(
+            [self._job_text(job) for job in jobs], model=self.embedding_model
+        )
+        return self._normalize(np.asarray(vectors, dtype=np.float32)) @ resume
+
+    def cutoff(self) -> Optional[float]:
+        """
+        Get the current similarity cutoff
+
+        Returns:
+            float: Minimum similarity to pass, None while too few jobs were seen
+        """
+        if self.threshold is not None:
+            return self.threshold
+        if len(self.history) < self.min_samples:
+            return None
+        return float(np.percentile(self.history, 100 - self.top_percent))
+
+    async def check(self, jobs: List[Dict[str, Any]]) -> List[Tuple[bool, float]]:
+        """
+        Check jobs against the cutoff
+
+        Args:
+            jobs: Job data dictionaries
+
+        Returns:
+            list: (passed, similarity) for each job
+        """
+        similarities = await self.similarities(jobs)
+        self.history.extend(similarities.tolist())
+
+        cutoff = self.cutoff()
+        passed = (
+            similarities >= cutoff
+            if cutoff is not None
+            else np.ones(len(jobs), dtype=bool)
+        )
+
+        self.passed += int(passed.sum())
+        self.rejected += int((~passed).sum())
+        return list(zip(passed.tolist(), similarities.tolist()))
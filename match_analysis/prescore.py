@@ -0,0 +1,138 @@
+"""
+Cheap local pre-scoring of jobs to order the analysis queue
+"""
+
+import math
+import re
+from datetime import datetime
+from typing import Dict, Any, Set
+
+import pandas as pd
+
+# Words that carry no signal about the fit of a job
+STOPWORDS = {
+    "and",
+    "the",
+    "for",
+    "with",
+    "you",
+    "our",
+    "are",
+    "will",
+    "your",
+    "that",
+    "this",
+    "have",
+    "from",
+    "who",
+    "all",
+    "can",
+    "able",
+    "work",
+    "team",
+    "role",
+    "experience",
+    "years",
+    "including",
+    "such",
+    "about",
+    "into",
+    "their",
+    "they",
+    "more",
+    "other",
+    "well",
+    "also",
+}
+
+
+def tokenize(text: Any) -> Set[str]:
+    """
+    Split text into a set of lowercase keyword tokens
+
+    Args:
+        text: Text to tokenize, non-strings are treated as empty
+
+    Returns:
+        set: Distinct tokens of at least two characters, without stopwords
+    """
+    if not isinstance(text, str):
+        return set()
+
+    tokens = re.findall(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]", text.lower())
+    return {token for token in tokens if token not in STOPWORDS}
+
+
+class JobPreScorer:
+    """
+    Scores jobs in [0, 1] from keyword overlap with the resume, how well the
+    title matches the search term and how recently the job was posted
+    """
+
+    def __init__(
+        self,
+        resume_path: str,
+        keyword_weight: float = 0.5,
+        title_weight: float = 0.3,
+        recency_weight: float = 0.2,
+        recency_half_life_days: float = 3.0,
+    ):
+        """
+        Initialize the pre-scorer
+
+        Args:
+            resume_path: Path to the resume file
+            keyword_weight: Weight of the keyword overlap with the resume
+            title_weight: Weight of the title match with the search term
+            recency_weight: Weight of the recency of the posting
+            recency_half_life_days: Age in days at which the recency score halves
+        """
+        try:
+            with open(resume_path, "r", encoding="utf-8") as file:
+                self.resume_tokens = tokenize(file.read())
+        except FileNotFoundError as exc:
+            raise ValueError(f"Resume {resume_path} not found") from exc
+
+        self.keyword_weight = keyword_weight
+        self.title_weight = title_weight
+        self.recency_weight = recency_weight
+        self.recency_half_life_days = recency_half_life_days
+
+    def keyword_score(self, job: Dict[str, Any]) -> float:
+        """Fraction of the job keywords that appear in the resume"""
+        job_tokens = tokenize(job.get("title")) | tokenize(job.get("description"))
+        if not job_tokens:
+            return 0.0
+        return len(job_tokens & self.resume_tokens) / len(job_tokens)
+
+    def title_score(self, job: Dict[str, Any]) -> float:
+        """Fraction of the search term words that appear in the title"""
+        search_tokens = tokenize(job.get("search_term"))
+        if not search_tokens:
+            return 0.0
+        return len(search_tokens & tokenize(job.get("title"))) / len(search_tokens)
+
+    def recency_score(self, job: Dict[str, Any]) -> float:
+        """Exponential decay of the posting age, 0.5 if the date is unknown"""
+        date_posted = pd.to_datetime(job.get("date_posted"), errors="coerce")
+        if pd.isna(date_posted):
+            return 0.5
+
+        age_days = max((datetime.now() - date_posted).total_seconds() / 86400, 0.0)
+        return math.pow(0.5, age_days / self.recency_half_life_days)
+
+    def score(self, job: Dict[str, Any]) -> float:
+        """
+        Score a job
+
+        Args:
+            job: Job data dictionary
+
+        Returns:
+            float: Weighted pre-score, higher is a more promising job
+        """
+        return (
+            self.keyword_weight * self.keyword_score(job)
+            + self.title_weight * self.title_score(job)
+            + self.recency_weight * self.recency_score(job)
+        )
@@ -4,15 +4,26 @@ Job processor for analyzing and matching jobs with profiles
 
 import logging
 import asyncio
-import json
 import threading
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, List, Optional
 
-from match_analysis.queue import JobQueue
+from match_analysis.cache import AnalysisCache
+from match_analysis.cascade import ACCEPT, REJECT, VERDICT_KEY, TriageCascade
+from match_analysis.concurrency import AIMDLimiter
+from match_analysis.prefilter import EmbeddingPreFilter
+from match_analysis.queue import JobQueue, create_job_queue
+from match_analysis.repair import AnalysisRepairer
+from match_analysis.results import ResultStore
+from match_analysis.retry import ATTEMPTS_KEY, DeadLetterStore, RetryScheduler
+from match_analysis.schema import ANALYSIS_SCHEMA, BATCH_SCHEMA, SchemaViolation
 from match_analysis.template import Templater
+from match_analysis.tokens import ContextBudget, ContextOverflow
 from match_analysis.llm import LLM
+from match_analysis.normalizer import DescriptionNormalizer
 
 from configuration import ConfigManager
+from network import close_session, open_session
 
 from push_notification.service import NotificationService
 from model.job_listing import JobListing
@@ -54,9 +65,32 @@ class JobMatchProcessor:
         self.config = config["match_analysis"]
 
         # Set up job queue
-        self.job_queue = job_queue or JobQueue()
+        self.job_queue = job_queue or create_job_queue(
+            self.config, config.get("job_scraper", {}).get("scrapers", [])
+        )
 
         self.templater = Templater(self.config)
+        self.model = LLM(self.config).get_model()
+        model_config = self.config.get(self.config.get("backend", "ollama"), {})
+
+        # Send the static prompt prefix as the system prompt instead of inline
+        self.system_prompt = model_config.get("system_prompt", False)
+
+        # Stream the analyses so output breaking the schema is aborted early
+        self.stream = model_config.get("stream", True)
+
+        # Size the context window of each request to its prompt and output
+        context_config = model_config.get("context", {})
+        self.context_buckets = context_config.get("buckets", [4096, 8192, 12288, 16384])
+        self.context_margin = context_config.get("margin", 0.1)
+        self.min_description_chars = context_config.get("min_description_chars", 500)
+        self.budget = ContextBudget(
+            self.model.estimator,
+            buckets=self.context_buckets,
+            num_predict=context_config.get("num_predict", 4096),
+            margin=self.context_margin,
+            min_description_chars=self.min_description_chars,
+        )
 
         # Get process count from config
         self.worker_count = self.config.get("worker_count", 1)
@@ -64,99 +98,666 @@ class JobMatchProcessor:
         self.max_retries = self.config.get("max_retries", 3)
         self.retry_delay = self.config.get("retry_delay", 5)
 
+        # Optional adaptive concurrency: the in-flight analysis requests follow
+        # the model latency and throughput between floor and ceiling, with a
+        # worker for every request the ceiling admits
+        self.limiter = None
+        concurrency_config = self.config.get("concurrency", {})
+        if concurrency_config.get("adaptive", False):
+            self.limiter = AIMDLimiter(
+                floor=concurrency_config.get("floor", 1),
+                ceiling=concurrency_config.get("ceiling", 8),
+                initial=concurrency_config.get("initial"),
+                window=concurrency_config.get("window", 5),
+                latency_factor=concurrency_config.get("latency_factor", 2.0),
+                decrease_factor=concurrency_config.get("decrease_factor", 0.75),
+                timeout_decrease_factor=concurrency_config.get(
+                    "timeout_decrease_factor", 0.5
+                ),
+            )
+            self.worker_count = max(self.worker_count, self.limiter.ceiling)
+
+        # Failed jobs are retried with exponential backoff, then dead-lettered
+        dead_letter_config = self.config.get("dead_letter", {})
+        self.dead_letters = DeadLetterStore(
+            dead_letter_config.get("path", "dead_letters.db")
+        )
+        self.retry_scheduler = RetryScheduler(
+            self.job_queue,
+            self.dead_letters,
+            max_attempts=self.max_retries,
+            base_delay=self.retry_delay,
+            max_delay=self.config.get("retry_max_delay", 600),
+            jitter=self.config.get("retry_jitter", 0.5),
+        )
+
         self.rejection_threshold = self.config.get("rejection_threshold", 2)
 
+        # LLM time spent and jobs analyzed, to estimate the time reclaimed by
+        # shedding expired jobs
+        self.llm_seconds = 0.0
+        self.llm_calls = 0
+        self.jobs_expired = 0
+
+        # Optional persistent cache of analyses
+        self.analysis_cache = None
+        cache_config = self.config.get("cache", {})
+        if cache_config.get("enabled", False):
+            self.analysis_cache = AnalysisCache(
+                path=cache_config.get("path", "analysis_cache.db"),
+                ttl_seconds=cache_config.get("ttl_days", 30) * 24 * 3600,
+                max_entries=cache_config.get("max_entries", 5000),
+            )
+
+        # Record of the decision made for every job
+        self.results = None
+        results_config = self.config.get("results", {})
+        if results_config.get("enabled", True):
+            self.results = ResultStore(
+                results_config.get("path", "analysis_results.db")
+            )
+
+        # Optional description normalization, stripping escapes and boilerplate
+        self.normalizer = None
+        normalizer_config = self.config.get("normalizer", {})
+        if normalizer_config.get("enabled", False):
+            self.normalizer = DescriptionNormalizer(
+                path=normalizer_config.get("path", "paragraphs.db"),
+                estimator=self.model.estimator,
+                min_companies=normalizer_config.get("min_companies", 5),
+                min_company_jobs=normalizer_config.get("min_company_jobs", 3),
+                min_chars=normalizer_config.get("min_chars", 80),
+                ttl_seconds=normalizer_config.get("ttl_days", 90) * 24 * 3600,
+            )
+
+        # Optional embedding pre-filter rejecting clear mismatches before the analysis
+        self.prefilter = None
+        prefilter_config = self.config.get("prefilter", {})
+        if prefilter_config.get("enabled", False):
+            self.prefilter = EmbeddingPreFilter(
+                self.model,
+                self.config["resume_path"],
+                embedding_model=prefilter_config.get("model", "nomic-embed-text"),
+                threshold=prefilter_config.get("threshold"),
+                top_percent=prefilter_config.get("top_percent"),
+                window=prefilter_config.get("window", 500),
+                min_samples=prefilter_config.get("min_samples", 20),
+            )
+
+        # Optional cascade: a small model decides clear cases, the rest is escalated
+        self.cascade = None
+        cascade_config = self.config.get("cascade", {})
+        if cascade_config.get("enabled", False):
+            if "model" not in cascade_config:
+                raise ValueError("Missing 'model' in cascade configuration")
+            triage_model = self.model.for_model(cascade_config["model"])
+            self.cascade = TriageCascade(
+                triage_model,
+                self.templater,
+                budget=ContextBudget(
+                    triage_model.estimator,
+                    buckets=self.context_buckets,
+                    num_predict=cascade_config.get("num_predict", 256),
+                    margin=self.context_margin,
+                    min_description_chars=self.min_description_chars,
+                ),
+                band_low=cascade_config.get("band_low", 30),
+                band_high=cascade_config.get("band_high", 100),
+                min_confidence=cascade_config.get("min_confidence", 0.7),
+            )
+
+        # Malformed output is repaired locally instead of asking the model again
+        self.repairer = AnalysisRepairer()
+
+        # Optional batch mode: workers analyze several queued jobs in one call
+        batch_config = self.config.get("batch", {})
+        self.batch_size = (
+            batch_config.get("max_jobs", 4) if batch_config.get("enabled", False) else 1
+        )
+        self.batch_max_tokens = batch_config.get("max_tokens", 8192)
+        self.batch_num_predict = batch_config.get("num_predict_per_job", 1024)
+        self.batches = 0
+        self.batch_jobs = 0
+        self.batch_fallbacks = 0
+
         if self.worker_count < 1:
             raise ValueError("Processor count must be at least 1")
+        if self.batch_size < 1:
+            raise ValueError("Batch max_jobs must be at least 1")
 
     async def process_job(self, job: Dict[str, Any]) -> None:
         """
         Process a job by sending it to the API
 
+        Failures are raised to the worker, which schedules the retries.
+
         Args:
             job: Job data dictionary
         """
+        [prepared] = await self._prepare_jobs([job])
+        if isinstance(prepared, Exception):
+            raise prepared
+        if prepared is None:
+            return
+
+        prompt_job, cache_key, similarity, ans = prepared
+        if ans is None:
+            ans = await self._analyze_job(job, prompt_job)
+        else:
+            # Cached analyses are not stored again, so they still expire
+            cache_key = None
+        await self._finish_job(job, ans, cache_key, similarity)
+
+    async def process_batch(
+        self, jobs: List[Dict[str, Any]]
+    ) -> List[Optional[Exception]]:
+        """
+        Process several jobs, analyzing those that need the model in one call
+
+        Jobs missing from the batch output, or whose entry is malformed, fall
+        back to a single-job analysis.
+
+        Args:
+            jobs: Job data dictionaries
+
+        Returns:
+            list: For each job, the exception it failed with or None
+        """
+        errors = [None] * len(jobs)
+        pending = []
+        for idx, (job, prepared) in enumerate(
+            zip(jobs, await self._prepare_jobs(jobs))
+        ):
+            if isinstance(prepared, Exception):
+                errors[idx] = prepared
+                continue
+            if prepared is None:
+                continue
+            try:
+                if prepared[3] is not None:
+                    # Cached analyses are not stored again, so they still expire
+                    await self._finish_job(job, prepared[3], None, prepared[2])
+                    continue
+                pending.append((idx, job, prepared))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                errors[idx] = e
 
-        for attempt in range(self.max_retries):
+        analyses = {}
+        if len(pending) > 1:
             try:
-                prompt = self.templater.generate_prompt(job)
-                model = LLM(self.config).get_model()
-
-                # Ollama is a bit finnicky, so we need to retry a few times
-                logger.info(
-                    "Processing job: %s at %s (attempt %d)",
-                    job.get("title"),
-                    job.get("company"),
-                    attempt + 1,
+                analyses = await self._analyze_batch(
+                    [prepared[0] for _, _, prepared in pending]
                 )
-                ans = await model.ainvoke(prompt)
-
-                # Parse the ans string as JSON
-                ans = json.loads(ans)
-
-                justification = self.generate_justification(ans)
-
-                # Create a JobListing object
-                job_listing = JobListing(
-                    scrape_site=job["site"],
-                    scrape_name=job["source"].split(":")[0],
-                    job_title=job["title"],
-                    company=job["company"],
-                    company_logo_url=job["company_logo"],
-                    job_posting_url=job["job_url"],
-                    job_requirements=ans["analysis"]["role_requirements"],
-                    brief_description=ans["analysis"]["role_summary"],
-                    match_justification=justification,
-                    rejected=self._rating_to_score(ans["overall_match"]["rating"])
-                    <= self.rejection_threshold,
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    "Batch analysis of %d jobs failed, analyzing them one by one: %s",
+                    len(pending),
+                    e,
                 )
 
-                # Send notification
-                await self.notification_service.async_send_job_notification(job_listing)
+        for position, (idx, job, prepared) in enumerate(pending):
+            prompt_job, cache_key, similarity, _ = prepared
+            try:
+                ans = analyses.get(position)
+                if ans is None:
+                    if len(pending) > 1:
+                        self.batch_fallbacks += 1
+                    ans = await self._analyze_job(job, prompt_job)
+                await self._finish_job(job, ans, cache_key, similarity)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                errors[idx] = e
+
+        return errors
+
+    async def _prepare_jobs(self, jobs: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Run the stages ahead of the analysis: cache, normalization, pre-filter
+        and triage
+
+        The pre-filter embeds the descriptions of all jobs it checks with one
+        request.
+
+        Args:
+            jobs: Job data dictionaries
 
-                logger.info(
-                    "Processed job: %(title)s at %(company)s",
-                    {"title": job["title"], "company": job["company"]},
+        Returns:
+            list: For each job, a tuple (prompt job, cache key, similarity,
+                cached analysis or None), None if a stage already decided the
+                job, or the exception the job failed with
+        """
+        prepared = [None] * len(jobs)
+        lookups = {}
+        for idx, job in enumerate(jobs):
+            try:
+                lookups[idx] = self._lookup_job(job)
+            except Exception as e:
+                prepared[idx] = e
+
+        similarities = {}
+        screened = [idx for idx, (_, _, ans) in lookups.items() if ans is None]
+        if self.prefilter is not None and screened:
+            try:
+                checks = await self.prefilter.check(
+                    [lookups[idx][0] for idx in screened]
                 )
-                break
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                if attempt < self.max_retries - 1:
-                    logger.error(
-                        "Attempt %d error in processing job %s: %s. Retrying in %d seconds...",
-                        attempt + 1,
+                checks = None
+                for idx in screened:
+                    prepared[idx] = e
+                    del lookups[idx]
+
+            for idx, (passed, similarity) in zip(screened, checks or []):
+                job = jobs[idx]
+                similarities[idx] = similarity
+                if not passed:
+                    del lookups[idx]
+                    self._record_result(job, "prefilter", True, similarity=similarity)
+                    logger.info(
+                        "Pre-filter rejected job: %s at %s (similarity %.3f, cutoff %.3f)",
                         job.get("title"),
-                        e,
-                        self.retry_delay,
-                        exc_info=True,
+                        job.get("company"),
+                        similarity,
+                        self.prefilter.cutoff(),
                     )
-                    await asyncio.sleep(self.retry_delay)
-                else:
-                    raise e
+
+        for idx, (prompt_job, cache_key, ans) in lookups.items():
+            try:
+                prepared[idx] = await self._triage_job(
+                    jobs[idx], prompt_job, cache_key, similarities.get(idx), ans
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                prepared[idx] = e
+
+        return prepared
+
+    def _lookup_job(self, job: Dict[str, Any]) -> tuple:
+        """
+        Look up a previous analysis of a job and normalize its description
+
+        Args:
+            job: Job data dictionary
+
+        Returns:
+            tuple: (prompt job, cache key, cached analysis or None)
+        """
+        # Reuse a previous analysis of identical inputs
+        cache_key = None
+        ans = None
+        if self.analysis_cache is not None:
+            cache_key = AnalysisCache.make_key(
+                self.model.model, self.templater.fingerprint(job)
+            )
+            ans = self.analysis_cache.get(cache_key)
+
+        # The model stages see the normalized description, the job itself is
+        # kept as is for the cache key, the listing and retries
+        prompt_job = job
+        if ans is None and self.normalizer is not None:
+            prompt_job = self.normalizer.normalize(job)
+
+        return prompt_job, cache_key, ans
+
+    async def _triage_job(
+        self,
+        job: Dict[str, Any],
+        prompt_job: Dict[str, Any],
+        cache_key: Optional[str],
+        similarity: Optional[float],
+        ans: Optional[Dict[str, Any]],
+    ) -> Optional[tuple]:
+        """
+        Triage a job that passed the pre-filter
+
+        Args:
+            job: Job data dictionary
+            prompt_job: The job as rendered into the prompt
+            cache_key: Analysis cache key
+            similarity: Pre-filter similarity, if computed
+            ans: Cached analysis, if any
+
+        Returns:
+            tuple: (prompt job, cache key, similarity, cached analysis or None),
+                None if the triage decided the job
+        """
+        if ans is None and self.cascade is not None and VERDICT_KEY not in job:
+            verdict = await self.cascade.triage(prompt_job)
+            decision = self.cascade.decide(verdict)
+            logger.info(
+                "Triage verdict for job %s at %s: %s %.0f (confidence %.2f), %s",
+                job.get("title"),
+                job.get("company"),
+                verdict.get("rating"),
+                verdict["score"],
+                verdict["confidence"],
+                decision,
+            )
+
+            if decision in (REJECT, ACCEPT):
+                job_listing = self._create_triage_listing(job, verdict)
+                self._record_result(
+                    job,
+                    "triage",
+                    job_listing.rejected,
+                    similarity=similarity,
+                    rating=verdict.get("rating"),
+                )
+                if decision == ACCEPT:
+                    await self.notification_service.async_send_job_notification(
+                        job_listing
+                    )
+                return None
+
+            job[VERDICT_KEY] = verdict
+
+        if ans is not None:
+            logger.info(
+                "Using cached analysis for job: %s at %s",
+                job.get("title"),
+                job.get("company"),
+            )
+
+        return prompt_job, cache_key, similarity, ans
+
+    async def _analyze_job(
+        self, job: Dict[str, Any], prompt_job: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Analyze a single job with the model
+
+        Args:
+            job: Job data dictionary
+            prompt_job: The job as rendered into the prompt
+
+        Returns:
+            dict: Parsed analysis
+        """
+        # The static prefix comes first so the model server reuses its cached prefill
+        # The context window is sized to the prompt, trimming long descriptions
+        prefix, job_part, options = self.budget.plan(self.templater, prompt_job)
+
+        logger.info(
+            "Processing job: %s at %s (attempt %d, num_ctx %d)",
+            job.get("title"),
+            job.get("company"),
+            job.get(ATTEMPTS_KEY, 0) + 1,
+            options["num_ctx"],
+        )
+        try:
+            ans = await self._invoke(prefix, job_part, options, ANALYSIS_SCHEMA, jobs=1)
+        except SchemaViolation as exc:
+            if exc.text is None:
+                raise
+            logger.warning("Repairing analysis output that broke the schema: %s", exc)
+            ans = exc.text
+
+        # Parse the ans string as JSON, repairing what can be repaired
+        return self.repairer.parse(ans)
+
+    async def _analyze_batch(
+        self, prompt_jobs: List[Dict[str, Any]]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Analyze several jobs with one model call
+
+        Args:
+            prompt_jobs: The jobs as rendered into the prompt
+
+        Returns:
+            dict: Parsed analyses by position of the job, jobs missing from the
+                output or with a malformed entry are left out
+        """
+        job_ids = {f"job-{idx + 1}": job for idx, job in enumerate(prompt_jobs)}
+        prefix, jobs_part = self.templater.generate_batch_prompt_parts(job_ids)
+        options = self.budget.size(
+            prefix, jobs_part, self.batch_num_predict * len(prompt_jobs)
+        )
+
+        logger.info(
+            "Processing batch of %d jobs (num_ctx %d)",
+            len(prompt_jobs),
+            options["num_ctx"],
+        )
+        try:
+            ans = await self._invoke(
+                prefix, jobs_part, options, BATCH_SCHEMA, jobs=len(prompt_jobs)
+            )
+        except SchemaViolation as exc:
+            if exc.text is None:
+                raise
+            logger.warning("Repairing batch output that broke the schema: %s", exc)
+            ans = exc.text
+
+        positions = {job_id: idx for idx, job_id in enumerate(job_ids)}
+        analyses = {}
+        for entry in self.repairer.parse_batch(ans):
+            idx = positions.get(str(entry.get("job_id")).strip())
+            if idx is not None:
+                analyses[idx] = entry
+
+        self.batches += 1
+        self.batch_jobs += len(prompt_jobs)
+        return analyses
+
+    async def _invoke(
+        self,
+        prefix: str,
+        job_part: str,
+        options: Dict[str, int],
+        schema: Dict[str, Any],
+        jobs: int,
+    ) -> str:
+        """
+        Send a prompt to the analysis model, timing the call
+
+        Args:
+            prefix: Static prompt prefix
+            job_part: Job-specific part of the prompt
+            options: Model options
+            schema: JSON schema of the output
+            jobs: Number of jobs analyzed by the call
+
+        Returns:
+            str: The model response
+        """
+        if self.limiter is not None:
+            slot = await self.limiter.acquire()
+        start = time.perf_counter()
+        ok = timed_out = False
+        try:
+            if self.system_prompt:
+                ans = await self.model.ainvoke(
+                    job_part,
+                    stream=self.stream,
+                    system=prefix,
+                    options=options,
+                    schema=schema,
+                )
+            else:
+                ans = await self.model.ainvoke(
+                    prefix + job_part,
+                    stream=self.stream,
+                    options=options,
+                    schema=schema,
+                )
+            ok = True
+        except asyncio.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if self.limiter is not None:
+                await self.limiter.release(slot, ok, timed_out)
+        self.llm_seconds += time.perf_counter() - start
+        self.llm_calls += jobs
+        return ans
+
+    def _record_result(
+        self,
+        job: Dict[str, Any],
+        stage: str,
+        rejected: bool,
+        similarity: Optional[float] = None,
+        rating: Optional[str] = None,
+    ) -> None:
+        """Record the decision made for a job, if the result store is enabled"""
+        if self.results is not None:
+            self.results.add(job, stage, rejected, similarity=similarity, rating=rating)
+
+    async def _finish_job(
+        self,
+        job: Dict[str, Any],
+        ans: Dict[str, Any],
+        cache_key: Optional[str],
+        similarity: Optional[float],
+    ) -> None:
+        """
+        Record, cache and notify the analysis of a job
+
+        Args:
+            job: Job data dictionary
+            ans: Parsed analysis
+            cache_key: Analysis cache key of a freshly generated analysis,
+                None without a cache or for a cached analysis
+            similarity: Pre-filter similarity, if computed
+        """
+        job_listing = self._create_job_listing(job, ans)
+        self._record_result(
+            job,
+            "analysis",
+            job_listing.rejected,
+            similarity=similarity,
+            rating=ans["overall_match"]["rating"],
+        )
+
+        # Only cache analyses that produced a valid job listing
+        if cache_key is not None:
+            self.analysis_cache.put(cache_key, ans)
+            logger.info(
+                "Analysis cache hit ratio: %(hit_ratio).2f (%(hits)d hits, %(misses)d misses)",
+                self.analysis_cache.stats(),
+            )
+
+        # Send notification
+        await self.notification_service.async_send_job_notification(job_listing)
+
+        logger.info(
+            "Processed job: %(title)s at %(company)s",
+            {"title": job["title"], "company": job["company"]},
+        )
+
+    def _create_job_listing(
+        self, job: Dict[str, Any], ans: Dict[str, Any]
+    ) -> JobListing:
+        """
+        Create a job listing from a job and its analysis
+
+        Args:
+            job: Job data dictionary
+            ans: Parsed analysis from the model
+
+        Returns:
+            JobListing: The job listing to notify about
+        """
+        justification = self.generate_justification(ans)
+
+        return JobListing(
+            scrape_site=job["site"],
+            scrape_name=job["source"].split(":")[0],
+            job_title=job["title"],
+            company=job["company"],
+            company_logo_url=job["company_logo"],
+            job_posting_url=job["job_url"],
+            job_requirements=ans["analysis"]["role_requirements"],
+            brief_description=ans["analysis"]["role_summary"],
+            match_justification=justification,
+            rejected=self._rating_to_score(ans["overall_match"]["rating"])
+            <= self.rejection_threshold,
+        )
+
+    def _create_triage_listing(
+        self, job: Dict[str, Any], verdict: Dict[str, Any]
+    ) -> JobListing:
+        """
+        Create a job listing from a job and its triage verdict
+
+        Args:
+            job: Job data dictionary
+            verdict: Verdict of the triage model
+
+        Returns:
+            JobListing: The job listing to notify about
+        """
+        return JobListing(
+            scrape_site=job["site"],
+            scrape_name=job["source"].split(":")[0],
+            job_title=job["title"],
+            company=job["company"],
+            company_logo_url=job["company_logo"],
+            job_posting_url=job["job_url"],
+            job_requirements="",
+            brief_description=verdict.get("summary", ""),
+            match_justification=f"Triage: {verdict.get('rating')} - {verdict['score']:.0f}\n{verdict.get('summary', '')}",
+            rejected=verdict["score"] < self.cascade.band_low,
+        )
+
+    def _record_expired(self) -> None:
+        """Move jobs dropped by the freshness budget to the dead-letter store"""
+        expired = self.job_queue.pop_expired()
+        if not expired:
+            return
+
+        for job, reason in expired:
+            self.dead_letters.add(job, reason, job.get(ATTEMPTS_KEY, 0))
+        self.jobs_expired += len(expired)
+
+        average = self.llm_seconds / self.llm_calls if self.llm_calls else 0.0
+        logger.info(
+            "Dropped %d expired jobs, %d in total, reclaiming about %.0f seconds of LLM time",
+            len(expired),
+            self.jobs_expired,
+            self.jobs_expired * average,
+        )
 
     async def _worker(self):
         """Worker task that processes jobs from the queue"""
+        carry = None
         while True:
             try:
                 # Get a job from the queue
-                job = await asyncio.wait_for(self.job_queue.queue.get(), timeout=1.0)
+                if carry is not None:
+                    job, carry = carry, None
+                else:
+                    try:
+                        job = await asyncio.wait_for(self.job_queue.get(), timeout=1.0)
+                    finally:
+                        self._record_expired()
+
+                if self.batch_size > 1:
+                    jobs, carry = await self._drain_batch(job)
+                    await self._process_batch(jobs)
+                    continue
 
                 # Process the job
+                requeued = False
                 try:
                     await self.process_job(job)
-                except (
-                    ValueError,
-                    json.JSONDecodeError,
-                    KeyError,
-                    asyncio.TimeoutError,
-                ) as e:
-                    # Recoverable error, put job back on queue
-                    logger.error("Error processing job: %s", e)
-                    logger.info("Adding job back to queue: %s", e)
-                    # TODO: Can't use async put due to different event loop
-                    self.job_queue.put_sync(job)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # Free the worker right away, the scheduler puts the job back later
+                    requeued = self._handle_failure(job, e)
                 finally:
-                    # Mark the job as done
-                    self.job_queue.queue.task_done()
+                    # Mark the job as done, keeping it persisted if a retry is scheduled
+                    self.job_queue.task_done(job, ack=not requeued)
             except asyncio.TimeoutError:
                 # No job available, continue loop
                 pass
@@ -166,18 +767,283 @@ class JobMatchProcessor:
             except Exception as e:
                 logger.error(f"Unrecoverable error in worker: {e}", exc_info=True)
 
+    async def _drain_batch(self, job: Dict[str, Any]) -> tuple:
+        """
+        Take further queued jobs to analyze together with a job
+
+        Jobs are taken without waiting, up to the batch size and while their
+        estimated description tokens fit the batch token budget.
+
+        Args:
+            job: The first job of the batch
+
+        Returns:
+            tuple: (jobs of the batch, job taken that did not fit or None)
+        """
+        jobs = [job]
+        tokens = self._batch_tokens(job)
+        while len(jobs) < self.batch_size and not self.job_queue.empty():
+            try:
+                next_job = await asyncio.wait_for(self.job_queue.get(), timeout=0.1)
+            except asyncio.TimeoutError:
+                break
+            finally:
+                self._record_expired()
+
+            next_tokens = self._batch_tokens(next_job)
+            if tokens + next_tokens > self.batch_max_tokens:
+                # Starts the next batch of this worker
+                return jobs, next_job
+            jobs.append(next_job)
+            tokens += next_tokens
+        return jobs, None
+
+    def _batch_tokens(self, job: Dict[str, Any]) -> int:
+        """Estimated tokens a job adds to a batch prompt"""
+        description = job.get("description")
+        text = f"{job.get('title') or ''}\n{job.get('company') or ''}\n"
+        if isinstance(description, str):
+            text += description
+        return self.model.estimator.estimate(text)
+
+    async def _process_batch(self, jobs: List[Dict[str, Any]]) -> None:
+        """
+        Process a batch of jobs and acknowledge or retry each of them
+
+        Args:
+            jobs: Job data dictionaries
+        """
+        try:
+            errors = await self.process_batch(jobs)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            errors = [e] * len(jobs)
+
+        for job, error in zip(jobs, errors):
+            requeued = False
+            if error is not None:
+                requeued = self._handle_failure(job, error)
+            self.job_queue.task_done(job, ack=not requeued)
+
+    def _handle_failure(self, job: Dict[str, Any], error: Exception) -> bool:
+        """
+        Schedule a retry of a failed job or move it to the dead-letter store
+
+        Jobs whose prompt does not fit the context window are dead-lettered
+        right away, a retry cannot fit them either.
+
+        Args:
+            job: The failed job
+            error: The error of the failed attempt
+
+        Returns:
+            bool: True if a retry was scheduled, False if the job was dead-lettered
+        """
+        if isinstance(error, ContextOverflow):
+            attempts = job.get(ATTEMPTS_KEY, 0) + 1
+            self.dead_letters.add(job, repr(error), attempts)
+            logger.error(
+                "Job %s at %s does not fit the context window, moved to "
+                "dead-letter store: %s",
+                job.get("title"),
+                job.get("company"),
+                error,
+            )
+            return False
+
+        logger.error("Error processing job: %s", error, exc_info=error)
+        return self.retry_scheduler.schedule(job, error)
+
+    async def _maintain_queue(self, interval: float = 60.0):
+        """
+        Replay jobs left over from a previous run, redeliver expired leases and
+        log the per-source queue and per-endpoint model statistics
+        """
+        try:
+            restored = await self.job_queue.restore()
+            if restored:
+                logger.info(f"Restored {restored} jobs into the queue")
+
+            while True:
+                await asyncio.sleep(interval)
+                await self.job_queue.requeue_expired()
+
+                for source, stats in self.job_queue.source_stats().items():
+                    logger.info(
+                        "Queue source %s: %d queued, %d dequeued, wait avg %.1fs, "
+                        "p95 %.1fs, max %.1fs",
+                        source,
+                        stats["depth"],
+                        stats["dequeued"],
+                        stats["avg_wait"],
+                        stats["p95_wait"],
+                        stats["max_wait"],
+                    )
+
+                usage = self.model.usage()
+                if usage["calls"]:
+                    logger.info(
+                        "Model prefill: %.0f prompt tokens and %.2fs per call on average "
+                        "over %d calls",
+                        usage["avg_prompt_eval_count"],
+                        usage["avg_prompt_eval_seconds"],
+                        usage["calls"],
+                    )
+                    logger.info(
+                        "Context budget: %.2f chars per token, %d descriptions trimmed",
+                        self.model.estimator.chars_per_token,
+                        self.budget.trimmed,
+                    )
+                if usage["aborted"]:
+                    logger.info(
+                        "Model output: %d generations aborted early for breaking "
+                        "the schema, after %.0f characters on average",
+                        usage["aborted"],
+                        usage["aborted_chars"] / usage["aborted"],
+                    )
+
+                stats = self.repairer.stats()
+                if stats["repaired"] or stats["failures"]:
+                    logger.info(
+                        "Output repair: %d of %d analyses repaired, saving %d model "
+                        "calls, fixes %s, unrepairable %s",
+                        stats["repaired"],
+                        stats["parsed"],
+                        stats["calls_saved"],
+                        stats["fixes"],
+                        stats["failures"],
+                    )
+
+                if self.normalizer is not None and self.normalizer.jobs:
+                    stats = self.normalizer.stats()
+                    logger.info(
+                        "Description normalizer: %d jobs, %d boilerplate paragraphs, "
+                        "%d chars (%.0f%%) and %.0f tokens per job removed",
+                        stats["jobs"],
+                        stats["paragraphs_removed"],
+                        stats["chars_removed"],
+                        stats["removed_share"] * 100,
+                        stats["avg_tokens_removed"],
+                    )
+
+                if self.limiter is not None:
+                    stats = self.limiter.stats()
+                    logger.info(
+                        "Model concurrency: limit %d (%d-%d), %d in flight, "
+                        "%d increases, %d decreases, %d timeouts, "
+                        "p95 latency %.1fs, %.2f requests/s",
+                        stats["limit"],
+                        stats["floor"],
+                        stats["ceiling"],
+                        stats["in_flight"],
+                        stats["increases"],
+                        stats["decreases"],
+                        stats["timeouts"],
+                        stats["p95_latency"],
+                        stats["throughput"],
+                    )
+
+                if self.batches:
+                    logger.info(
+                        "Batch analysis: %d batches, %.1f jobs per batch, "
+                        "%d jobs fell back to a single analysis",
+                        self.batches,
+                        self.batch_jobs / self.batches,
+                        self.batch_fallbacks,
+                    )
+
+                if self.cascade is not None and self.cascade.triaged:
+                    self._log_cascade_stats()
+
+                for url, stats in self.model.endpoint_stats().items():
+                    logger.info(
+                        "Model endpoint %s: %s, %d in flight, %d requests, %d errors, "
+                        "latency avg %.1fs, p95 %.1fs",
+                        url,
+                        "healthy" if stats["healthy"] else "ejected",
+                        stats["in_flight"],
+                        stats["requests"],
+                        stats["errors"],
+                        stats["avg_latency"],
+                        stats["p95_latency"],
+                    )
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error maintaining job queue: {e}", exc_info=True)
+
+    async def _run_retries(self):
+        """Put failed jobs back on the queue once their backoff has elapsed"""
+        try:
+            await self.retry_scheduler.run()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error scheduling job retries: {e}", exc_info=True)
+
+    def _log_cascade_stats(self) -> None:
+        """Log the escalation rate and the model seconds spent per triaged job"""
+        stats = self.cascade.stats()
+        triage_usage = self.cascade.model.usage()
+        analysis_usage = self.model.usage()
+        triage_seconds = (
+            triage_usage["prompt_eval_seconds"] + triage_usage["eval_seconds"]
+        )
+        analysis_seconds = (
+            analysis_usage["prompt_eval_seconds"] + analysis_usage["eval_seconds"]
+        )
+        logger.info(
+            "Cascade: %d triaged, %d rejected, %d accepted, %d escalated "
+            "(%.0f%%), %.1f model seconds per job",
+            stats["triaged"],
+            stats["reject"],
+            stats["accept"],
+            stats["escalate"],
+            stats["escalation_rate"] * 100,
+            (triage_seconds + analysis_seconds) / stats["triaged"],
+        )
+
+    async def _run_health_checks(self):
+        """Probe the model endpoints so failing hosts are ejected and re-admitted"""
+        try:
+            await self.model.run_health_checks()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error checking model endpoints: {e}", exc_info=True)
+
+    async def _join(self):
+        """Wait until every job is done and no retry is pending"""
+        while True:
+            await self.job_queue.join()
+            if self.retry_scheduler.pending() == 0:
+                return
+            await asyncio.sleep(1.0)
+
+    async def _open_session(self):
+        """Open the shared HTTP session of the event loop"""
+        open_session(self.config.get("http", {}))
+
     def _run_event_loop(self):
         """Run the event loop in the current thread"""
         self.loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self.loop)
+        self.job_queue.bind_loop(self.loop)
+
+        # One pooled HTTP session for the model and notification requests
+        self.loop.run_until_complete(self._open_session())
 
         try:
             # Create worker tasks
             workers = [
                 self.loop.create_task(self._worker()) for _ in range(self.worker_count)
             ]
+            workers.append(self.loop.create_task(self._maintain_queue()))
+            workers.append(self.loop.create_task(self._run_retries()))
+            workers.append(self.loop.create_task(self._run_health_checks()))
 
-            logger.info(f"Job processor started with {len(workers)} workers")
+            logger.info(f"Job processor started with {self.worker_count} workers")
             # Run until the thread is stopped
             self.loop.run_forever()
 
@@ -190,6 +1056,7 @@ class JobMatchProcessor:
                 asyncio.gather(*workers, return_exceptions=True)
             )
         finally:
+            self.loop.run_until_complete(close_session())
             self.loop.close()
             self.loop = None
 
@@ -226,9 +1093,7 @@ class JobMatchProcessor:
             return
 
         # Wait for the job queue to finish
-        future = asyncio.run_coroutine_threadsafe(
-            self.job_queue.queue.join(), self.loop
-        )
+        future = asyncio.run_coroutine_threadsafe(self._join(), self.loop)
         future.result()  # Blocks until the queue is done
 
     def get_queue(self) -> JobQueue:
@@ -267,7 +1132,7 @@ class JobMatchProcessor:
             "MARGINAL": 2,
             "COMPETITIVE": 3,
             "STRONG": 4,
-            "EXECELLENT": 5,
+            "EXCELLENT": 5,
             "POOR": 0,
             "MEDIOCRE": 2,
             "DECENT": 3,
@@ -326,5 +1191,11 @@ if __name__ == "__main__":
         "source": "linkedin_backend_sg:linkedin",
     }
 
-    processer = JobMatchProcessor(ConfigManager().config)
-    asyncio.run(processer.process_job(job))
+    async def main():
+        processer = JobMatchProcessor(ConfigManager().config)
+        try:
+            await processer.process_job(job)
+        finally:
+            await close_session()
+
+    asyncio.run(main())
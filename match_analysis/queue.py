@@ -3,8 +3,20 @@ Queue implementation for job processing
 """
 
 import asyncio
+import collections
+import concurrent.futures
+import contextlib
+import heapq
+import itertools
+import json
 import logging
-from typing import Dict, Any
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+from match_analysis.freshness import FreshnessPolicy
+from match_analysis.prescore import JobPreScorer
 
 # Configure logging
 logging.basicConfig(
@@ -15,48 +27,273 @@ logging.basicConfig(
 )
 logger = logging.getLogger("job_queue")
 
+# Key added to queued jobs holding their pre-score in priority mode
+PRIORITY_KEY = "_priority"
+
+# Key added to expired jobs that were moved behind the fresh jobs
+DEMOTED_KEY = "_demoted"
+
+
+def source_of(job: Dict[str, Any]) -> str:
+    """
+    Get the name of the scraper that found a job
+
+    Args:
+        job: Job data dictionary
+
+    Returns:
+        str: Scraper name, the part of the job source before the site name
+    """
+    return str(job.get("source") or "").split(":")[0]
+
+
+class _SourceStore(asyncio.Queue):
+    """
+    asyncio queue keeping one sub-queue per scraper
+
+    Within a source, jobs are returned highest pre-score first and in
+    insertion order among equal scores. Across sources, jobs are returned in
+    global order, or by deficit round-robin when weights are set so that a
+    source is served in proportion to its weight no matter how many jobs
+    other sources queued. Demoted jobs are only returned once every source
+    is empty.
+    """
+
+    def __init__(self, maxsize: int = 0, weights: Optional[Dict[str, float]] = None):
+        self.weights = weights
+        super().__init__(maxsize=maxsize)
+
+    def _init(self, maxsize):
+        self._queue = {}
+        self._size = 0
+        self._sequence = itertools.count()
+
+        # Sources with queued jobs in round-robin order and their deficits
+        self._active = collections.deque()
+        self._deficits = {}
+
+        # Demoted jobs in insertion order
+        self._demoted = collections.deque()
+
+        # Wait times of dequeued jobs per source
+        self.dequeued = collections.Counter()
+        self.waits = {}
+
+    def qsize(self):
+        return self._size
+
+    def empty(self):
+        return self._size == 0
+
+    def full(self):
+        # Demoted jobs were already admitted once and must not hold back new ones
+        if self.maxsize <= 0:
+            return False
+        return self._size - len(self._demoted) >= self.maxsize
+
+    def _put(self, job):
+        source = source_of(job)
+        if source not in self._queue:
+            self._queue[source] = []
+            self._active.append(source)
+            self._deficits[source] = 0.0
+
+        heapq.heappush(
+            self._queue[source],
+            (-job.get(PRIORITY_KEY, 0.0), next(self._sequence), time.time(), job),
+        )
+        self._size += 1
+
+    def _get(self):
+        if not self._queue:
+            self._size -= 1
+            return self._demoted.popleft()
+
+        source = self._next_source()
+        _, _, enqueued_at, job = heapq.heappop(self._queue[source])
+        self._size -= 1
+
+        if not self._queue[source]:
+            del self._queue[source]
+            del self._deficits[source]
+            self._active.remove(source)
+
+        self.dequeued[source] += 1
+        self.waits.setdefault(source, collections.deque(maxlen=1000)).append(
+            time.time() - enqueued_at
+        )
+        return job
+
+    def _next_source(self) -> str:
+        """Pick the source to serve next"""
+        if self.weights is None:
+            return min(self._queue, key=lambda source: self._queue[source][0][:2])
+
+        while True:
+            source = self._active[0]
+            if self._deficits[source] < 1:
+                self._deficits[source] += self.weights.get(source, 1.0)
+            if self._deficits[source] >= 1:
+                self._deficits[source] -= 1
+                # Move on once the source has used up its quantum
+                if self._deficits[source] < 1:
+                    self._active.rotate(-1)
+                return source
+            self._active.rotate(-1)
+
+    def demote(self, job: Dict[str, Any]) -> None:
+        """
+        Put a job retrieved with get back behind every other job
+
+        The job keeps its unfinished task and does not count against maxsize,
+        so demoting never blocks and demoted jobs never hold back producers.
+
+        Args:
+            job: The job to demote
+        """
+        self._demoted.append({**job, DEMOTED_KEY: True})
+        self._size += 1
+        self._wakeup_next(self._getters)
+
+    def depths(self) -> Dict[str, int]:
+        """Number of queued jobs per source"""
+        return {source: len(entries) for source, entries in self._queue.items()}
+
 
 class JobQueue:
     """
     Asynchronous queue for job processing
     """
 
-    def __init__(self, max_size: int = 100):
+    # Seconds put_many waits for the consumer event loop to start
+    CONSUMER_START_TIMEOUT = 60.0
+
+    def __init__(
+        self,
+        max_size: int = 100,
+        scorer: Optional[JobPreScorer] = None,
+        weights: Optional[Dict[str, float]] = None,
+        freshness: Optional[FreshnessPolicy] = None,
+    ):
         """
         Initialize job queue
 
         Args:
             max_size: Maximum queue size
+            scorer: Optional pre-scorer, jobs are dequeued highest score first when set
+            weights: Optional weights per scraper name, sources are served by
+                deficit round-robin in proportion to their weight when set,
+                unlisted sources have weight 1
+            freshness: Optional freshness budget, expired jobs are demoted or
+                dropped when they are dequeued
         """
-        self.queue = asyncio.Queue(maxsize=max_size)
+        if weights is not None and any(weight <= 0 for weight in weights.values()):
+            raise ValueError("Queue weights must be positive")
+
+        self.scorer = scorer
+        self.queue = _SourceStore(maxsize=max_size, weights=weights)
         self.running = False
 
-    def put_sync(self, job: Dict[str, Any]) -> None:
+        self.freshness = freshness
+        self.jobs_demoted = 0
+        self._expired = []
+
+        # Event loop of the consumer, set once it starts
+        self.loop = None
+        self._loop_ready = threading.Event()
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
         """
-        Synchronously add a job to the queue
+        Bind the queue to the event loop of its consumer
 
         Args:
-            job: Job data dictionary
+            loop: The consumer event loop
+        """
+        self.loop = loop
+        self._loop_ready.set()
+
+    def put_many(self, jobs: List[Dict[str, Any]]) -> None:
         """
+        Add a batch of jobs to the queue from any thread other than the consumer's
 
-        # Create a new event loop if needed
+        The batch is handed to the consumer event loop in a single
+        thread-safe call and this method blocks until every job is queued,
+        so a full queue applies backpressure instead of dropping jobs. If the
+        consumer does not start within CONSUMER_START_TIMEOUT seconds or
+        stops while the jobs wait, the jobs are handed to _undeliverable.
+
+        Args:
+            jobs: List of job data dictionaries
+
+        Raises:
+            RuntimeError: If the jobs cannot be queued
+        """
+        if not jobs:
+            return
+        self._check_not_consumer()
+        self._deliver(jobs)
+
+    def _check_not_consumer(self) -> None:
+        """Refuse blocking puts from the consumer loop, which would deadlock it"""
         try:
-            loop = asyncio.get_event_loop()
+            running_loop = asyncio.get_running_loop()
         except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            running_loop = None
+        if running_loop is not None and running_loop is self.loop:
+            raise RuntimeError("put_many would deadlock the consumer loop, use put")
 
-        try:
-            # Run the put operation using our async put method which handles logging
-            if loop.is_running():
-                future = asyncio.run_coroutine_threadsafe(self.put(job), loop)
-                # Wait for the result to ensure it completes
-                future.result(timeout=5)
-            else:
-                loop.run_until_complete(self.put(job))
+    def _deliver(self, jobs: List[Dict[str, Any]]) -> None:
+        """Hand jobs to the consumer loop and wait while it is running"""
+        # Wait for the consumer to start
+        if not self._loop_ready.wait(timeout=self.CONSUMER_START_TIMEOUT):
+            self._undeliverable(jobs, "the consumer did not start")
+            return
+        if not self.loop.is_running():
+            self._undeliverable(jobs, "the consumer is not running")
+            return
+
+        future = asyncio.run_coroutine_threadsafe(self._put_many(jobs), self.loop)
+        while True:
+            try:
+                future.result(timeout=1.0)
+                return
+            except concurrent.futures.TimeoutError:
+                if not self.loop.is_running():
+                    future.cancel()
+                    self._undeliverable(jobs, "the consumer stopped")
+                    return
+
+    def _undeliverable(self, jobs: List[Dict[str, Any]], reason: str) -> None:
+        """
+        Handle jobs that cannot be handed to the consumer
+
+        Args:
+            jobs: List of job data dictionaries
+            reason: Why the jobs cannot be queued
+
+        Raises:
+            RuntimeError: Always, the in-memory queue cannot keep the jobs
+        """
+        raise RuntimeError(f"Cannot queue {len(jobs)} jobs, {reason}")
+
+    def put_sync(self, job: Dict[str, Any]) -> None:
+        """
+        Synchronously add a job to the queue
+
+        Args:
+            job: Job data dictionary
+        """
+        self.put_many([job])
 
-        except Exception as e:
-            logger.error(f"Error adding job to queue: {e}", exc_info=True)
+    async def _put_many(self, jobs: List[Dict[str, Any]]) -> None:
+        """
+        Add a batch of jobs on the consumer event loop
+
+        Args:
+            jobs: List of job data dictionaries
+        """
+        for job in jobs:
+            await self.put(job)
 
     async def put(self, job: Dict[str, Any]) -> None:
         """
@@ -65,9 +302,116 @@ class JobQueue:
         Args:
             job: Job data dictionary
         """
-        await self.queue.put(job)
+        await self.queue.put(self._prioritize(job))
         logger.debug(f"Added job to queue: {job.get('title')} at {job.get('company')}")
 
+    def _prioritize(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Attach the pre-score to a job in priority mode
+
+        Args:
+            job: Job data dictionary
+
+        Returns:
+            Job data dictionary, with its pre-score if a scorer is set
+        """
+        if DEMOTED_KEY in job:
+            # Jobs put back on the queue are checked for freshness again
+            job = {key: value for key, value in job.items() if key != DEMOTED_KEY}
+        if self.scorer is None or PRIORITY_KEY in job:
+            return job
+        return {**job, PRIORITY_KEY: self.scorer.score(job)}
+
+    async def get(self) -> Dict[str, Any]:
+        """
+        Asynchronously remove and return a job from the queue
+
+        Jobs past their freshness budget are demoted behind the fresh jobs
+        while others are waiting, or dropped and kept for pop_expired.
+
+        Returns:
+            Job data dictionary
+        """
+        while True:
+            job = await self.queue.get()
+            if self.freshness is None or job.get(DEMOTED_KEY):
+                return job
+
+            try:
+                reason = self.freshness.expired(job)
+            except Exception as e:
+                # The job is already taken from the queue, never lose it
+                logger.warning(
+                    f"Freshness check of job {job.get('title')} failed, "
+                    f"treating it as fresh: {e}"
+                )
+                return job
+            if reason is None:
+                return job
+
+            if self.freshness.action == "demote":
+                # Only analyze stale jobs when there is nothing fresher to do
+                if self.queue.empty():
+                    return job
+                self.queue.demote(job)
+                self.jobs_demoted += 1
+                logger.info(f"Demoted job {job.get('title')}: {reason}")
+            else:
+                self._expired.append((job, reason))
+                self.task_done(job)
+                logger.info(f"Dropped job {job.get('title')}: {reason}")
+
+    def pop_expired(self) -> List[tuple]:
+        """
+        Get and clear the jobs dropped for exceeding their freshness budget
+
+        Returns:
+            list: (job, reason) pairs of the dropped jobs
+        """
+        expired, self._expired = self._expired, []
+        return expired
+
+    def task_done(self, job: Optional[Dict[str, Any]] = None, ack: bool = True) -> None:
+        """
+        Mark a job retrieved with get as done
+
+        Args:
+            job: The job that is done
+            ack: Whether the job is finished for good, False if it will be put back on the queue
+        """
+        self.queue.task_done()
+
+    def checkpoint(self, job: Dict[str, Any]) -> None:
+        """
+        Record the current state of a job retrieved with get, such as its
+        attempt count, so a restart replays the job as it is now
+
+        Args:
+            job: The job to record
+        """
+
+    async def join(self) -> None:
+        """Wait until every job put on the queue is done"""
+        await self.queue.join()
+
+    async def restore(self) -> int:
+        """
+        Restore jobs left over from a previous run
+
+        Returns:
+            int: Number of restored jobs
+        """
+        return 0
+
+    async def requeue_expired(self) -> int:
+        """
+        Redeliver in-flight jobs whose visibility timeout expired
+
+        Returns:
+            int: Number of redelivered jobs
+        """
+        return 0
+
     def empty(self) -> bool:
         """
         Check if the queue is empty
@@ -76,3 +420,377 @@ class JobQueue:
             True if the queue is empty, False otherwise
         """
         return self.queue.empty()
+
+    def qsize(self) -> int:
+        """
+        Get the number of jobs waiting in the queue
+
+        Returns:
+            int: Number of queued jobs
+        """
+        return self.queue.qsize()
+
+    def source_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get queue depth and wait time statistics per source, call from the consumer loop
+
+        Returns:
+            dict: Per scraper name, the number of queued and dequeued jobs and
+            the average, 95th percentile and maximum wait in seconds of the
+            last 1000 dequeued jobs
+        """
+        depths = self.queue.depths()
+        stats = {}
+        for source in sorted(set(depths) | set(self.queue.waits)):
+            waits = sorted(self.queue.waits.get(source, ()))
+            stats[source] = {
+                "depth": depths.get(source, 0),
+                "dequeued": self.queue.dequeued[source],
+                "avg_wait": sum(waits) / len(waits) if waits else 0.0,
+                "p95_wait": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                "max_wait": waits[-1] if waits else 0.0,
+            }
+        return stats
+
+
+class PersistentJobQueue(JobQueue):
+    """
+    Job queue backed by a SQLite file so queued jobs survive restarts
+
+    Jobs are written to the file before they are queued in memory and are
+    only deleted once acknowledged with task_done. Jobs taken by a worker are
+    leased for a visibility timeout; unacknowledged jobs are replayed on
+    startup and redelivered when their lease expires.
+    """
+
+    # Key added to queued jobs to track their row in the queue file
+    ID_KEY = "_queue_id"
+
+    def __init__(
+        self,
+        path: str = "job_queue.db",
+        max_size: int = 100,
+        visibility_timeout: float = 900,
+        scorer: Optional[JobPreScorer] = None,
+        weights: Optional[Dict[str, float]] = None,
+        freshness: Optional[FreshnessPolicy] = None,
+    ):
+        """
+        Initialize persistent job queue
+
+        Args:
+            path: Path to the SQLite queue file
+            max_size: Maximum in-memory queue size
+            visibility_timeout: Seconds a job taken by a worker stays leased before redelivery
+            scorer: Optional pre-scorer, jobs are dequeued highest score first when set
+            weights: Optional weights per scraper name for fair scheduling across sources
+            freshness: Optional freshness budget applied when jobs are dequeued
+        """
+        super().__init__(
+            max_size=max_size, scorer=scorer, weights=weights, freshness=freshness
+        )
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS job_queue (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        job TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        lease_until REAL,
+                        enqueued_at REAL NOT NULL
+                    )
+                    """
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_job_queue_status ON job_queue (status, lease_until)"
+                )
+                # Rows of a previous run; later rows are delivered by put itself
+                self._restore_max_id = conn.execute(
+                    "SELECT COALESCE(MAX(id), 0) FROM job_queue"
+                ).fetchone()[0]
+
+    def _connect(self):
+        """Open a new connection to the queue file"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    async def put(self, job: Dict[str, Any]) -> None:
+        """
+        Persist a job and add it to the queue
+
+        Args:
+            job: Job data dictionary
+        """
+        job = self._prioritize(job)
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                if self.ID_KEY in job:
+                    # Job is put back on the queue, keep its existing row
+                    conn.execute(
+                        "UPDATE job_queue SET job = ?, status = 'pending', lease_until = NULL "
+                        "WHERE id = ?",
+                        (json.dumps(job, default=str), job[self.ID_KEY]),
+                    )
+                else:
+                    cursor = conn.execute(
+                        "INSERT INTO job_queue (job, status, enqueued_at) VALUES (?, 'pending', ?)",
+                        (json.dumps(job, default=str), time.time()),
+                    )
+                    job = {**job, self.ID_KEY: cursor.lastrowid}
+
+        await super().put(job)
+
+    def put_many(self, jobs: List[Dict[str, Any]]) -> None:
+        """
+        Persist a batch of jobs in one transaction and add them to the queue
+
+        The jobs are written from the calling thread before they are handed
+        to the consumer, so they survive a consumer that is not running.
+
+        Args:
+            jobs: List of job data dictionaries
+        """
+        if not jobs:
+            return
+        self._check_not_consumer()
+
+        now = time.time()
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                queued = []
+                for job in map(self._prioritize, jobs):
+                    cursor = conn.execute(
+                        "INSERT INTO job_queue (job, status, enqueued_at) VALUES (?, 'pending', ?)",
+                        (json.dumps(job, default=str), now),
+                    )
+                    queued.append({**job, self.ID_KEY: cursor.lastrowid})
+
+        self._deliver(queued)
+
+    async def _put_many(self, jobs: List[Dict[str, Any]]) -> None:
+        """
+        Add a batch of persisted jobs to the queue
+
+        Args:
+            jobs: List of job data dictionaries with their row ID
+        """
+        for job in jobs:
+            await JobQueue.put(self, job)
+
+    def _undeliverable(self, jobs: List[Dict[str, Any]], reason: str) -> None:
+        """Keep jobs that cannot be handed to the consumer in the queue file"""
+        logger.warning(
+            f"Cannot queue {len(jobs)} jobs, {reason}; they stay in {self.path} "
+            "and are restored on the next start"
+        )
+
+    async def get(self) -> Dict[str, Any]:
+        """
+        Remove and return a job from the queue, leasing it until it is acknowledged
+
+        Returns:
+            Job data dictionary
+        """
+        job = await super().get()
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                conn.execute(
+                    "UPDATE job_queue SET status = 'in_flight', lease_until = ? WHERE id = ?",
+                    (time.time() + self.visibility_timeout, job[self.ID_KEY]),
+                )
+        return job
+
+    def task_done(self, job: Optional[Dict[str, Any]] = None, ack: bool = True) -> None:
+        """
+        Mark a job retrieved with get as done, deleting it from the queue file when acknowledged
+
+        Unacknowledged jobs are kept as waiting so their lease does not expire
+        while they are scheduled for a retry; they are replayed on restart.
+
+        Args:
+            job: The job that is done
+            ack: Whether the job is finished for good, False if it will be put back on the queue
+        """
+        if job is not None and self.ID_KEY in job:
+            with contextlib.closing(self._connect()) as conn:
+                with conn:
+                    if ack:
+                        conn.execute(
+                            "DELETE FROM job_queue WHERE id = ?", (job[self.ID_KEY],)
+                        )
+                    else:
+                        conn.execute(
+                            "UPDATE job_queue SET status = 'waiting', lease_until = NULL "
+                            "WHERE id = ? AND status = 'in_flight'",
+                            (job[self.ID_KEY],),
+                        )
+        super().task_done(job, ack)
+
+    def checkpoint(self, job: Dict[str, Any]) -> None:
+        """
+        Record the current state of a job retrieved with get, such as its
+        attempt count, so a restart replays the job as it is now
+
+        Args:
+            job: The job to record
+        """
+        if self.ID_KEY not in job:
+            return
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                conn.execute(
+                    "UPDATE job_queue SET job = ? WHERE id = ?",
+                    (json.dumps(job, default=str), job[self.ID_KEY]),
+                )
+
+    def persist(self, jobs: List[Dict[str, Any]]) -> None:
+        """
+        Write jobs to the queue file without queuing them in memory
+
+        The jobs are picked up by restore on the next start, which makes this
+        usable while no consumer is running.
+
+        Args:
+            jobs: List of job data dictionaries
+        """
+        now = time.time()
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO job_queue (job, status, enqueued_at) VALUES (?, 'pending', ?)",
+                    [
+                        (
+                            json.dumps(
+                                {k: v for k, v in job.items() if k != self.ID_KEY},
+                                default=str,
+                            ),
+                            now,
+                        )
+                        for job in jobs
+                    ],
+                )
+
+    async def _enqueue_rows(self, rows) -> int:
+        """Queue persisted rows in memory without writing them again"""
+        for row_id, job in rows:
+            job = json.loads(job)
+            job[self.ID_KEY] = row_id
+            await self.queue.put(self._prioritize(job))
+        return len(rows)
+
+    async def restore(self) -> int:
+        """
+        Replay every unacknowledged job from a previous run
+
+        Only rows that existed when the queue was opened are replayed, jobs
+        put since then were already delivered. The replay happens once.
+
+        Returns:
+            int: Number of restored jobs
+        """
+        max_id, self._restore_max_id = self._restore_max_id, 0
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                conn.execute(
+                    "UPDATE job_queue SET status = 'pending', lease_until = NULL "
+                    "WHERE id <= ?",
+                    (max_id,),
+                )
+                rows = conn.execute(
+                    "SELECT id, job FROM job_queue WHERE id <= ? ORDER BY id",
+                    (max_id,),
+                ).fetchall()
+
+        if rows:
+            logger.info(f"Restoring {len(rows)} unacknowledged jobs from {self.path}")
+        return await self._enqueue_rows(rows)
+
+    async def requeue_expired(self) -> int:
+        """
+        Redeliver in-flight jobs whose visibility timeout expired
+
+        Returns:
+            int: Number of redelivered jobs
+        """
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                rows = conn.execute(
+                    "SELECT id, job FROM job_queue WHERE status = 'in_flight' AND lease_until < ?",
+                    (time.time(),),
+                ).fetchall()
+                conn.executemany(
+                    "UPDATE job_queue SET status = 'pending', lease_until = NULL WHERE id = ?",
+                    [(row_id,) for row_id, _ in rows],
+                )
+
+        if rows:
+            logger.warning(f"Redelivering {len(rows)} jobs with expired leases")
+        return await self._enqueue_rows(rows)
+
+
+def create_job_queue(
+    config: Dict[str, Any], scrapers: Optional[List[Dict[str, Any]]] = None
+) -> JobQueue:
+    """
+    Create the job queue selected in the queue configuration
+
+    Args:
+        config: The match analysis configuration
+        scrapers: The scraper configurations, read for their queue_weight in fair mode
+
+    Returns:
+        JobQueue: The job queue
+    """
+    queue_config = config.get("queue", {})
+    max_size = queue_config.get("max_size", 100)
+
+    # Share the queue fairly between scrapers so a broad search cannot starve the others
+    weights = None
+    if queue_config.get("fair", False):
+        weights = {
+            scraper["name"]: scraper.get("queue_weight", 1.0)
+            for scraper in scrapers or []
+            if "name" in scraper
+        }
+
+    # Pre-score jobs so the most promising ones are analyzed first
+    scorer = None
+    if queue_config.get("priority", False):
+        prescore_config = queue_config.get("prescore", {})
+        scorer = JobPreScorer(
+            config["resume_path"],
+            keyword_weight=prescore_config.get("keyword_weight", 0.5),
+            title_weight=prescore_config.get("title_weight", 0.3),
+            recency_weight=prescore_config.get("recency_weight", 0.2),
+            recency_half_life_days=prescore_config.get("recency_half_life_days", 3.0),
+        )
+
+    # Demote or drop jobs that waited past their freshness budget
+    freshness = None
+    freshness_config = queue_config.get("freshness", {})
+    if freshness_config.get("enabled", False):
+        freshness = FreshnessPolicy(
+            max_queue_hours=freshness_config.get("max_queue_hours"),
+            max_posting_age_days=freshness_config.get("max_posting_age_days"),
+            action=freshness_config.get("action", "demote"),
+        )
+
+    if queue_config.get("persistent", False):
+        return PersistentJobQueue(
+            path=queue_config.get("path", "job_queue.db"),
+            max_size=max_size,
+            visibility_timeout=queue_config.get("visibility_timeout", 900),
+            scorer=scorer,
+            weights=weights,
+            freshness=freshness,
+        )
+
+    return JobQueue(
+        max_size=max_size, scorer=scorer, weights=weights, freshness=freshness
+    )
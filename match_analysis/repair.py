@@ -0,0 +1,474 @@
+"""
+Local repair of malformed model output, so a generation that is almost
+right is used instead of being thrown away for another model call
+"""
+
+import collections
+import difflib
+import json
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+from match_analysis.schema import RATINGS
+
+# Alternative names models use for the fields the processor reads
+FIELD_ALIASES = {
+    "overallmatch": "overall_match",
+    "overall": "overall_match",
+    "match": "overall_match",
+    "verdict": "overall_match",
+    "roleanalysis": "analysis",
+    "jobanalysis": "analysis",
+    "rolesummary": "role_summary",
+    "summaryofrole": "role_summary",
+    "roledescription": "role_summary",
+    "jobsummary": "role_summary",
+    "rolerequirements": "role_requirements",
+    "rolerequirement": "role_requirements",
+    "requirements": "role_requirements",
+    "keyrequirements": "role_requirements",
+    "jobrequirements": "role_requirements",
+    "matchrating": "rating",
+    "overallrating": "rating",
+    "matchscore": "score",
+    "overallscore": "score",
+    "justification": "summary",
+    "matchsummary": "summary",
+    "thinking": "thinking_process",
+    "thinkingprocess": "thinking_process",
+    "reasoning": "thinking_process",
+    "jobid": "job_id",
+    "id": "job_id",
+}
+
+# Ratings of older prompts and common misspellings
+RATING_ALIASES = {
+    "EXECELLENT": "EXCELLENT",
+    "EXCELENT": "EXCELLENT",
+    "EXCELLANT": "EXCELLENT",
+    "EXCELLENT MATCH": "EXCELLENT",
+    "VERY GOOD": "GOOD",
+    "STRONG": "GOOD",
+    "COMPETITIVE": "DECENT",
+    "MARGINAL": "MEDIOCRE",
+    "UNLIKELY": "POOR",
+    "FAIR": "DECENT",
+    "AVERAGE": "DECENT",
+    "MODERATE": "DECENT",
+    "WEAK": "MEDIOCRE",
+    "BAD": "POOR",
+    "NONE": "POOR",
+}
+
+# Lowest score of each rating, as in the prompts' score bands
+RATING_FLOORS = [("EXCELLENT", 81), ("GOOD", 61), ("DECENT", 41), ("MEDIOCRE", 21)]
+
+# Score given to a rating when the model left out the score
+RATING_SCORES = {
+    "POOR": 10,
+    "MEDIOCRE": 30,
+    "DECENT": 50,
+    "GOOD": 70,
+    "EXCELLENT": 90,
+}
+
+CODE_FENCE = re.compile(r"^\s*```[a-zA-Z]*\s*|\s*```\s*$")
+
+
+class RepairError(ValueError):
+    """The model output cannot be repaired and the model has to be asked again"""
+
+    def __init__(self, failure: str, message: str):
+        """
+        Initialize the error
+
+        Args:
+            failure: Failure class, e.g. 'unparseable' or 'missing_rating'
+            message: Description of the failure
+        """
+        super().__init__(message)
+        self.failure = failure
+
+
+def _scan(text: str) -> Tuple[str, List[str], List[str]]:
+    """
+    Walk JSON text outside of strings, dropping comments and trailing commas
+
+    Args:
+        text: JSON text
+
+    Returns:
+        tuple: (cleaned text, open containers, fixes applied); the text ends
+            inside a string if an odd number of quotes was left open
+    """
+    out = []
+    stack = []
+    fixes = []
+    in_string = False
+    escape = False
+    idx = 0
+    while idx < len(text):
+        char = text[idx]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            elif char == "\n":
+                # Raw newlines are not allowed in JSON strings
+                char = "\\n"
+                fixes.append("raw_newline")
+            out.append(char)
+            idx += 1
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char == "/" and text.startswith("//", idx):
+            end = text.find("\n", idx)
+            idx = len(text) if end == -1 else end
+            fixes.append("comment")
+            continue
+        elif char in "{[":
+            stack.append(char)
+        elif char in "}]":
+            # Drop a comma right before the closing bracket
+            last = len(out) - 1
+            while last >= 0 and out[last] in " \t\r\n":
+                last -= 1
+            if last >= 0 and out[last] == ",":
+                del out[last]
+                fixes.append("trailing_comma")
+            if stack:
+                stack.pop()
+        out.append(char)
+        idx += 1
+
+    if in_string:
+        out.append('"')
+        fixes.append("unterminated_string")
+    return "".join(out), stack, fixes
+
+
+def repair_json(text: str) -> Tuple[Any, List[str]]:
+    """
+    Parse JSON produced by a model, fixing the usual defects
+
+    Code fences and text around the JSON value, comments, trailing commas,
+    unterminated strings and unclosed containers of truncated output are
+    repaired.
+
+    Args:
+        text: The model output
+
+    Returns:
+        tuple: (parsed value, names of the fixes applied)
+
+    Raises:
+        RepairError: If the output is not JSON even after the repairs
+    """
+    try:
+        return json.loads(text), []
+    except (json.JSONDecodeError, TypeError):
+        pass
+    if not isinstance(text, str):
+        raise RepairError("unparseable", "Model output is not text")
+
+    fixes = []
+    stripped = CODE_FENCE.sub("", text)
+    if stripped != text:
+        fixes.append("code_fence")
+
+    # Drop any text before the JSON value
+    start = min(
+        (idx for idx in (stripped.find("{"), stripped.find("[")) if idx != -1),
+        default=-1,
+    )
+    if start == -1:
+        raise RepairError("unparseable", "Model output contains no JSON value")
+    if stripped[:start].strip():
+        fixes.append("preamble")
+    stripped = stripped[start:]
+
+    cleaned, stack, scan_fixes = _scan(stripped)
+    fixes.extend(scan_fixes)
+    if stack:
+        # Close what truncated output left open, dropping a dangling key or comma
+        cleaned = re.sub(r'(,\s*"[^"]*"\s*:?\s*|,\s*|:\s*)$', "", cleaned.rstrip())
+        cleaned = re.sub(r"(\{\s*\"[^\"]*\"\s*:?)$", "{", cleaned)
+        cleaned += "".join("}" if char == "{" else "]" for char in reversed(stack))
+        cleaned = _scan(cleaned)[0]
+        fixes.append("truncated")
+
+    try:
+        value, end = json.JSONDecoder().raw_decode(cleaned)
+    except json.JSONDecodeError as exc:
+        raise RepairError("unparseable", f"Model output is not JSON: {exc}") from exc
+    if cleaned[end:].strip():
+        fixes.append("trailing_text")
+    return value, fixes
+
+
+def normalize_key(key: str) -> str:
+    """
+    Map a field name to the name the processor reads
+
+    Args:
+        key: Field name from the model output
+
+    Returns:
+        str: The canonical field name, or the key itself if it is not an alias
+    """
+    compact = re.sub(r"[^a-z]", "", str(key).lower())
+    return FIELD_ALIASES.get(compact, key)
+
+
+def normalize_rating(rating: Any) -> Optional[str]:
+    """
+    Map a rating to one of RATINGS
+
+    Args:
+        rating: Rating from the model output
+
+    Returns:
+        str: The rating, None if it matches none of the ratings
+    """
+    if not isinstance(rating, str):
+        return None
+    rating = " ".join(rating.upper().replace("_", " ").split())
+    if rating in RATINGS:
+        return rating
+    if rating in RATING_ALIASES:
+        return RATING_ALIASES[rating]
+    close = difflib.get_close_matches(rating, RATINGS, n=1, cutoff=0.75)
+    return close[0] if close else None
+
+
+def rating_for_score(score: float) -> str:
+    """
+    Get the rating of a score from the prompts' score bands
+
+    Args:
+        score: Score from 0 to 100
+
+    Returns:
+        str: The rating
+    """
+    for rating, floor in RATING_FLOORS:
+        if score >= floor:
+            return rating
+    return "POOR"
+
+
+def _parse_score(score: Any) -> Optional[float]:
+    """Read a score given as a number or as text such as '75/100' or '75%'"""
+    if isinstance(score, bool):
+        return None
+    if isinstance(score, (int, float)):
+        return float(score)
+    if isinstance(score, str):
+        match = re.search(r"-?\d+(\.\d+)?", score)
+        if match:
+            return float(match.group())
+    return None
+
+
+def _text(value: Any) -> Optional[str]:
+    """Flatten a field given as a list or object into text"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return ", ".join(str(item) for item in value)
+    return json.dumps(value)
+
+
+def _rename(value: Dict[str, Any], fixes: List[str]) -> Dict[str, Any]:
+    """Rename aliased keys of an object, keeping canonical keys on conflicts"""
+    renamed = {}
+    for key, item in value.items():
+        canonical = normalize_key(key)
+        if canonical != key:
+            fixes.append("alias")
+            if canonical in value:
+                continue
+        renamed[canonical] = item
+    return renamed
+
+
+class AnalysisRepairer:
+    """
+    Parses and repairs analyses, counting the repairs and the failure classes
+    that still need the model to be asked again
+    """
+
+    def __init__(self):
+        """Initialize the counters"""
+        self.parsed = 0
+        self.repaired = 0
+        self.fixes = collections.Counter()
+        self.failures = collections.Counter()
+
+    def parse(self, text: str) -> Dict[str, Any]:
+        """
+        Parse and repair an analysis
+
+        Args:
+            text: The model output
+
+        Returns:
+            dict: The analysis with analysis.role_summary,
+                analysis.role_requirements and overall_match rating, score and
+                summary
+
+        Raises:
+            RepairError: If the rating and score are both absent or the output
+                is not JSON
+        """
+        try:
+            value, fixes = repair_json(text)
+            analysis = self.normalize(value, fixes)
+        except RepairError as exc:
+            self.failures[exc.failure] += 1
+            raise
+
+        self._count(fixes)
+        return analysis
+
+    def parse_batch(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Parse and repair the analyses of a batch output
+
+        Args:
+            text: The model output
+
+        Returns:
+            list: The analyses with their job_id, entries that cannot be
+                repaired are left out
+
+        Raises:
+            RepairError: If the output is not JSON
+        """
+        try:
+            value, fixes = repair_json(text)
+        except RepairError as exc:
+            self.failures[exc.failure] += 1
+            raise
+        if isinstance(value, dict):
+            lists = [item for item in value.values() if isinstance(item, list)]
+            if "results" in value:
+                value = value["results"]
+            elif len(lists) == 1:
+                # Results array under another name
+                value = lists[0]
+                fixes.append("alias")
+        if not isinstance(value, list):
+            self.failures["unparseable"] += 1
+            raise RepairError("unparseable", "Batch output has no results array")
+
+        analyses = []
+        for entry in value:
+            entry_fixes = list(fixes)
+            try:
+                analysis = self.normalize(entry, entry_fixes)
+            except RepairError as exc:
+                self.failures[exc.failure] += 1
+                continue
+            self._count(entry_fixes)
+            analyses.append(analysis)
+        return analyses
+
+    def _count(self, fixes: List[str]) -> None:
+        """Count a parsed output and its fixes"""
+        self.parsed += 1
+        if fixes:
+            self.repaired += 1
+            self.fixes.update(set(fixes))
+
+    def normalize(self, value: Any, fixes: List[str]) -> Dict[str, Any]:
+        """
+        Bring a parsed analysis into the shape the processor reads
+
+        Args:
+            value: The parsed model output
+            fixes: List the applied fixes are appended to
+
+        Returns:
+            dict: The normalized analysis
+
+        Raises:
+            RepairError: If the rating and score are both absent
+        """
+        if isinstance(value, list) and len(value) == 1:
+            value = value[0]
+            fixes.append("wrapped")
+        if not isinstance(value, dict):
+            raise RepairError("unparseable", "Model output is not a JSON object")
+
+        value = _rename(value, fixes)
+        analysis = value.get("analysis")
+        analysis = _rename(analysis, fixes) if isinstance(analysis, dict) else {}
+        match = value.get("overall_match")
+        match = _rename(match, fixes) if isinstance(match, dict) else {}
+
+        # Fields the model put at the top level instead of their section
+        for key in ("role_summary", "role_requirements"):
+            if key not in analysis and key in value:
+                analysis[key] = value[key]
+                fixes.append("misplaced")
+        for key in ("rating", "score", "summary"):
+            if key not in match and key in value:
+                match[key] = value[key]
+                fixes.append("misplaced")
+
+        rating = normalize_rating(match.get("rating"))
+        score = _parse_score(match.get("score"))
+        if rating is None and score is None:
+            raise RepairError("missing_rating", "Analysis has no rating or score")
+        if rating != match.get("rating"):
+            fixes.append("rating")
+        if score is None:
+            score = RATING_SCORES[rating]
+            fixes.append("score")
+        elif score != match.get("score"):
+            fixes.append("score")
+        if rating is None:
+            rating = rating_for_score(score)
+        if isinstance(score, float) and score.is_integer():
+            score = int(score)
+
+        for section, key, default in (
+            (analysis, "role_summary", "Not provided"),
+            (analysis, "role_requirements", "Not provided"),
+            (match, "summary", ""),
+        ):
+            text = _text(section.get(key))
+            if text is None:
+                fixes.append("filled")
+                text = default
+            elif text != section.get(key):
+                fixes.append("flattened")
+            section[key] = text
+
+        match["rating"] = rating
+        match["score"] = score
+        return {**value, "analysis": analysis, "overall_match": match}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the repair statistics
+
+        Returns:
+            dict: Parsed and repaired outputs, the model calls saved, the
+                fixes by kind and the failures by class
+        """
+        return {
+            "parsed": self.parsed,
+            "repaired": self.repaired,
+            "calls_saved": self.repaired,
+            "fixes": dict(self.fixes),
+            "failures": dict(self.failures),
+        }
@@ -0,0 +1,138 @@
+"""
+Persistent record of the decision made for every analyzed job
+"""
+
+import contextlib
+import sqlite3
+import time
+from typing import Dict, Any, List, Optional
+
+
+class ResultStore:
+    """
+    SQLite store of job decisions: which stage decided a job, whether it was
+    rejected and the scores that led to the decision
+    """
+
+    def __init__(self, path: str = "analysis_results.db"):
+        """
+        Initialize the result store
+
+        Args:
+            path: Path to the SQLite result file
+        """
+        self.path = path
+
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS analysis_results (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        job_url TEXT,
+                        title TEXT,
+                        company TEXT,
+                        source TEXT,
+                        stage TEXT NOT NULL,
+                        rejected INTEGER NOT NULL,
+                        similarity REAL,
+                        rating TEXT,
+                        created_at REAL NOT NULL
+                    )
+                    """
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_analysis_results_job_url "
+                    "ON analysis_results (job_url)"
+                )
+
+    def _connect(self):
+        """Open a new connection to the result file"""
+        return sqlite3.connect(self.path, timeout=30)
+
+    def add(
+        self,
+        job: Dict[str, Any],
+        stage: str,
+        rejected: bool,
+        similarity: Optional[float] = None,
+        rating: Optional[str] = None,
+    ) -> None:
+        """
+        Record the decision for a job
+
+        Args:
+            job: Job data dictionary
+            stage: Stage that decided the job, e.g. 'prefilter' or 'analysis'
+            rejected: Whether the job was rejected
+            similarity: Embedding similarity of the job to the resume, if computed
+            rating: Rating given by the model, if analyzed
+        """
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                conn.execute(
+                    "INSERT INTO analysis_results (job_url, title, company, source, stage, "
+                    "rejected, similarity, rating, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        job.get("job_url"),
+                        job.get("title"),
+                        job.get("company"),
+                        job.get("source"),
+                        stage,
+                        int(rejected),
+                        similarity,
+                        rating,
+                        time.time(),
+                    ),
+                )
+
+    def list(
+        self, stage: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List recorded decisions, newest first
+
+        Args:
+            stage: Only list decisions of this stage
+            limit: Maximum number of entries to return
+
+        Returns:
+            list: Recorded decisions
+        """
+        query = (
+            "SELECT job_url, title, company, source, stage, rejected, similarity, "
+            "rating, created_at FROM analysis_results"
+        )
+        params = []
+        if stage is not None:
+            query += " WHERE stage = ?"
+            params.append(stage)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit if limit is not None else -1)
+
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                conn.row_factory = sqlite3.Row
+                rows = conn.execute(query, params).fetchall()
+
+        return [{**dict(row), "rejected": bool(row["rejected"])} for row in rows]
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        Count decisions per stage
+
+        Returns:
+            dict: Per stage, the number of decided and rejected jobs
+        """
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                rows = conn.execute(
+                    "SELECT stage, COUNT(*), SUM(rejected) FROM analysis_results GROUP BY stage"
+                ).fetchall()
+
+        return {
+            stage: {"decided": decided, "rejected": rejected or 0}
+            for stage, decided, rejected in rows
+        }
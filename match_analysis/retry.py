@@ -0,0 +1,311 @@
+"""
+Delayed retries and dead-letter storage for failed job analyses
+"""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import json
+import logging
+import random
+import sqlite3
+import time
+from typing import Dict, Any, List, Optional
+
+from match_analysis.queue import JobQueue
+
+# Configure logging
+logging.basicConfig(
+    filename="job_scraper.log",
+    filemode="a",
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("job_retry")
+
+# Key added to jobs counting their failed analysis attempts
+ATTEMPTS_KEY = "_attempts"
+
+
+class DeadLetterStore:
+    """
+    SQLite store of jobs that exhausted their analysis attempts
+    """
+
+    def __init__(self, path: str = "dead_letters.db"):
+        """
+        Initialize the dead-letter store
+
+        Args:
+            path: Path to the SQLite dead-letter file
+        """
+        self.path = path
+
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS dead_letters (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        job TEXT NOT NULL,
+                        error TEXT NOT NULL,
+                        attempts INTEGER NOT NULL,
+                        created_at REAL NOT NULL
+                    )
+                    """
+                )
+
+    def _connect(self):
+        """Open a new connection to the dead-letter file"""
+        return sqlite3.connect(self.path, timeout=30)
+
+    def add(self, job: Dict[str, Any], error: str, attempts: int) -> None:
+        """
+        Store a failed job
+
+        Args:
+            job: Job data dictionary
+            error: Description of the last error
+            attempts: Number of failed attempts
+        """
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                conn.execute(
+                    "INSERT INTO dead_letters (job, error, attempts, created_at) VALUES (?, ?, ?, ?)",
+                    (json.dumps(job, default=str), error, attempts, time.time()),
+                )
+
+    def list(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        List the stored jobs, oldest first
+
+        Args:
+            limit: Maximum number of entries to return
+
+        Returns:
+            list: Entries with id, job, error, attempts and created_at
+        """
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                rows = conn.execute(
+                    "SELECT id, job, error, attempts, created_at FROM dead_letters "
+                    "ORDER BY id LIMIT ?",
+                    (limit if limit is not None else -1,),
+                ).fetchall()
+
+        return [
+            {
+                "id": row_id,
+                "job": json.loads(job),
+                "error": error,
+                "attempts": attempts,
+                "created_at": created_at,
+            }
+            for row_id, job, error, attempts, created_at in rows
+        ]
+
+    def pop(self, ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Remove jobs from the store for replay
+
+        Args:
+            ids: Entry ids to remove, all entries if None
+
+        Returns:
+            list: The removed jobs with their attempt counters reset
+        """
+        entries = self.list()
+        if ids is not None:
+            entries = [entry for entry in entries if entry["id"] in ids]
+
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                conn.executemany(
+                    "DELETE FROM dead_letters WHERE id = ?",
+                    [(entry["id"],) for entry in entries],
+                )
+
+        jobs = []
+        for entry in entries:
+            job = entry["job"]
+            job.pop(ATTEMPTS_KEY, None)
+            jobs.append(job)
+        return jobs
+
+    def count(self) -> int:
+        """
+        Count the stored jobs
+
+        Returns:
+            int: Number of dead-lettered jobs
+        """
+        with contextlib.closing(self._connect()) as conn:
+            with conn:
+                return conn.execute("SELECT COUNT(*) FROM dead_letters").fetchone()[0]
+
+
+class RetryScheduler:
+    """
+    Puts failed jobs back on the queue after an exponential backoff with
+    jitter, without holding a worker while waiting. Jobs that exceed the
+    maximum number of attempts are moved to the dead-letter store.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        dead_letters: DeadLetterStore,
+        max_attempts: int = 5,
+        base_delay: float = 3.0,
+        max_delay: float = 600.0,
+        jitter: float = 0.5,
+    ):
+        """
+        Initialize the retry scheduler
+
+        Args:
+            queue: Queue to put retried jobs back on
+            dead_letters: Store for jobs that exhausted their attempts
+            max_attempts: Maximum number of analysis attempts per job
+            base_delay: Delay in seconds before the first retry, doubled for every further retry
+            max_delay: Upper bound of the delay in seconds
+            jitter: Fraction of the delay that is randomized
+        """
+        self.queue = queue
+        self.dead_letters = dead_letters
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+        self._heap = []
+        self._sequence = itertools.count()
+        self._putting = 0
+        self._wakeup = asyncio.Event()
+
+    def backoff(self, attempts: int) -> float:
+        """
+        Compute the delay before the next attempt
+
+        Args:
+            attempts: Number of failed attempts so far
+
+        Returns:
+            float: Delay in seconds
+        """
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay * (1 - self.jitter * random.random())
+
+    def schedule(self, job: Dict[str, Any], error: Exception) -> bool:
+        """
+        Schedule a failed job for a retry or move it to the dead-letter store
+
+        Args:
+            job: The failed job
+            error: The error of the failed attempt
+
+        Returns:
+            bool: True if a retry was scheduled, False if the job was dead-lettered
+        """
+        attempts = job.get(ATTEMPTS_KEY, 0) + 1
+        job = {**job, ATTEMPTS_KEY: attempts}
+
+        if attempts >= self.max_attempts:
+            self.dead_letters.add(job, repr(error), attempts)
+            logger.error(
+                "Job %s failed %d times, moved to dead-letter store: %s",
+                job.get("title"),
+                attempts,
+                error,
+            )
+            return False
+
+        # Keep the attempt count if the process exits before the retry
+        self.queue.checkpoint(job)
+
+        delay = self.backoff(attempts)
+        heapq.heappush(
+            self._heap, (time.monotonic() + delay, next(self._sequence), job)
+        )
+        self._wakeup.set()
+        logger.info(
+            "Retrying job %s in %.1f seconds (attempt %d of %d)",
+            job.get("title"),
+            delay,
+            attempts + 1,
+            self.max_attempts,
+        )
+        return True
+
+    def pending(self) -> int:
+        """
+        Count the jobs waiting for a retry
+
+        Returns:
+            int: Number of scheduled retries
+        """
+        return len(self._heap) + self._putting
+
+    async def run(self) -> None:
+        """Put due jobs back on the queue until cancelled"""
+        while True:
+            self._wakeup.clear()
+
+            timeout = None
+            if self._heap:
+                timeout = self._heap[0][0] - time.monotonic()
+
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, job = heapq.heappop(self._heap)
+            self._putting += 1
+            try:
+                await self.queue.put(job)
+            finally:
+                self._putting -= 1
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from configuration import ConfigManager
+    from match_analysis.queue import PersistentJobQueue
+
+    parser = argparse.ArgumentParser(
+        description="Inspect and replay dead-lettered jobs"
+    )
+    parser.add_argument("command", choices=["list", "replay"])
+    parser.add_argument(
+        "--config", default="config.yaml", help="Path to configuration file"
+    )
+    parser.add_argument("--id", type=int, action="append", help="Entry id to replay")
+    args = parser.parse_args()
+
+    config = ConfigManager(args.config).config["match_analysis"]
+    store = DeadLetterStore(
+        config.get("dead_letter", {}).get("path", "dead_letters.db")
+    )
+
+    if args.command == "list":
+        for entry in store.list():
+            print(
+                f"{entry['id']}: {entry['job'].get('title')} at {entry['job'].get('company')} "
+                f"({entry['attempts']} attempts): {entry['error']}"
+            )
+    else:
+        queue_config = config.get("queue", {})
+        if not queue_config.get("persistent", False):
+            raise SystemExit("Replay requires the persistent queue to be enabled")
+
+        # Jobs are written to the queue file and picked up on the next start
+        queue = PersistentJobQueue(path=queue_config.get("path", "job_queue.db"))
+        jobs = store.pop(args.id)
+        queue.persist(jobs)
+        print(f"Replayed {len(jobs)} jobs into {queue.path}")
@@ -0,0 +1,341 @@
+"""
+JSON schemas of the model outputs and a streaming validator that checks
+the output while it is generated
+"""
+
+import json
+from typing import Dict, Any, List, Optional
+
+# Ratings the prompts ask for
+RATINGS = ["POOR", "MEDIOCRE", "DECENT", "GOOD", "EXCELLENT"]
+
+OVERALL_MATCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "rating": {"type": "string", "enum": RATINGS},
+        "score": {"type": "number", "minimum": 0, "maximum": 100},
+        "summary": {"type": "string"},
+    },
+    "required": ["rating", "score", "summary"],
+}
+
+# Output of the analysis prompts; the reasoning is required so the model
+# writes it before the verdict
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "thinking_process": {"type": "array", "items": {"type": "string"}},
+        "analysis": {
+            "type": "object",
+            "properties": {
+                "role_summary": {"type": "string"},
+                "role_requirements": {"type": "string"},
+                "interest_match": {"type": "object"},
+                "skills_match": {"type": "object"},
+                "experience_match": {"type": "object"},
+                "requirements_fulfillment": {"type": "object"},
+            },
+            "required": ["role_summary", "role_requirements"],
+        },
+        "overall_match": OVERALL_MATCH_SCHEMA,
+    },
+    "required": ["thinking_process", "analysis", "overall_match"],
+}
+
+# Output of the batch prompt
+BATCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "job_id": {"type": "string"},
+                    "analysis": {
+                        "type": "object",
+                        "properties": {
+                            "role_summary": {"type": "string"},
+                            "role_requirements": {"type": "string"},
+                        },
+                        "required": ["role_summary", "role_requirements"],
+                    },
+                    "overall_match": OVERALL_MATCH_SCHEMA,
+                },
+                "required": ["job_id", "analysis", "overall_match"],
+            },
+        }
+    },
+    "required": ["results"],
+}
+
+# Output of the triage prompt
+TRIAGE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "rating": {"type": "string", "enum": RATINGS},
+        "score": {"type": "number", "minimum": 0, "maximum": 100},
+        "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+        "summary": {"type": "string"},
+    },
+    "required": ["rating", "score", "confidence", "summary"],
+}
+
+# Python types of the JSON schema types
+JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "number": (int, float),
+    "integer": int,
+    "boolean": bool,
+}
+
+WHITESPACE = " \t\r\n"
+
+
+class SchemaViolation(ValueError):
+    """The model output does not match the expected schema"""
+
+    def __init__(self, message: str, text: Optional[str] = None):
+        """
+        Initialize the violation
+
+        Args:
+            message: Description of the violation
+            text: The output generated up to the violation, if known
+        """
+        super().__init__(message)
+        self.text = text
+
+
+class StreamingJSONValidator:
+    """
+    Incremental JSON parser that validates values against a schema as soon
+    as they are complete
+
+    Feed it the streamed response chunks; it raises SchemaViolation on the
+    first syntax error, wrong type, value out of range or object closed
+    without a required field, so the generation can be aborted right away
+    instead of after the whole output. Defects that are repaired locally
+    afterwards are let through: text around the JSON value, such as code
+    fences, comments and trailing commas.
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        """
+        Initialize the validator
+
+        Args:
+            schema: JSON schema of the complete output
+        """
+        self.schema = schema
+        self.chars = 0
+
+        # Open containers with their schema, the keys seen (objects) or the
+        # item count (arrays) and what is expected next
+        self._stack: List[Dict[str, Any]] = []
+        self._key: Optional[str] = None
+        self._done = False
+
+        # Scalar being read: string characters or literal characters
+        self._string: Optional[List[str]] = None
+        self._escape = False
+        self._literal: Optional[List[str]] = None
+
+        # Comment being skipped, or a '/' that may start one
+        self._comment = False
+        self._slash = False
+
+    def feed(self, chunk: str) -> None:
+        """
+        Parse the next part of the output
+
+        Args:
+            chunk: Next part of the generated text
+
+        Raises:
+            SchemaViolation: If the output can no longer match the schema
+        """
+        for char in chunk:
+            self._feed_char(char)
+            self.chars += 1
+
+    def close(self) -> None:
+        """
+        Check that the output is complete
+
+        Raises:
+            SchemaViolation: If the output ended before the JSON value did
+        """
+        if self._literal is not None:
+            self._end_literal()
+        if not self._done:
+            self._fail("Output ended before the JSON value was complete")
+
+    def _fail(self, message: str) -> None:
+        """Raise a violation at the current position"""
+        raise SchemaViolation(f"{message} at character {self.chars}")
+
+    def _child_schema(self) -> Dict[str, Any]:
+        """Schema of the value that is read next"""
+        if not self._stack:
+            return self.schema
+        frame = self._stack[-1]
+        if frame["keys"] is None:
+            return frame["schema"].get("items", {})
+        return frame["schema"].get("properties", {}).get(self._key, {})
+
+    def _feed_char(self, char: str) -> None:
+        """Advance the parser by one character"""
+        if self._string is not None:
+            self._feed_string(char)
+            return
+
+        if self._literal is not None:
+            if char not in WHITESPACE and char not in ",]}":
+                self._literal.append(char)
+                return
+            self._end_literal()
+
+        if self._comment:
+            self._comment = char != "\n"
+            return
+        if self._slash:
+            if char != "/":
+                self._fail("Unexpected '/'")
+            self._slash = False
+            self._comment = True
+            return
+
+        if char in WHITESPACE:
+            return
+        if self._done or (not self._stack and char not in "{["):
+            # Text around the JSON value
+            return
+        if char == "/":
+            self._slash = True
+            return
+
+        frame = self._stack[-1] if self._stack else None
+        state = frame["state"] if frame else "value"
+        if state == "key":
+            if char == '"':
+                self._string = []
+            elif char == "}":
+                # Empty object or trailing comma
+                self._end_container(char)
+            else:
+                self._fail(f"Expected an object key, got {char!r}")
+        elif state == "colon":
+            if char != ":":
+                self._fail(f"Expected ':', got {char!r}")
+            frame["state"] = "value"
+        elif state == "comma":
+            if char == ",":
+                frame["state"] = "value" if frame["keys"] is None else "key"
+            elif char in "]}":
+                self._end_container(char)
+            else:
+                self._fail(f"Expected ',' or the end of a container, got {char!r}")
+        elif char == "]" and frame is not None and frame["keys"] is None:
+            # Empty array or trailing comma
+            self._end_container(char)
+        else:
+            self._start_value(char)
+
+    def _start_value(self, char: str) -> None:
+        """Start reading a value beginning with char"""
+        schema = self._child_schema()
+        if char == "{":
+            self._check_type(schema, {})
+            self._stack.append(
+                {"schema": schema, "keys": set(), "items": 0, "state": "key"}
+            )
+        elif char == "[":
+            self._check_type(schema, [])
+            self._stack.append(
+                {"schema": schema, "keys": None, "items": 0, "state": "value"}
+            )
+        elif char == '"':
+            self._string = []
+        elif char in "-0123456789tfn":
+            self._literal = [char]
+        else:
+            self._fail(f"Unexpected {char!r}")
+
+    def _feed_string(self, char: str) -> None:
+        """Read a character of a string"""
+        if self._escape:
+            self._escape = False
+        elif char == "\\":
+            self._escape = True
+        elif char == '"':
+            value = json.loads('"' + "".join(self._string) + '"', strict=False)
+            self._string = None
+            frame = self._stack[-1] if self._stack else None
+            if frame is not None and frame["state"] == "key":
+                self._key = value
+                frame["keys"].add(value)
+                frame["state"] = "colon"
+            else:
+                self._end_value(value)
+            return
+        self._string.append(char)
+
+    def _end_literal(self) -> None:
+        """Finish reading a number, true, false or null"""
+        text = "".join(self._literal)
+        self._literal = None
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError:
+            self._fail(f"Invalid literal {text!r}")
+        self._end_value(value)
+
+    def _end_value(self, value: Any) -> None:
+        """Validate a complete scalar value"""
+        schema = self._child_schema()
+        self._check_type(schema, value)
+
+        if "enum" in schema and value not in schema["enum"]:
+            self._fail(f"Value {value!r} is not one of {schema['enum']}")
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            if "minimum" in schema and value < schema["minimum"]:
+                self._fail(f"Value {value} is below {schema['minimum']}")
+            if "maximum" in schema and value > schema["maximum"]:
+                self._fail(f"Value {value} is above {schema['maximum']}")
+
+        self._after_value()
+
+    def _end_container(self, char: str) -> None:
+        """Close the innermost object or array"""
+        frame = self._stack.pop()
+        is_object = frame["keys"] is not None
+        if char != ("}" if is_object else "]"):
+            self._fail(f"Mismatched {char!r}")
+        if is_object:
+            required = frame["schema"].get("required", [])
+            missing = [key for key in required if key not in frame["keys"]]
+            if missing:
+                self._fail(f"Object closed without required {missing}")
+        self._after_value()
+
+    def _after_value(self) -> None:
+        """Move on after a value was read"""
+        if not self._stack:
+            self._done = True
+            return
+        frame = self._stack[-1]
+        frame["items"] += 1
+        frame["state"] = "comma"
+
+    def _check_type(self, schema: Dict[str, Any], value: Any) -> None:
+        """Check a value, or an empty container, against the schema type"""
+        expected = JSON_TYPES.get(schema.get("type"))
+        if expected is None:
+            return
+        if isinstance(value, bool) and schema.get("type") in ("number", "integer"):
+            self._fail(f"Expected {schema['type']}, got a boolean")
+        if not isinstance(value, expected):
+            self._fail(f"Expected {schema['type']}, got {type(value).__name__}")
@@ -1,5 +1,9 @@
+import hashlib
 import jinja2
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+
+# Stands in for the job text when rendering the static part of a prompt
+JOB_PLACEHOLDER = "\0JOB_POSTING\0"
 
 
 class Templater:
@@ -10,6 +14,9 @@ class Templater:
         self.resume = config["resume_path"]
         self.user_prompt_path = config.get("preference_prompt_path", None)
 
+        # Rendered static prompt parts by a hash of their inputs
+        self._static_parts = {}
+
     def generate_prompt(self, job: Dict[str, Any], template: str = "default") -> str:
         """
         Generate prompt from template
@@ -20,6 +27,114 @@ class Templater:
         Returns:
             str: Generated prompt
         """
+        prefix, job_part = self.generate_prompt_parts(job, template)
+        return prefix + job_part
+
+    def generate_prompt_parts(
+        self, job: Dict[str, Any], template: str = "default"
+    ) -> Tuple[str, str]:
+        """
+        Generate a prompt split into its static prefix and its job-specific part
+
+        The prefix holds the instructions, resume and preferences and is
+        byte-identical for every job, so the model server can reuse its
+        cached prefill; the job text comes last.
+
+        Args:
+            job: Job dictionary
+            template: Template name
+
+        Returns:
+            tuple: (static prefix, job part), concatenated they form the prompt
+        """
+        prefix, suffix = self._render_static(*self._load_inputs(template))
+        return prefix, self._generate_job_text(job) + suffix
+
+    def generate_batch_prompt_parts(
+        self, jobs: Dict[str, Dict[str, Any]], template: str = "batch"
+    ) -> Tuple[str, str]:
+        """
+        Generate a prompt evaluating several jobs at once, split like
+        generate_prompt_parts
+
+        Args:
+            jobs: Job dictionaries by the job ID the model answers with
+            template: Template name
+
+        Returns:
+            tuple: (static prefix, job part), concatenated they form the prompt
+        """
+        prefix, suffix = self._render_static(*self._load_inputs(template))
+        job_texts = [
+            f"**Job ID: {job_id}**\n```\n{self._generate_job_text(job)}\n```\n"
+            for job_id, job in jobs.items()
+        ]
+        return prefix, "\n".join(job_texts) + suffix
+
+    def _render_static(self, template: str, resume: str, user_prompt: str):
+        """
+        Render the prompt around the job text
+
+        Args:
+            template: Template source
+            resume: Resume text
+            user_prompt: User prompt or None
+
+        Returns:
+            tuple: (text before the job text, text after the job text)
+        """
+        key = hashlib.sha256(
+            "\0".join((template, resume, user_prompt or "")).encode("utf-8")
+        ).hexdigest()
+        if key not in self._static_parts:
+            # Use Template.from_string to preserve escaping
+            jinja_template = jinja2.Template(
+                template, autoescape=False, keep_trailing_newline=True
+            )
+
+            # Render template
+            rendered = jinja_template.render(
+                resume_text=resume,
+                job_posting_text=JOB_PLACEHOLDER,
+                candidate_preferences=user_prompt.strip() if user_prompt else None,
+            )
+
+            prefix, _, suffix = rendered.partition(JOB_PLACEHOLDER)
+            self._static_parts[key] = (prefix, suffix)
+        return self._static_parts[key]
+
+    def fingerprint(self, job: Dict[str, Any], template: str = "default") -> str:
+        """
+        Hash every input that determines the prompt of a job
+
+        Args:
+            job: Job dictionary
+            template: Template name
+
+        Returns:
+            str: Hex digest of the template, resume, preferences and normalized job text
+        """
+        template, resume, user_prompt = self._load_inputs(template)
+
+        # Whitespace differences do not change the analysis
+        job_text = " ".join(self._generate_job_text(job).split())
+
+        digest = hashlib.sha256()
+        for part in (template, resume, user_prompt or "", job_text):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _load_inputs(self, template: str = "default"):
+        """
+        Load the prompt template, resume and user prompt
+
+        Args:
+            template: Template name
+
+        Returns:
+            tuple: (template source, resume, user prompt or None)
+        """
         # Load user prompt
         user_prompt = None
         if self.user_prompt_path:
@@ -47,21 +162,7 @@ class Templater:
         except FileNotFoundError as exc:
             raise ValueError(f"Resume {self.resume} not found") from exc
 
-        job_text = self._generate_job_text(job)
-
-        # Use Template.from_string to preserve escaping
-        jinja_template = jinja2.Template(
-            template, autoescape=False, keep_trailing_newline=True
-        )
-
-        # Render template
-        rendered = jinja_template.render(
-            resume_text=resume,
-            job_posting_text=job_text,
-            candidate_preferences=user_prompt.strip() if user_prompt else None,
-        )
-
-        return rendered
+        return template, resume, user_prompt
 
     def _generate_job_text(self, job: Dict[str, Any], template: str = "default") -> str:
         """
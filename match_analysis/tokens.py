@@ -0,0 +1,290 @@
+"""
+Token estimation and context budgeting of prompts
+"""
+
+import bisect
+import math
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+# Headings and phrases of description sections that say little about the fit
+LOW_VALUE_PHRASES = (
+    "about us",
+    "about the company",
+    "who we are",
+    "why join",
+    "benefits",
+    "perks",
+    "what we offer",
+    "equal opportunity",
+    "equal employment",
+    "diversity",
+    "inclusive",
+    "privacy",
+    "how to apply",
+    "disclaimer",
+)
+
+# Headings and phrases of description sections that matter most for the fit
+HIGH_VALUE_PHRASES = (
+    "requirement",
+    "qualification",
+    "responsibilit",
+    "what you will",
+    "what you should",
+    "must have",
+    "skills",
+    "experience",
+)
+
+# A line that is a markdown heading or entirely bold
+HEADING = re.compile(r"^\s*(#{1,6}\s+\S.*|\*\*[^*]+\*\*:?)\s*$")
+
+
+class TokenEstimator:
+    """
+    Estimates token counts from a characters-per-token ratio that is
+    calibrated against the prompt token counts reported by the model
+    """
+
+    def __init__(
+        self,
+        chars_per_token: float = 3.5,
+        smoothing: float = 0.1,
+        min_ratio: float = 2.0,
+        max_ratio: float = 6.0,
+    ):
+        """
+        Initialize the estimator
+
+        Args:
+            chars_per_token: Initial characters-per-token ratio
+            smoothing: Weight of a new observation in the moving average
+            min_ratio: Observed ratios below this are ignored
+            max_ratio: Observed ratios above this are ignored, they come from
+                prompts whose prefix was served from the model's cache
+        """
+        self.chars_per_token = chars_per_token
+        self.smoothing = smoothing
+        self.min_ratio = min_ratio
+        self.max_ratio = max_ratio
+        self.samples = 0
+
+    def estimate(self, text: str) -> int:
+        """
+        Estimate the number of tokens of a text
+
+        Args:
+            text: The text
+
+        Returns:
+            int: Estimated token count
+        """
+        return math.ceil(len(text) / self.chars_per_token)
+
+    def calibrate(self, chars: int, tokens: int) -> None:
+        """
+        Update the ratio from a prompt and its reported token count
+
+        Args:
+            chars: Number of characters of the prompt
+            tokens: Number of prompt tokens reported by the model
+        """
+        if tokens <= 0:
+            return
+        ratio = chars / tokens
+        if not self.min_ratio <= ratio <= self.max_ratio:
+            return
+
+        self.chars_per_token += self.smoothing * (ratio - self.chars_per_token)
+        self.samples += 1
+
+
+def split_sections(description: str) -> List[str]:
+    """
+    Split a job description into sections at its headings
+
+    Args:
+        description: Job description in markdown
+
+    Returns:
+        list: Sections, each starting with its heading if it has one
+    """
+    sections = []
+    current = []
+    for line in description.splitlines(keepends=True):
+        if HEADING.match(line) and any(part.strip() for part in current):
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("".join(current))
+    return sections
+
+
+def section_value(section: str) -> int:
+    """
+    Rate how much a description section says about the fit of a job
+
+    Args:
+        section: A description section
+
+    Returns:
+        int: 0 for boilerplate, 2 for requirements and responsibilities, 1 otherwise
+    """
+    head = section.strip()[:200].lower()
+    if any(phrase in head for phrase in LOW_VALUE_PHRASES):
+        return 0
+    if any(phrase in head for phrase in HIGH_VALUE_PHRASES):
+        return 2
+    return 1
+
+
+def trim_description(description: str, max_chars: int) -> str:
+    """
+    Shorten a job description by dropping its least valuable sections first
+
+    Boilerplate sections are dropped before general ones, last sections
+    first, and requirements are kept as long as possible. A general section
+    whose removal would leave less than max_chars is not dropped, and if the
+    remaining sections are still too long the text is cut at max_chars.
+
+    Args:
+        description: Job description in markdown
+        max_chars: Maximum length of the result
+
+    Returns:
+        str: The trimmed description
+    """
+    if len(description) <= max_chars:
+        return description
+
+    sections = split_sections(description)
+    kept = list(range(len(sections)))
+    length = len(description)
+
+    order = sorted(kept, key=lambda idx: (section_value(sections[idx]), -idx))
+    for idx in order:
+        value = section_value(sections[idx])
+        if length <= max_chars or value == 2:
+            break
+        if value == 1 and length - len(sections[idx]) < max_chars:
+            # Cutting keeps more of the description than dropping the section
+            break
+        kept.remove(idx)
+        length -= len(sections[idx])
+
+    trimmed = "".join(sections[idx] for idx in kept)
+    return trimmed[:max_chars]
+
+
+class ContextOverflow(ValueError):
+    """Raised when a prompt cannot fit the largest context window with a
+    useful part of its job description"""
+
+
+class ContextBudget:
+    """
+    Sizes the context window of each request to its prompt plus the expected
+    output, rounded up to a bucket so the model is not reloaded for every
+    request, and trims job descriptions that do not fit the largest bucket
+    """
+
+    def __init__(
+        self,
+        estimator: TokenEstimator,
+        buckets: Optional[List[int]] = None,
+        num_predict: int = 4096,
+        margin: float = 0.1,
+        min_description_chars: int = 500,
+    ):
+        """
+        Initialize the context budget
+
+        Args:
+            estimator: Token estimator of the model
+            buckets: Allowed num_ctx values
+            num_predict: Default maximum number of generated tokens
+            margin: Share of the prompt estimate added for estimation error
+            min_description_chars: Smallest description a trimmed prompt may
+                keep, prompts that need to trim further are refused
+        """
+        self.estimator = estimator
+        self.buckets = sorted(buckets or [4096, 8192, 12288, 16384])
+        self.num_predict = num_predict
+        self.margin = margin
+        self.min_description_chars = min_description_chars
+
+        self.trimmed = 0
+
+    def _tokens(self, text: str) -> int:
+        """Estimated tokens of a text including the margin"""
+        return math.ceil(self.estimator.estimate(text) * (1 + self.margin))
+
+    def plan(
+        self,
+        templater,
+        job: Dict[str, Any],
+        template: str = "default",
+        num_predict: Optional[int] = None,
+    ) -> Tuple[str, str, Dict[str, int]]:
+        """
+        Render a prompt within the budget
+
+        Args:
+            templater: Templater rendering the prompt
+            job: Job data dictionary
+            template: Template name
+            num_predict: Maximum number of generated tokens, defaults to the
+                budget's num_predict
+
+        Returns:
+            tuple: (static prefix, job part, model options with num_ctx and num_predict)
+
+        Raises:
+            ContextOverflow: If the description would have to be trimmed below
+                min_description_chars to fit the largest bucket
+        """
+        num_predict = num_predict or self.num_predict
+        prefix, job_part = templater.generate_prompt_parts(job, template)
+
+        available = self.buckets[-1] - num_predict - self._tokens(prefix)
+        overflow = self._tokens(job_part) - available
+        description = job.get("description")
+        if overflow > 0 and isinstance(description, str):
+            max_chars = len(description) - math.ceil(
+                overflow * self.estimator.chars_per_token
+            )
+            if max_chars < self.min_description_chars:
+                raise ContextOverflow(
+                    f"Prompt leaves {max(max_chars, 0)} of {len(description)} "
+                    f"description chars within num_ctx {self.buckets[-1]}, "
+                    f"below the minimum of {self.min_description_chars}"
+                )
+            job = {**job, "description": trim_description(description, max_chars)}
+            prefix, job_part = templater.generate_prompt_parts(job, template)
+            self.trimmed += 1
+
+        return prefix, job_part, self.size(prefix, job_part, num_predict)
+
+    def size(
+        self, prefix: str, job_part: str, num_predict: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Size the context window of a rendered prompt without trimming it
+
+        Args:
+            prefix: Static prompt prefix
+            job_part: Job-specific part of the prompt
+            num_predict: Maximum number of generated tokens, defaults to the
+                budget's num_predict
+
+        Returns:
+            dict: Model options with num_ctx and num_predict
+        """
+        num_predict = num_predict or self.num_predict
+        needed = self._tokens(prefix + job_part) + num_predict
+        idx = bisect.bisect_left(self.buckets, needed)
+        num_ctx = self.buckets[min(idx, len(self.buckets) - 1)]
+
+        return {"num_ctx": num_ctx, "num_predict": num_predict}
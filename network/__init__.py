@@ -0,0 +1,7 @@
+"""
+Network package for sharing HTTP connections across the application
+"""
+
+from network.session import close_session, get_session, open_session
+
+__all__ = ["close_session", "get_session", "open_session"]
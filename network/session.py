@@ -0,0 +1,75 @@
+"""
+Shared aiohttp session per event loop
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import Dict, Any, Optional
+
+import aiohttp
+
+# Configure logging
+logging.basicConfig(
+    filename="job_scraper.log",
+    filemode="a",
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("http_session")
+
+# Sessions by the event loop they belong to
+_sessions = weakref.WeakKeyDictionary()
+
+
+def open_session(config: Optional[Dict[str, Any]] = None) -> aiohttp.ClientSession:
+    """
+    Create the shared session of the running event loop
+
+    The connector keeps connections alive between requests, bounds the
+    connections per host and caches DNS lookups, so consecutive requests to
+    the same server skip the TCP and TLS setup.
+
+    Args:
+        config: Optional connector settings: limit, limit_per_host,
+            keepalive_timeout and ttl_dns_cache
+
+    Returns:
+        aiohttp.ClientSession: The shared session
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is not None and not session.closed:
+        return session
+
+    config = config or {}
+    connector = aiohttp.TCPConnector(
+        limit=config.get("limit", 100),
+        limit_per_host=config.get("limit_per_host", 10),
+        keepalive_timeout=config.get("keepalive_timeout", 60),
+        ttl_dns_cache=config.get("ttl_dns_cache", 300),
+    )
+    session = aiohttp.ClientSession(connector=connector)
+    _sessions[loop] = session
+
+    logger.info("Opened shared HTTP session")
+    return session
+
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Get the shared session of the running event loop, opening it with the
+    default settings if needed
+
+    Returns:
+        aiohttp.ClientSession: The shared session
+    """
+    return open_session()
+
+
+async def close_session() -> None:
+    """Close the shared session of the running event loop"""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+        logger.info("Closed shared HTTP session")
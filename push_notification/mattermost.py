@@ -1,7 +1,7 @@
 import json
 import requests
-import aiohttp
 from model.job_listing import JobListing
+from network import get_session
 from push_notification.manager import NotificationProvider
 
 
@@ -117,24 +117,24 @@ class MattermostManager(NotificationProvider):
         # Send the request asynchronously
         headers = {"Content-Type": "application/json"}
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                self.webhook_url, headers=headers, json=payload
-            ) as response:
-                # Wait for the response
-                result = await response.text()
-                status = response.status
-
-                # print(
-                #     f"Asynchronously sent notification to Mattermost (status {status}):\n{text}\n"
-                # )
-
-                # Return a response-like object with the results
-                return {
-                    "status_code": status,
-                    "text": result,
-                    "ok": 200 <= status < 300,
-                }
+        session = get_session()
+        async with session.post(
+            self.webhook_url, headers=headers, json=payload
+        ) as response:
+            # Wait for the response
+            result = await response.text()
+            status = response.status
+
+            # print(
+            #     f"Asynchronously sent notification to Mattermost (status {status}):\n{text}\n"
+            # )
+
+            # Return a response-like object with the results
+            return {
+                "status_code": status,
+                "text": result,
+                "ok": 200 <= status < 300,
+            }
 
 
 if __name__ == "__main__":
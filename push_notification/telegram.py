@@ -1,7 +1,7 @@
 import json
-import aiohttp
 import requests
 from model.job_listing import JobListing
+from network import get_session
 from push_notification.manager import NotificationProvider
 
 
@@ -61,7 +61,7 @@ Justification:
             job: A JobListing object containing the job details
 
         Returns:
-            The response from the Mattermost API
+            The response from the Telegram API
         """
         text = f""" 
 New Job Posting ‼️    
@@ -82,10 +82,14 @@ Justification:
         data = {"chat_id": self.chat_id, "text": text}
 
         # Send the request asynchronously
-        headers = {"Content-Type": "application/json"}
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url, headers=headers, json=json.dumps(data)
-            ) as response:
-                return response
+        session = get_session()
+        async with session.post(url, headers=headers, json=data) as response:
+            result = await response.text()
+            status = response.status
+
+            # Return a response-like object with the results
+            return {
+                "status_code": status,
+                "text": result,
+                "ok": 200 <= status < 300,
+            }
@@ -0,0 +1,65 @@
+import pytest
+
+from match_analysis.tokens import (
+    ContextBudget,
+    ContextOverflow,
+    TokenEstimator,
+    trim_description,
+)
+
+
+class PrefixTemplater:
+    """Renders a fixed prefix followed by the job description"""
+
+    def __init__(self, prefix_chars):
+        self.prefix = "p" * prefix_chars
+
+    def generate_prompt_parts(self, job, template="default"):
+        return self.prefix, job["description"]
+
+
+def make_budget(min_description_chars=500):
+    return ContextBudget(
+        TokenEstimator(chars_per_token=1.0),
+        buckets=[1000],
+        num_predict=100,
+        margin=0.0,
+        min_description_chars=min_description_chars,
+    )
+
+
+def test_plan_keeps_fitting_description():
+    budget = make_budget()
+    _, job_part, options = budget.plan(PrefixTemplater(200), {"description": "d" * 600})
+
+    assert job_part == "d" * 600
+    assert options == {"num_ctx": 1000, "num_predict": 100}
+    assert budget.trimmed == 0
+
+
+def test_plan_trims_down_to_minimum_description():
+    budget = make_budget()
+    _, job_part, _ = budget.plan(PrefixTemplater(400), {"description": "d" * 2000})
+
+    assert len(job_part) == 500
+    assert budget.trimmed == 1
+
+
+def test_plan_refuses_description_below_minimum():
+    budget = make_budget()
+
+    with pytest.raises(ContextOverflow):
+        budget.plan(PrefixTemplater(401), {"description": "d" * 2000})
+
+
+def test_plan_refuses_prefix_filling_the_context():
+    budget = make_budget(min_description_chars=0)
+
+    with pytest.raises(ContextOverflow):
+        budget.plan(PrefixTemplater(1000), {"description": "d" * 100})
+
+
+def test_trim_description_cuts_rather_than_empties():
+    description = "Build and operate distributed systems. " * 100
+
+    assert trim_description(description, 500) == description[:500]